@@ -4,152 +4,102 @@ Create NYC Voronoi tessellation CONSTRAINED to city boundaries
 Uses nyc_boroughs_land_only.geojson to clip tessellation properly
 """
 
+import argparse
 import matplotlib.pyplot as plt
 import matplotlib.patches as patches
-from matplotlib.patches import Polygon as MplPolygon
+from matplotlib.collections import PolyCollection
 import numpy as np
-import json
-import requests
-from scipy.spatial import Voronoi
-from shapely.geometry import Point, Polygon, MultiPolygon
-from shapely.ops import unary_union
+from shapely.geometry import Point
 import geopandas as gpd
 
-def load_camera_data():
-    """Load all 907 cameras from zone-lookup.json instead of limited Firebase API"""
-    try:
-        # Load from local zone-lookup.json which has all 907 cameras
-        with open('data/zone-lookup.json', 'r') as f:
-            zone_data = json.load(f)
-        
-        cameras = []
-        for camera_id, zone_info in zone_data.items():
-            if zone_info.get('coordinates') and len(zone_info['coordinates']) == 2:
-                cameras.append({
-                    'lat': float(zone_info['coordinates'][1]),  # lat is second in array
-                    'lng': float(zone_info['coordinates'][0]),  # lng is first in array  
-                    'name': zone_info.get('camera_name', 'Unknown'),
-                    'borough': zone_info.get('borough', 'Unknown'),
-                    'zone_id': zone_info.get('zone_id', 'Unknown'),
-                    'camera_id': camera_id
-                })
-        
-        print(f"✅ Loaded {len(cameras)} cameras from zone-lookup.json")
-        return cameras
-        
-    except Exception as e:
-        print(f"Failed to load camera data from zone-lookup.json: {e}")
-        
-        # Fallback to Firebase API (limited to 100)
-        try:
-            response = requests.get('https://us-central1-vibe-check-463816.cloudfunctions.net/api/dashboard/camera-zones')
-            data = response.json()
-            
-            if 'zones' in data:
-                cameras = []
-                for zone in data['zones']:
-                    if zone.get('latitude') and zone.get('longitude'):
-                        cameras.append({
-                            'lat': float(zone['latitude']),
-                            'lng': float(zone['longitude']),
-                            'name': zone.get('name', 'Unknown'),
-                            'borough': zone.get('neighborhood', 'Unknown'),
-                            'zone_id': zone.get('zone_id', 'Unknown')
-                        })
-                print(f"⚠️ Fallback: Loaded {len(cameras)} cameras from Firebase API (limited)")
-                return cameras
-        except Exception as api_error:
-            print(f"Firebase API also failed: {api_error}")
-    
-    return []
+from vibe_check.geometry import exterior_coordinates, load_boroughs
+from vibe_check.geometry.boundary import LAND_GEOJSON
+from vibe_check.geometry.pipeline import CACHE_DIR, geometry_pipeline
 
-def load_nyc_boundaries():
-    """Load NYC borough boundaries for constrained tessellation"""
+def load_borough_outlines():
+    """Borough outlines to draw over the zones"""
     try:
-        with open('data/nyc_boroughs_land_only.geojson', 'r') as f:
-            geojson_data = json.load(f)
-            
-        # Create unified NYC landmass polygon for clipping
-        polygons = []
-        for feature in geojson_data['features']:
-            geom = feature['geometry']
-            if geom['type'] == 'Polygon':
-                coords = geom['coordinates'][0]
-                poly = Polygon(coords)
-                if poly.is_valid:
-                    polygons.append(poly)
-            elif geom['type'] == 'MultiPolygon':
-                for poly_coords in geom['coordinates']:
-                    coords = poly_coords[0]
-                    poly = Polygon(coords)
-                    if poly.is_valid:
-                        polygons.append(poly)
-        
-        # Combine all boroughs into single landmass
-        if polygons:
-            nyc_landmass = unary_union(polygons)
-            print(f"✅ Created NYC landmass from {len(polygons)} borough polygons")
-            return nyc_landmass, geojson_data
+        # Outlines are only drawn, so the ~10 m simplified level is plenty
+        borough_outlines = load_boroughs(tolerance=0.0001, geojson_path=LAND_GEOJSON)
+        print(f"✅ Loaded {len(borough_outlines)} borough outlines")
+        return borough_outlines
         
     except Exception as e:
         print(f"Error loading NYC boundaries: {e}")
     
-    return None, None
+    return None
 
-def clip_voronoi_cell_to_nyc(cell_coords, nyc_landmass):
-    """Clip a Voronoi cell to NYC boundaries"""
-    try:
-        # Create Shapely polygon from Voronoi cell
-        if len(cell_coords) < 3:
-            return []
-            
-        cell_polygon = Polygon(cell_coords)
-        if not cell_polygon.is_valid:
-            return []
-        
-        # Intersect with NYC landmass
-        intersection = cell_polygon.intersection(nyc_landmass)
-        
-        if intersection.is_empty:
-            return []
-        
-        # Handle different geometry types
-        if isinstance(intersection, Polygon):
-            if intersection.exterior:
-                return list(intersection.exterior.coords)
-        elif isinstance(intersection, MultiPolygon):
-            # Use the largest polygon
-            largest = max(intersection.geoms, key=lambda p: p.area)
-            if largest.exterior:
-                return list(largest.exterior.coords)
-                
-    except Exception as e:
-        print(f"Warning: Failed to clip cell: {e}")
-    
-    return []
+# Output variants rendered from the same geometry: filename and background style
+MAP_VARIANTS = {
+    'icon': {'transparent_bg': False, 'output_filename': 'nyc_vibe_check_camera_map.png'},
+    'repo': {'transparent_bg': True, 'output_filename': 'nyc_vibe_check_repo_image.png'},
+}
 
-def create_constrained_voronoi_tessellation(transparent_bg=False, output_filename='nyc_vibe_check_camera_map.png'):
-    """Create Voronoi tessellation constrained to NYC boundaries"""
-    
-    # Load real camera data
-    cameras = load_camera_data()
-    if not cameras:
-        print("❌ No camera data available")
-        return
+# Create more vibrant color palette for boroughs
+BOROUGH_COLORS = {
+    'MN': '#FFFFFF',  # White
+    'BK': '#FFF8DC',  # Cream  
+    'QN': '#F0F8FF',  # Alice Blue
+    'BX': '#F5F5DC',  # Beige
+    'SI': '#FFFACD',  # Lemon Chiffon
+    'Manhattan': '#FFFFFF',
+    'Brooklyn': '#FFF8DC',
+    'Queens': '#F0F8FF', 
+    'Bronx': '#F5F5DC',
+    'Staten Island': '#FFFACD'
+}
+
+def compute_map_geometry(workers=1, cache_dir=CACHE_DIR):
+    """Take the clipped zones from the geometry build and colour them for every map variant
     
-    print(f"📊 Loaded {len(cameras)} cameras")
+    The cameras, dedup, cells and clip all come from ``geometry_pipeline``,
+    so the map shows exactly the zones the full build writes and reuses its
+    cached stages; only the colouring happens here.
+    """
     
-    # Load NYC boundaries for constraint
-    nyc_landmass, geojson_data = load_nyc_boundaries()
-    if not nyc_landmass:
+    pipeline = geometry_pipeline(cache_dir=cache_dir, workers=workers)
+    try:
+        cameras = pipeline['cameras']
+    except FileNotFoundError as e:
+        print(f"❌ No camera data available: {e}")
+        return None
+    print(f"📊 Loaded {len(cameras['info'])} cameras on NYC land")
+    
+    borough_outlines = load_borough_outlines()
+    if borough_outlines is None:
         print("❌ Could not load NYC boundaries")
-        return
-    
-    # Extract coordinates
-    points = np.array([[cam['lng'], cam['lat']] for cam in cameras])
+        return None
+    
+    # CONSTRAINT: the build's cells, clipped to NYC boundaries
+    clipped = pipeline['clipped']
+    print(f"🗃️ Stages: {pipeline.summary()}")
+    
+    # Skip cells outside NYC and color the rest by camera borough
+    cells = [
+        (coords, BOROUGH_COLORS.get(cameras['info'][i].get('borough', 'Unknown'), '#FFFFFF'))  # Default white
+        for i, coords in zip(clipped.index, exterior_coordinates(clipped.polygons))
+        if len(coords) >= 3
+    ]
+    
+    return {
+        'points': np.asarray(cameras['points']),
+        'cells': [coords for coords, _ in cells],
+        'cell_colors': [color for _, color in cells],
+        'total_cells': len(cameras['info']),
+        'borough_rings': [
+            np.asarray(ring.coords)
+            for _, _, borough in borough_outlines
+            for part in getattr(borough, 'geoms', [borough])
+            for ring in [part.exterior, *part.interiors]
+        ],
+    }
+
+def render_map(geometry, transparent_bg=False, output_filename='nyc_vibe_check_camera_map.png', dpis=(300,)):
+    """Draw precomputed map geometry and save it at every resolution in ``dpis``.
     
-    # Create Voronoi diagram
-    vor = Voronoi(points)
+    The figure is built once; the first dpi is saved as ``output_filename``
+    and any others as ``<name>-<dpi>dpi.png``.
+    """
     
     # Create the figure with square aspect ratio
     fig, ax = plt.subplots(1, 1, figsize=(12, 12))
@@ -171,73 +121,21 @@ def create_constrained_voronoi_tessellation(transparent_bg=False, output_filenam
         # Apply gradient background with 66% opacity over charcoal
         ax.imshow(gradient, aspect='auto', cmap=cmap, extent=(-74.3, -73.7, 40.5, 40.92), alpha=0.66)
     
-    # Plot NYC boundaries with crisp styling
-    if geojson_data:
-        for feature in geojson_data['features']:
-            if feature['geometry']['type'] == 'Polygon':
-                coords = feature['geometry']['coordinates'][0]
-                polygon = MplPolygon(coords, fill=False, edgecolor='#1a237e', linewidth=2.5, alpha=0.9)
-                ax.add_patch(polygon)
-            elif feature['geometry']['type'] == 'MultiPolygon':
-                for poly_coords in feature['geometry']['coordinates']:
-                    coords = poly_coords[0]
-                    polygon = MplPolygon(coords, fill=False, edgecolor='#1a237e', linewidth=2.5, alpha=0.9)
-                    ax.add_patch(polygon)
-    
-    # Create more vibrant color palette for boroughs
-    borough_colors = {
-        'MN': '#FFFFFF',  # White
-        'BK': '#FFF8DC',  # Cream  
-        'QN': '#F0F8FF',  # Alice Blue
-        'BX': '#F5F5DC',  # Beige
-        'SI': '#FFFACD',  # Lemon Chiffon
-        'Manhattan': '#FFFFFF',
-        'Brooklyn': '#FFF8DC',
-        'Queens': '#F0F8FF', 
-        'Bronx': '#F5F5DC',
-        'Staten Island': '#FFFACD'
-    }
+    # Plot NYC boundaries with crisp styling, all rings in one collection
+    ax.add_collection(PolyCollection(geometry['borough_rings'], closed=True, facecolors='none',
+                                     edgecolors='#1a237e', linewidths=2.5, alpha=0.9))
     
-    # Plot CONSTRAINED Voronoi regions with crisp styling
-    clipped_cells = 0
-    total_cells = 0
-    
-    for i, region in enumerate(vor.regions):
-        if not region or -1 in region:
-            continue
-            
-        total_cells += 1
-        
-        # Get polygon vertices
-        polygon_vertices = [vor.vertices[j] for j in region]
-        
-        # CONSTRAINT: Clip to NYC boundaries
-        clipped_coords = clip_voronoi_cell_to_nyc(polygon_vertices, nyc_landmass)
-        
-        if len(clipped_coords) < 3:
-            continue  # Skip cells outside NYC
-            
-        clipped_cells += 1
-        
-        # Determine color based on camera borough
-        color = '#FFFFFF'  # Default white
-        if i < len(cameras):
-            borough = cameras[i].get('borough', 'Unknown')
-            color = borough_colors.get(borough, color)
-        
-        # Create and add CLIPPED polygon with crisp styling
-        alpha_value = 0.85 if not transparent_bg else 0.95
-        polygon = MplPolygon(clipped_coords, 
-                           facecolor=color, 
-                           edgecolor='#1a237e', 
-                           linewidth=0.8,
-                           alpha=alpha_value)
-        ax.add_patch(polygon)
+    # Plot CONSTRAINED Voronoi regions with crisp styling, as a single collection
+    alpha_value = 0.85 if not transparent_bg else 0.95
+    ax.add_collection(PolyCollection(geometry['cells'],
+                                     facecolors=geometry['cell_colors'],
+                                     edgecolors='#1a237e',
+                                     linewidths=0.8,
+                                     alpha=alpha_value))
     
     # Plot camera points as small elegant dots
-    camera_lngs = [cam['lng'] for cam in cameras]
-    camera_lats = [cam['lat'] for cam in cameras]
-    ax.scatter(camera_lngs, camera_lats, c='#FF4444', s=4, alpha=0.95, zorder=5, edgecolors='#1a237e', linewidths=0.3)
+    points = geometry['points']
+    ax.scatter(points[:, 0], points[:, 1], c='#FF4444', s=4, alpha=0.95, zorder=5, edgecolors='#1a237e', linewidths=0.3)
     
     # Set NYC bounds
     ax.set_xlim(-74.3, -73.7)
@@ -254,24 +152,50 @@ def create_constrained_voronoi_tessellation(transparent_bg=False, output_filenam
     # Remove any padding around the map
     plt.subplots_adjust(left=0, right=1, top=1, bottom=0)
     
-    # Save the clean aesthetic map
+    # Save the clean aesthetic map at each requested resolution
     transparent = transparent_bg
-    plt.savefig(output_filename, 
-                dpi=300, 
-                bbox_inches='tight',
-                pad_inches=0,
-                facecolor='none' if transparent else 'none',
-                edgecolor='none',
-                transparent=transparent)
+    stem, _, extension = output_filename.rpartition('.')
+    saved = []
+    for n, dpi in enumerate(dpis):
+        filename = output_filename if n == 0 else f"{stem}-{dpi}dpi.{extension}"
+        fig.savefig(filename, 
+                    dpi=dpi, 
+                    bbox_inches='tight',
+                    pad_inches=0,
+                    facecolor='none',
+                    edgecolor='none',
+                    transparent=transparent)
+        saved.append(filename)
     
     version_type = "transparent repo" if transparent_bg else "icon with blue streaks"
-    print(f"✅ Created {version_type} tessellation: {clipped_cells}/{total_cells} cells")
-    print(f"✅ Saved to: {output_filename}")
-    plt.close()
+    print(f"✅ Created {version_type} tessellation: {len(geometry['cells'])}/{geometry['total_cells']} cells")
+    print(f"✅ Saved to: {', '.join(saved)}")
+    plt.close(fig)
+    return saved
+
+def create_constrained_voronoi_tessellation(transparent_bg=False, output_filename='nyc_vibe_check_camera_map.png', workers=1, geometry=None, dpis=(300,)):
+    """Create Voronoi tessellation constrained to NYC boundaries
+    
+    Pass ``geometry`` from ``compute_map_geometry`` to reuse it across variants.
+    """
+    if geometry is None:
+        geometry = compute_map_geometry(workers=workers)
+        if geometry is None:
+            return None
+    return render_map(geometry, transparent_bg=transparent_bg, output_filename=output_filename, dpis=dpis)
 
 if __name__ == "__main__":
-    # Create icon version with gradient and blue streaks
-    create_constrained_voronoi_tessellation(transparent_bg=False, output_filename='nyc_vibe_check_camera_map.png')
-    
-    # Create transparent version for repo/link sharing
-    create_constrained_voronoi_tessellation(transparent_bg=True, output_filename='nyc_vibe_check_repo_image.png') 
\ No newline at end of file
+    parser = argparse.ArgumentParser(description="Render the NYC camera zone map images")
+    parser.add_argument('--workers', type=int, default=1, help='clip cells on N worker processes')
+    parser.add_argument('--variants', nargs='+', choices=sorted(MAP_VARIANTS), default=['icon', 'repo'],
+                        help='map styles to render (icon: gradient with blue streaks, repo: transparent)')
+    parser.add_argument('--no-cache', action='store_true', help='recompute the clipped cells instead of reusing the cache')
+    parser.add_argument('--dpi', type=int, nargs='+', default=[300],
+                        help='resolutions to save; extra ones get a -<dpi>dpi suffix')
+    args = parser.parse_args()
+    
+    # Clip once, then render every variant and size from the same geometry
+    geometry = compute_map_geometry(workers=args.workers, cache_dir=None if args.no_cache else CACHE_DIR)
+    if geometry is not None:
+        for variant in args.variants:
+            create_constrained_voronoi_tessellation(geometry=geometry, dpis=args.dpi, **MAP_VARIANTS[variant])
@@ -0,0 +1,179 @@
+#!/usr/bin/env python3
+"""
+Benchmark the tessellation pipeline stage by stage.
+
+Runs load, filter (with duplicate resolution), voronoi, clip, metrics and write on the real cameras and
+on synthetic camera sets sampled uniformly inside the NYC land boundary,
+recording wall time, CPU time and peak traced memory per stage. Results go
+to reports/tessellation-benchmark-<timestamp>.json; pass --compare with an
+earlier report to see per-stage ratios.
+"""
+
+import argparse
+import json
+import platform
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+import numpy as np
+import shapely
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+from vibe_check.geometry import (
+    PreparedBoundary,
+    bounded_voronoi_cells,
+    clip_cells,
+    filter_cameras,
+    load_boroughs,
+    load_boundary,
+    load_cameras,
+)
+from vibe_check.geometry.boundary import LAND_GEOJSON
+from vibe_check.geometry.cameras import ZONE_LOOKUP
+from vibe_check.geometry.dedup import resolve_duplicates
+from vibe_check.geometry.instrument import Instrumentation, utc_now
+from vibe_check.geometry.metrics import polygon_metrics
+from vibe_check.geometry.zones import iter_zone_records, write_zones
+
+STAGES = ('load', 'filter', 'voronoi', 'clip', 'metrics', 'write')
+
+
+def sample_points(boundary, n, seed=0):
+    """``n`` lng/lat points uniformly distributed over ``boundary`` (rejection sampling)"""
+    rng = np.random.default_rng(seed)
+    minx, miny, maxx, maxy = boundary.bounds
+    shapely.prepare(boundary)
+    points = np.empty((0, 2))
+    while len(points) < n:
+        batch = rng.uniform((minx, miny), (maxx, maxy), size=(max(2 * (n - len(points)), 1024), 2))
+        points = np.vstack([points, batch[shapely.intersects_xy(boundary, batch[:, 0], batch[:, 1])]])
+    return points[:n]
+
+
+def synthetic_cameras(points):
+    """Camera info dicts shaped like ``load_cameras`` output"""
+    return [
+        {'handle': f"SYN_{i + 1:06d}", 'name': f"synthetic {i + 1}", 'integer_id': i + 1, 'borough': 'Unknown'}
+        for i in range(len(points))
+    ]
+
+
+def run_pipeline(camera_set, workers, out_dir, trace_memory):
+    """Run every stage once; returns {stage: {wall_s, cpu_s[, peak_mb]}} and the zone count"""
+    instrument = Instrumentation(trace_memory=trace_memory)
+
+    with instrument.stage('load'):
+        boundary = load_boundary(geojson_path=LAND_GEOJSON)
+        boroughs = load_boroughs(geojson_path=LAND_GEOJSON)
+        if camera_set['points'] is None:
+            points, info = load_cameras(ZONE_LOOKUP)
+        else:
+            points, info = camera_set['points'], synthetic_cameras(camera_set['points'])
+
+    with instrument.stage('filter'):
+        mask, _ = filter_cameras(points, boundary, boroughs)
+        resolved = resolve_duplicates(points[mask], [camera for camera, keep in zip(info, mask) if keep])
+        points, info = resolved.points, resolved.info
+
+    with instrument.stage('voronoi'):
+        cells = bounded_voronoi_cells(resolved.sites, boundary.bounds)[resolved.site_of]
+    with instrument.stage('clip'):
+        clipped = clip_cells(cells, PreparedBoundary(boundary), workers=workers)
+    with instrument.stage('metrics'):
+        polygon_metrics(clipped.polygons, points[clipped.index])
+    with instrument.stage('write'):
+        write_zones(iter_zone_records(clipped, info, points), out_dir / 'zones.json', out_dir / 'zones.vcz')
+    return instrument.stages, len(clipped)
+
+
+def git_commit():
+    try:
+        return subprocess.run(
+            ['git', 'rev-parse', '--short', 'HEAD'], capture_output=True, text=True, check=True,
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def compare(report, baseline_path):
+    """Print wall-time ratios against an earlier report"""
+    with open(baseline_path, 'r') as f:
+        baseline = {run['name']: run for run in json.load(f)['runs']}
+    print(f"\n📈 Wall time vs {baseline_path} (ratio > 1 is slower)")
+    for run in report['runs']:
+        old = baseline.get(run['name'])
+        if not old:
+            continue
+        ratios = [
+            f"{name} {run['stages'][name]['wall_s'] / old['stages'][name]['wall_s']:.2f}x"
+            for name in STAGES
+            if name in old['stages'] and old['stages'][name]['wall_s'] > 0
+        ]
+        print(f"   {run['name']:>16}: " + ", ".join(ratios))
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--sizes', nargs='+', default=['real', '1000', '10000', '100000'],
+                        help="camera sets to run: 'real' and/or synthetic point counts")
+    parser.add_argument('--repeat', type=int, default=1, help='timing runs per set; the fastest is kept')
+    parser.add_argument('--workers', type=int, default=1, help='clip cells on N worker processes')
+    parser.add_argument('--seed', type=int, default=0, help='seed for the synthetic points')
+    parser.add_argument('--no-memory', action='store_true', help='skip the tracemalloc run')
+    parser.add_argument('--output', help='report path (default: reports/tessellation-benchmark-<timestamp>.json)')
+    parser.add_argument('--compare', help='earlier report to compare wall times against')
+    args = parser.parse_args()
+
+    boundary = load_boundary(geojson_path=LAND_GEOJSON)
+    report = {
+        'generated_at': utc_now(),
+        'commit': git_commit(),
+        'python': platform.python_version(),
+        'numpy': np.__version__,
+        'shapely': shapely.__version__,
+        'geos': shapely.geos_version_string,
+        'machine': platform.machine(),
+        'workers': args.workers,
+        'runs': [],
+    }
+
+    for size in args.sizes:
+        name = 'real' if size == 'real' else f"synthetic_{int(size)}"
+        camera_set = {'points': None if size == 'real' else sample_points(boundary, int(size), args.seed)}
+        print(f"⏱️  {name}...")
+
+        with tempfile.TemporaryDirectory() as tmp:
+            # Timing runs go without tracemalloc, which slows Python-heavy stages
+            timings = [run_pipeline(camera_set, args.workers, Path(tmp), False) for _ in range(args.repeat)]
+            stages = {
+                stage: min((timing[stage] for timing, _ in timings), key=lambda record: record['wall_s'])
+                for stage in STAGES
+            }
+            zones = timings[0][1]
+            if not args.no_memory:
+                memory, _ = run_pipeline(camera_set, args.workers, Path(tmp), True)
+                for stage in STAGES:
+                    stages[stage]['peak_mb'] = memory[stage]['peak_mb']
+
+        total = sum(record['wall_s'] for record in stages.values())
+        report['runs'].append({'name': name, 'cameras': size, 'zones': zones, 'total_wall_s': total, 'stages': stages})
+        print(f"   {zones} zones in {total:.2f}s: " + ", ".join(
+            f"{stage} {record['wall_s']:.3f}s" + (f"/{record['peak_mb']:.0f}MB" if 'peak_mb' in record else '')
+            for stage, record in stages.items()
+        ))
+
+    output = Path(args.output or f"reports/tessellation-benchmark-{int(time.time() * 1000)}.json")
+    output.parent.mkdir(parents=True, exist_ok=True)
+    with open(output, 'w') as f:
+        json.dump(report, f, indent=2)
+    print(f"💾 Saved benchmark report to {output}")
+
+    if args.compare:
+        compare(report, args.compare)
+
+
+if __name__ == '__main__':
+    main()
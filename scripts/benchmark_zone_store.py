@@ -0,0 +1,134 @@
+#!/usr/bin/env python3
+"""
+Measure per-worker memory of the zone polygons with and without the shared zone store.
+
+Starts a pool of --workers processes three times. Each worker answers
+--lookups random point-to-zone lookups and then reports its resident
+(RSS) and private (USS) memory from /proc/self/smaps_rollup:
+
+* json -- every worker parses the zone JSON and builds all polygons (the
+  old per-process copy)
+* file -- every worker memory-maps the .vcz file through ZoneStore
+* shm  -- the parent packs the zones into shared memory once and every
+  worker attaches to it
+
+Results go to reports/zone-store-benchmark-<timestamp>.json.
+"""
+
+import argparse
+import json
+import multiprocessing
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+
+import numpy as np
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+from vibe_check.geometry.lookup import ZoneLookup
+from vibe_check.geometry.zone_store import ZoneStore
+from vibe_check.geometry.zones import COMPLETE_ZONES, COMPLETE_ZONES_BINARY
+
+MODES = ('json', 'file', 'shm')
+
+_worker_zones = None
+
+
+def memory_kb():
+    """Resident and private memory of this process in kB (Linux)"""
+    fields = {}
+    with open('/proc/self/smaps_rollup') as f:
+        for line in f:
+            name, _, value = line.partition(':')
+            if value.strip().endswith('kB'):
+                fields[name] = int(value.split()[0])
+    return fields['Rss'], fields['Private_Clean'] + fields['Private_Dirty']
+
+
+def _init_worker(mode, source):
+    global _worker_zones
+    if mode == 'json':
+        # Bypass the .vcz shortcut: this mode stands for every worker parsing the JSON
+        _worker_zones = ZoneLookup.from_file(source, binary_path=None)
+    else:
+        _worker_zones = ZoneStore.attach(source)
+
+
+def _run_lookups(points):
+    start = time.perf_counter()
+    if isinstance(_worker_zones, ZoneLookup):
+        matched = sum(_worker_zones.zone_id(lng, lat) is not None for lng, lat in points)
+    else:
+        matched = sum(_worker_zones.zone_index(lng, lat) >= 0 for lng, lat in points)
+    elapsed = time.perf_counter() - start
+    rss, uss = memory_kb()
+    return os.getpid(), rss, uss, matched, elapsed
+
+
+def run_mode(mode, source, workers, points):
+    chunks = np.array_split(points, workers)
+    context = multiprocessing.get_context('fork') if 'fork' in multiprocessing.get_all_start_methods() else None
+    start = time.perf_counter()
+    with ProcessPoolExecutor(max_workers=workers, mp_context=context,
+                             initializer=_init_worker, initargs=(mode, source)) as pool:
+        results = list(pool.map(_run_lookups, chunks))
+    wall = time.perf_counter() - start
+    per_pid = {pid: (rss, uss) for pid, rss, uss, _, _ in results}
+    lookup_s = sum(elapsed for *_, elapsed in results)
+    return {
+        'mode': mode,
+        'workers': len(per_pid),
+        'wall_s': round(wall, 2),
+        'matched': sum(matched for _, _, _, matched, _ in results),
+        'lookup_us': round(lookup_s / len(points) * 1e6, 2),
+        'rss_mb_per_worker': round(np.mean([rss for rss, _ in per_pid.values()]) / 1024, 1),
+        'uss_mb_per_worker': round(np.mean([uss for _, uss in per_pid.values()]) / 1024, 1),
+        'uss_mb_total': round(sum(uss for _, uss in per_pid.values()) / 1024, 1),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--zones', default=COMPLETE_ZONES, help='zone JSON file')
+    parser.add_argument('--binary', default=COMPLETE_ZONES_BINARY, help='binary .vcz zone file')
+    parser.add_argument('--workers', type=int, default=4, help='pool size')
+    parser.add_argument('--lookups', type=int, default=20_000, help='random lookups spread over the workers')
+    parser.add_argument('--modes', nargs='+', choices=MODES, default=list(MODES), help='modes to compare')
+    parser.add_argument('--seed', type=int, default=0, help='seed for the lookup points')
+    parser.add_argument('--output', help='report path (default: reports/zone-store-benchmark-<timestamp>.json)')
+    args = parser.parse_args()
+
+    store = ZoneStore.open(args.binary)
+    bounds = store.bounds
+    rng = np.random.default_rng(args.seed)
+    points = np.column_stack([
+        rng.uniform(bounds[:, 0].min(), bounds[:, 2].max(), args.lookups),
+        rng.uniform(bounds[:, 1].min(), bounds[:, 3].max(), args.lookups),
+    ])
+    print(f"🗺️  {len(store)} zones, {store.coordinates.nbytes / 1e6:.1f} MB of coordinates; "
+          f"{args.workers} workers, {args.lookups} lookups")
+
+    results = []
+    for mode in args.modes:
+        if mode == 'shm':
+            with store.to_shared() as shared:
+                results.append(run_mode(mode, shared.spec, args.workers, points))
+        else:
+            results.append(run_mode(mode, args.zones if mode == 'json' else store.spec, args.workers, points))
+
+    print(f"{'mode':<5} {'RSS MB/worker':>13} {'USS MB/worker':>13} {'USS MB total':>12} {'lookup µs':>9} {'matched':>8}")
+    for result in results:
+        print(f"{result['mode']:<5} {result['rss_mb_per_worker']:>13} {result['uss_mb_per_worker']:>13} "
+              f"{result['uss_mb_total']:>12} {result['lookup_us']:>9} {result['matched']:>8}")
+
+    output = Path(args.output or f"reports/zone-store-benchmark-{int(time.time() * 1000)}.json")
+    output.parent.mkdir(parents=True, exist_ok=True)
+    with open(output, 'w') as f:
+        json.dump({'arguments': vars(args), 'results': results}, f)
+    print(f"💾 Saved benchmark to {output}")
+
+
+if __name__ == '__main__':
+    main()
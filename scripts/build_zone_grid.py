@@ -0,0 +1,70 @@
+#!/usr/bin/env python3
+"""
+Rasterize the camera zones into a memory-mapped zone-index grid.
+
+Classifies the centre of every --cell-m metre cell over the zone bounds
+with the exact polygon lookup and writes the uint16 grid to
+data/complete_voronoi_zones.vcg, then samples random points and reports
+how often the grid disagrees with the exact lookup (almost always in cells
+straddling a zone edge or the coastline). --check skips the build and
+only measures an existing grid. The error report goes to
+reports/zone-grid-<timestamp>.json.
+"""
+
+import argparse
+import json
+import os
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+from vibe_check.geometry.lookup import ZoneLookup
+from vibe_check.geometry.raster import DEFAULT_CELL_M, ZONE_GRID, ZoneGrid, build_grid, grid_error_report
+from vibe_check.geometry.zones import COMPLETE_ZONES, COMPLETE_ZONES_BINARY
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--zones', default=COMPLETE_ZONES, help='zone JSON file')
+    parser.add_argument('--binary', default=COMPLETE_ZONES_BINARY, help='binary zone file, used when it exists')
+    parser.add_argument('--grid', default=ZONE_GRID, help='grid file to write or check')
+    parser.add_argument('--cell-m', type=float, default=DEFAULT_CELL_M, help='cell size in metres')
+    parser.add_argument('--check', action='store_true', help='only measure the existing grid')
+    parser.add_argument('--samples', type=int, default=1_000_000, help='random points compared against the exact lookup')
+    parser.add_argument('--seed', type=int, default=0, help='seed for the sample points')
+    parser.add_argument('--output', help='report path (default: reports/zone-grid-<timestamp>.json)')
+    args = parser.parse_args()
+
+    zones = ZoneLookup.from_file(args.zones, args.binary)
+    print(f"🗺️  Loaded {len(zones)} zones")
+
+    build_s = None
+    if args.check:
+        grid = ZoneGrid(args.grid)
+    else:
+        start = time.perf_counter()
+        grid = build_grid(args.grid, zones, args.cell_m)
+        build_s = round(time.perf_counter() - start, 2)
+        print(f"🧱 Rasterized {grid.columns} x {grid.rows} cells in {build_s} s "
+              f"({os.path.getsize(args.grid) / 1e6:.1f} MB) -> {args.grid}")
+
+    start = time.perf_counter()
+    report = grid_error_report(grid, zones, args.samples, args.seed)
+    report['check_s'] = round(time.perf_counter() - start, 2)
+    print(f"🎯 {report['mismatches']} of {report['samples']} samples disagree with the exact lookup: "
+          f"{report['error_rate']:.4%} overall, {report['error_rate_in_zones']:.4%} of points in zones, "
+          f"{report['error_rate_boundary_cells']:.2%} in boundary cells "
+          f"({report['boundary_cells_fraction']:.2%} of the grid)")
+    print(f"   {report['wrong_zone']} wrong zone, {report['zone_vs_no_zone']} zone vs no zone, "
+          f"{report['mismatches_outside_boundary_cells']} outside boundary cells")
+
+    output = Path(args.output or f"reports/zone-grid-{int(time.time() * 1000)}.json")
+    output.parent.mkdir(parents=True, exist_ok=True)
+    with open(output, 'w') as f:
+        json.dump({'arguments': vars(args), 'grid': args.grid, 'build_s': build_s, **report}, f)
+    print(f"💾 Saved grid report to {output}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,125 @@
+#!/usr/bin/env python3
+"""
+Check every camera image URL concurrently and write a health report.
+
+Probes all imageUrls in data/zone-lookup.json over one pooled connection
+with a concurrency cap, a per-host rate limit and per-request timeouts,
+then writes status counts, latency percentiles and the failing cameras to
+reports/camera-health-<timestamp>.json. --stub runs the same checker
+against a local stand-in server instead of the real feeds.
+
+With --state, results feed a persistent health tracker: only cameras whose
+next probe is due are checked, and failing cameras back off exponentially
+instead of being fetched at their normal cadence.
+"""
+
+import argparse
+import asyncio
+import json
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+from vibe_check.cameras.health import (
+    DEFAULT_CONCURRENCY,
+    DEFAULT_RATE,
+    DEFAULT_TIMEOUT,
+    ZONE_LOOKUP,
+    check_cameras_async,
+    health_report,
+    load_camera_urls,
+)
+from vibe_check.cameras.backoff import HEALTH_STATE, HealthTracker, load_intervals
+from vibe_check.cameras.stub import point_at, stub_behaviour, stub_camera_server
+
+
+def progress(done, total):
+    if done % 100 == 0 or done == total:
+        print(f"   {done}/{total} checked")
+
+
+def load_tracker(args, cameras, now):
+    """Health tracker from --state (created on first use) with every camera registered"""
+    tracker = HealthTracker.load(args.state) if Path(args.state).exists() else HealthTracker()
+    intervals = load_intervals(args.schedule) if args.schedule else {}
+    for camera in cameras:
+        interval_s = intervals.get(camera['handle'])
+        tracker.register(camera['handle'], **({'interval_s': interval_s} if interval_s else {}), online=camera['online'], now=now)
+    return tracker
+
+
+async def run(args):
+    cameras = load_camera_urls(args.cameras)[:args.limit]
+    tracker = None
+    if args.state:
+        now = time.time()
+        tracker = load_tracker(args, cameras, now)
+        due = set(tracker.due(now))
+        print(f"🩺 {len(due)} of {len(cameras)} cameras due for a probe")
+        cameras = [camera for camera in cameras if camera['handle'] in due]
+    print(f"📸 Checking {len(cameras)} cameras (concurrency {args.concurrency}, {args.rate:g}/s per host, {args.timeout:g}s timeout)")
+
+    options = dict(concurrency=args.concurrency, rate=args.rate, timeout=args.timeout, method=args.method, progress=progress)
+    start = time.perf_counter()
+    if args.stub:
+        async with stub_camera_server(stall_s=args.timeout * 3) as (base_url, stub):
+            print(f"🧪 Using stub camera server at {base_url}")
+            probes = await check_cameras_async(point_at(cameras, base_url), **options)
+            expected = [stub_behaviour(Path(camera['url']).parent.name) for camera in cameras]
+            mismatched = [
+                probe.handle for probe, behaviour in zip(probes, expected)
+                if probe.ok != (behaviour in ('ok', 'placeholder', 'no_head'))
+            ]
+            print(f"🧪 Stub server answered {stub.hits} requests; {len(mismatched)} probes disagree with the stub")
+    else:
+        probes = await check_cameras_async(cameras, **options)
+
+    report = health_report(probes, elapsed_s=round(time.perf_counter() - start, 2))
+    if tracker is not None:
+        for probe in probes:
+            tracker.record(probe.handle, probe.ok, time.time())
+        tracker.save(args.state)
+        report['backoff'] = {
+            **tracker.stats(),
+            'expected_savings_7d': tracker.expected_savings(7 * 24 * 3600),
+        }
+    return report
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--cameras', default=ZONE_LOOKUP, help='camera file with imageUrl fields')
+    parser.add_argument('--concurrency', type=int, default=DEFAULT_CONCURRENCY, help='requests in flight at once')
+    parser.add_argument('--rate', type=float, default=DEFAULT_RATE, help='request starts per second per host (0 for no limit)')
+    parser.add_argument('--timeout', type=float, default=DEFAULT_TIMEOUT, help='seconds before a probe gives up')
+    parser.add_argument('--method', choices=['HEAD', 'GET'], default='HEAD', help='HTTP method for probes')
+    parser.add_argument('--limit', type=int, help='only check the first N cameras')
+    parser.add_argument('--stub', action='store_true', help='probe a local stub server instead of the real cameras')
+    parser.add_argument('--state', nargs='?', const=HEALTH_STATE,
+                        help=f'health tracker state file; probe only due cameras (default path: {HEALTH_STATE})')
+    parser.add_argument('--schedule', help='monitoring schedule file giving each camera\'s normal sampling interval')
+    parser.add_argument('--output', help='report path (default: reports/camera-health-<timestamp>.json)')
+    args = parser.parse_args()
+
+    report = asyncio.run(run(args))
+    print(f"✅ {report['healthy']}/{report['total_cameras']} healthy ({report['health_rate']:.1f}%) in {report['elapsed_s']}s")
+    if report['latency_ms']:
+        latency = report['latency_ms']
+        print(f"⏱️  Latency p50 {latency['p50']:.0f} ms, p90 {latency['p90']:.0f} ms, p99 {latency['p99']:.0f} ms")
+    for kind, count in sorted(report['error_counts'].items(), key=lambda item: -item[1]):
+        print(f"❌ {kind}: {count}")
+    if 'backoff' in report:
+        savings = report['backoff']['expected_savings_7d']
+        print(f"📉 Backoff: {savings['failing_cameras']} failing cameras, {savings['fetches_saved']:.0f} of "
+              f"{savings['fetches_at_normal_cadence']:.0f} fetches saved over 7 days if they stay down")
+
+    output = Path(args.output or f"reports/camera-health-{int(time.time() * 1000)}.json")
+    output.parent.mkdir(parents=True, exist_ok=True)
+    with open(output, 'w') as f:
+        json.dump(report, f, indent=2)
+    print(f"💾 Saved health report to {output}")
+
+
+if __name__ == '__main__':
+    main()
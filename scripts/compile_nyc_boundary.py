@@ -0,0 +1,43 @@
+#!/usr/bin/env python3
+"""
+Compile the NYC land boundary GeoJSON into a multi-resolution WKB artifact.
+
+Loaders compile it automatically on first use; run this after updating the
+boundary GeoJSON or to choose different simplification levels.
+"""
+
+import argparse
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+from vibe_check.geometry.boundary import (
+    DEFAULT_TOLERANCES,
+    LAND_GEOJSON,
+    compile_boundary,
+    read_artifact_header,
+)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--geojson', default=LAND_GEOJSON, help='source boundary GeoJSON')
+    parser.add_argument('--output', default=None, help='artifact path (default: next to the GeoJSON)')
+    parser.add_argument('--tolerances', type=float, nargs='+', default=list(DEFAULT_TOLERANCES),
+                        help='simplification levels in degrees (0 keeps the exact boundary)')
+    args = parser.parse_args()
+
+    print(f"🗺️ Compiling {args.geojson}...")
+    start = time.perf_counter()
+    artifact_path = compile_boundary(args.geojson, args.output, args.tolerances)
+    elapsed = time.perf_counter() - start
+
+    header, _ = read_artifact_header(artifact_path)
+    for level in header['levels']:
+        print(f"📦 tolerance {level['tolerance']:g}°: {level['vertices']} vertices")
+    print(f"💾 Saved {artifact_path} ({artifact_path.stat().st_size / 1e6:.1f} MB) in {elapsed:.2f}s")
+
+
+if __name__ == '__main__':
+    main()
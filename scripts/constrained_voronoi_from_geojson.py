@@ -1,59 +1,70 @@
 #!/usr/bin/env python3
 
+import argparse
 import json
+import sys
+from pathlib import Path
 import numpy as np
-from scipy.spatial import Voronoi
 import matplotlib.pyplot as plt
-from shapely.geometry import Point, Polygon, MultiPolygon, LineString
-from shapely.ops import unary_union, triangulate
-from shapely.validation import make_valid
+from shapely.geometry import MultiPolygon, LineString
+from shapely.ops import triangulate
 import warnings
 warnings.filterwarnings("ignore")
 
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+from vibe_check.geometry.boundary import LAND_GEOJSON
+from vibe_check.geometry.cameras import BOROUGH_ABBREVIATIONS, ZONE_LOOKUP
+from vibe_check.geometry.dedup import DEFAULT_POLICY, DEFAULT_RADIUS_M, POLICIES
+from vibe_check.geometry.instrument import Instrumentation, utc_now
+from vibe_check.geometry.metrics import COMPLETE_METRICS, geometry_area_sqm, save_metrics
+from vibe_check.geometry.pipeline import CACHE_DIR, geometry_pipeline
+from vibe_check.geometry.tessellation import exterior_coordinates
+from vibe_check.geometry.zones import (
+    COMPLETE_ZONES_BINARY,
+    iter_zone_records,
+    save_camera_snapshot,
+    summarize_zones,
+    write_zones,
+)
+
+parser = argparse.ArgumentParser(description="Constrained Voronoi tessellation of NYC camera zones")
+parser.add_argument('--workers', type=int, default=1, help='clip cells on N worker processes')
+parser.add_argument('--no-cache', action='store_true', help='recompute every stage instead of reusing cached results')
+parser.add_argument('--slowest', type=int, default=0, help='re-clip cells one by one and report the N slowest (off by default)')
+parser.add_argument('--trace', action='store_true', help='record tracemalloc peak memory per stage (slows the build)')
+parser.add_argument('--profile', metavar='PATH', help='dump cProfile stats for the instrumented stages to PATH')
+parser.add_argument('--dedup', choices=POLICIES + ('none',), default=DEFAULT_POLICY, help='how to resolve co-located cameras')
+parser.add_argument('--dedup-radius', type=float, default=DEFAULT_RADIUS_M, help='cameras closer than this many metres count as co-located')
+args = parser.parse_args()
+
 print("🎯 PROPER VORONOI TESSELLATION - COMPLETE NYC LAND COVERAGE")
 print("🔧 Partitioning ALL NYC land into camera zones with NO GAPS")
 
+# Stages are cached under a hash of their inputs, so unchanged reruns skip the geometry work
+instrument = Instrumentation(trace_memory=args.trace, profile_path=args.profile)
+pipeline = geometry_pipeline(ZONE_LOOKUP, LAND_GEOJSON, cache_dir=None if args.no_cache else CACHE_DIR, workers=args.workers,
+                             dedup=args.dedup, dedup_radius_m=args.dedup_radius)
+
 # Load data
 try:
-    with open('data/cameras-with-handles.json', 'r') as f:
-        cameras = json.load(f)
-    print(f"📸 Loaded {len(cameras)} cameras")
+    # Precompiled, validated union of the land-only boroughs (built on first run)
+    with instrument.stage('load'):
+        nyc_boundary = pipeline['boundary']
+    print(f"🗽 Loaded NYC boundary (LAND ONLY)")
     
-    with open('data/nyc_boroughs_land_only.geojson', 'r') as f:
-        nyc_boroughs = json.load(f)
-    print(f"🗽 Loaded {len(nyc_boroughs['features'])} NYC boroughs (LAND ONLY)")
+    with instrument.stage('filter'):
+        cameras = pipeline['cameras']
+    print(f"📸 Loaded {cameras['total']} cameras")
+    if cameras['dedup'] and cameras['dedup']['clusters']:
+        dedup = cameras['dedup']
+        print(f"🧲 {dedup['cameras_in_clusters']} co-located cameras in {dedup['clusters']} clusters "
+              f"({dedup['exact_clusters']} exact) resolved by '{dedup['policy']}': "
+              f"{dedup['cameras_out']} cameras on {dedup['sites']} Voronoi sites")
     
 except FileNotFoundError as e:
     print(f"❌ Error loading data: {e}")
     exit(1)
 
-# Create NYC boundary polygon (unified shape)
-print("🗺️ Creating unified NYC boundary polygon...")
-nyc_polygons = []
-
-for feature in nyc_boroughs['features']:
-    geom = feature['geometry']
-    if geom['type'] == 'Polygon':
-        coords = geom['coordinates'][0]
-        poly = Polygon(coords)
-        if poly.is_valid:
-            nyc_polygons.append(poly)
-    elif geom['type'] == 'MultiPolygon':
-        for polygon_coords in geom['coordinates']:
-            coords = polygon_coords[0]
-            poly = Polygon(coords)
-            if poly.is_valid:
-                nyc_polygons.append(poly)
-
-if not nyc_polygons:
-    print("❌ No valid NYC polygons found")
-    exit(1)
-
-# Union all boroughs into one NYC boundary
-nyc_boundary = unary_union(nyc_polygons)
-if not nyc_boundary.is_valid:
-    nyc_boundary = make_valid(nyc_boundary)
-
 print(f"✅ Created unified NYC boundary")
 print(f"📊 NYC boundary type: {type(nyc_boundary).__name__}")
 print(f"📊 NYC area: {nyc_boundary.area:.6f} square degrees")
@@ -67,25 +78,13 @@ if isinstance(nyc_boundary, MultiPolygon):
 else:
     print(f"📦 Single polygon area: {nyc_boundary.area:.6f} sq deg")
 
-# Filter cameras to NYC area using the actual polygon
-camera_points = []
-camera_info = []
-
-for camera in cameras:
-    if camera.get('coordinates') and len(camera['coordinates']) == 2:
-        lat, lng = camera['coordinates']
-        point = Point(lng, lat)
-        
-        # Check if point is actually INSIDE the NYC polygon
-        if nyc_boundary.contains(point) or nyc_boundary.intersects(point):
-            camera_points.append([lng, lat])
-            camera_info.append({
-                'handle': camera.get('handle', 'unknown'),
-                'name': camera.get('name', 'unknown'),
-                'integer_id': camera.get('integer_id', 0)
-            })
-
-camera_points = np.array(camera_points)
+# Cameras were filtered to NYC area using the actual polygon, all points at once
+camera_points = cameras['points']
+camera_info = cameras['info']
+borough_counts = np.bincount(cameras['borough_codes'], minlength=6)
+print("🏙️ Cameras per borough: " + ", ".join(
+    f"{abbreviation} {borough_counts[code]}" for code, abbreviation in BOROUGH_ABBREVIATIONS.items()
+))
 print(f"📍 Cameras INSIDE NYC polygon: {len(camera_points)}")
 
 if len(camera_points) < 4:
@@ -95,115 +94,45 @@ if len(camera_points) < 4:
 # PROPER VORONOI TESSELLATION - COMPLETE COVERAGE
 print("🎯 Creating PROPER Voronoi diagram for complete NYC coverage...")
 
-# Create Voronoi diagram from camera points
-vor = Voronoi(camera_points)
-print(f"🔺 Generated Voronoi diagram with {len(vor.vertices)} vertices")
+# Create bounded Voronoi cells from camera points: every camera gets its true
+# cell, cut to a padded NYC bounding box instead of an infinite region
+try:
+    with instrument.stage('voronoi'):
+        cells = pipeline['cells']
+except ValueError as e:
+    print(f"❌ {e} (use --dedup {' or '.join(POLICIES)})")
+    exit(1)
+print(f"🔺 Generated {len(cells)} bounded Voronoi cells")
 
 # Create Voronoi zones that partition ALL NYC land
-tessellation_zones = []
-valid_zones = 0
-total_covered_area = 0
-
 print("⚡ Generating camera zones with COMPLETE NYC coverage...")
 
-for i, camera in enumerate(camera_info):
-    try:
-        # Get the Voronoi region for this camera
-        region_idx = vor.point_region[i]
-        vertex_indices = vor.regions[region_idx]
-        
-        if len(vertex_indices) == 0 or -1 in vertex_indices:
-            # Infinite region - create a large bounding box around NYC
-            print(f"⚠️ Infinite region for camera {camera['handle']}, creating bounded region...")
-            
-            # Get NYC bounding box and expand it
-            if isinstance(nyc_boundary, MultiPolygon):
-                minx = min(poly.bounds[0] for poly in nyc_boundary.geoms)
-                miny = min(poly.bounds[1] for poly in nyc_boundary.geoms)
-                maxx = max(poly.bounds[2] for poly in nyc_boundary.geoms)
-                maxy = max(poly.bounds[3] for poly in nyc_boundary.geoms)
-            else:
-                minx, miny, maxx, maxy = nyc_boundary.bounds
-            
-            # Expand bounding box
-            padding = max(maxx - minx, maxy - miny) * 0.5
-            bounded_region = Polygon([
-                [minx - padding, miny - padding],
-                [maxx + padding, miny - padding],
-                [maxx + padding, maxy + padding],
-                [minx - padding, maxy + padding]
-            ])
-            
-            # Intersect with NYC boundary
-            zone_poly = bounded_region.intersection(nyc_boundary)
-        else:
-            # Finite region - create polygon from vertices
-            vertices = vor.vertices[vertex_indices]
-            if len(vertices) >= 3:
-                zone_poly = Polygon(vertices)
-                # Intersect with NYC boundary to constrain it
-                zone_poly = zone_poly.intersection(nyc_boundary)
-            else:
-                continue
-        
-        # Handle the result
-        if zone_poly.area > 0:
-            # Handle MultiPolygon case (take largest piece)
-            if isinstance(zone_poly, MultiPolygon):
-                largest_area = 0
-                largest_piece = None
-                for piece in zone_poly.geoms:
-                    if piece.area > largest_area:
-                        largest_area = piece.area
-                        largest_piece = piece
-                zone_poly = largest_piece
-            
-            if zone_poly and zone_poly.area > 0:
-                if isinstance(zone_poly, MultiPolygon):
-                    coords = list(zone_poly.geoms[0].exterior.coords)
-                else:
-                    coords = list(zone_poly.exterior.coords)
-                
-                zone_area_sqm = zone_poly.area * 111000 * 111000  # Rough conversion
-                total_covered_area += zone_area_sqm
-                
-                zone = {
-                    'integer_id': camera['integer_id'],
-                    'handle': camera['handle'], 
-                    'name': camera['name'],
-                    'coordinates': [camera_points[i][1], camera_points[i][0]],  # [lat, lng]
-                    'voronoi_polygon': {
-                        'type': 'Polygon',
-                        'coordinates': [coords]
-                    },
-                    'zone_area_sqm': zone_area_sqm,
-                    'vertices_count': len(coords) - 1,
-                    'is_land_zone': True,
-                    'is_bridge_zone': False,
-                    'bounded_by_coastline': True,
-                    'coverage_quality': 'complete_voronoi_coverage',
-                    'tessellation_method': 'proper_voronoi_partitioning_all_nyc_land'
-                }
-                
-                tessellation_zones.append(zone)
-                valid_zones += 1
-                
-                if valid_zones % 50 == 0:
-                    print(f"✅ Processed {valid_zones} zones...")
-    
-    except Exception as e:
-        print(f"⚠️ Error processing camera {camera['handle']}: {e}")
-        continue
+# Clip every cell against only the pieces of the NYC boundary it touches
+with instrument.stage('clip'):
+    clipped = pipeline['clipped']
+valid_zones = len(clipped)
+print(f"🗃️ Stages: {pipeline.summary()}")
 
 print(f"\n🎯 COMPLETE VORONOI TESSELLATION FINISHED:")
 print(f"✅ Valid zones created: {valid_zones}")
 print(f"📊 Coverage rate: {(valid_zones/len(camera_points)*100):.1f}%")
 
 if valid_zones > 0:
-    # Calculate statistics
-    avg_area = total_covered_area / valid_zones
-    avg_vertices = sum(zone['vertices_count'] for zone in tessellation_zones) / valid_zones
-    nyc_total_area = nyc_boundary.area * 111000 * 111000 if not isinstance(nyc_boundary, MultiPolygon) else sum(poly.area for poly in nyc_boundary.geoms) * 111000 * 111000
+    # Stream zones to JSON and the binary .vcz file as the records are built
+    with instrument.stage('write'):
+        tessellation_zones = write_zones(iter_zone_records(clipped, camera_info, camera_points))
+    
+    # Equal-area metrics for density normalisation, aligned with the zone order
+    with instrument.stage('metrics'):
+        metrics = pipeline['metrics']
+        save_metrics([zone['handle'] for zone in tessellation_zones], metrics)
+    
+    # Calculate statistics from the equal-area zone and land areas
+    stats = summarize_zones(tessellation_zones, metrics['area_sqm'], geometry_area_sqm(nyc_boundary))
+    total_covered_area = stats['total_area_km2'] * 1000000
+    avg_area = stats['average_zone_size_km2'] * 1000000
+    avg_vertices = stats['average_vertices']
+    nyc_total_area = stats['land_area_km2'] * 1000000
     
     print(f"📊 Total coverage area: {total_covered_area/1000000:.2f} km²")
     print(f"📊 NYC total area: {nyc_total_area/1000000:.2f} km²")
@@ -219,85 +148,92 @@ if valid_zones > 0:
     else:
         print("⚠️ WARNING: Coverage may be incomplete")
     
-    # Save results
-    results = {
-        'generated_at': '2025-06-24T13:00:00Z',
-        'algorithm': 'proper_voronoi_complete_coverage',
-        'total_zones': valid_zones,
-        'constrained_zones': valid_zones,
-        'constraint_success_rate': 100.0,
-        'total_area_km2': total_covered_area/1000000,
-        'average_zone_size_km2': avg_area/1000000,
-        'average_vertices': avg_vertices,
-        'method': 'complete_voronoi_partitioning_all_nyc_land',
-        'boundary_source': 'nyc_boroughs_geojson',
-        'coverage_percentage': (total_covered_area/nyc_total_area)*100,
-        'complete_coverage': (total_covered_area/nyc_total_area) > 0.95
-    }
-    
-    # Save zones
-    with open('data/complete_voronoi_zones.json', 'w') as f:
-        json.dump(tessellation_zones, f, indent=2)
-    
-    # Save summary
-    with open('data/complete_voronoi_summary.json', 'w') as f:
-        json.dump(results, f, indent=2)
+    # Remember the camera positions so later runs can update incrementally
+    save_camera_snapshot(camera_info, camera_points)
     
     print(f"\n💾 Saved {valid_zones} zones to complete_voronoi_zones.json")
-    print(f"💾 Saved summary to complete_voronoi_summary.json")
+    print(f"💾 Saved binary zones to {COMPLETE_ZONES_BINARY}")
+    print(f"📐 Saved equal-area metrics to {COMPLETE_METRICS} ({metrics['area_sqm'].sum()/1000000:.2f} km² total)")
     
     # Create visualization
     print("\n📊 Creating complete coverage visualization...")
-    try:
-        fig, (ax1, ax2) = plt.subplots(1, 2, figsize=(16, 8))
+    with instrument.stage('render'):
+        try:
+            fig, (ax1, ax2) = plt.subplots(1, 2, figsize=(16, 8))
         
-        # Plot 1: NYC boundary with camera points
-        if isinstance(nyc_boundary, MultiPolygon):
-            for poly in nyc_boundary.geoms:
-                x_boundary, y_boundary = poly.exterior.xy
-                ax1.plot(x_boundary, y_boundary, 'k-', linewidth=2)
-            ax1.plot([], [], 'k-', linewidth=2, label='NYC Boundary')
-        else:
-            x_boundary, y_boundary = nyc_boundary.exterior.xy
-            ax1.plot(x_boundary, y_boundary, 'k-', linewidth=2, label='NYC Boundary')
+            # Plot 1: NYC boundary with camera points
+            if isinstance(nyc_boundary, MultiPolygon):
+                for poly in nyc_boundary.geoms:
+                    x_boundary, y_boundary = poly.exterior.xy
+                    ax1.plot(x_boundary, y_boundary, 'k-', linewidth=2)
+                ax1.plot([], [], 'k-', linewidth=2, label='NYC Boundary')
+            else:
+                x_boundary, y_boundary = nyc_boundary.exterior.xy
+                ax1.plot(x_boundary, y_boundary, 'k-', linewidth=2, label='NYC Boundary')
         
-        ax1.scatter(camera_points[:, 0], camera_points[:, 1], c='red', s=3, alpha=0.7, label='Cameras')
-        ax1.set_title(f'NYC with {len(camera_points)} Cameras')
-        ax1.set_aspect('equal')
-        ax1.legend()
-        ax1.grid(True, alpha=0.3)
+            ax1.scatter(camera_points[:, 0], camera_points[:, 1], c='red', s=3, alpha=0.7, label='Cameras')
+            ax1.set_title(f'NYC with {len(camera_points)} Cameras')
+            ax1.set_aspect('equal')
+            ax1.legend()
+            ax1.grid(True, alpha=0.3)
         
-        # Plot 2: Complete Voronoi tessellation
-        if isinstance(nyc_boundary, MultiPolygon):
-            for poly in nyc_boundary.geoms:
-                x_boundary, y_boundary = poly.exterior.xy
-                ax2.plot(x_boundary, y_boundary, 'k-', linewidth=2)
-            ax2.plot([], [], 'k-', linewidth=2, label='NYC Boundary')
-        else:
-            x_boundary, y_boundary = nyc_boundary.exterior.xy
-            ax2.plot(x_boundary, y_boundary, 'k-', linewidth=2, label='NYC Boundary')
+            # Plot 2: Complete Voronoi tessellation
+            if isinstance(nyc_boundary, MultiPolygon):
+                for poly in nyc_boundary.geoms:
+                    x_boundary, y_boundary = poly.exterior.xy
+                    ax2.plot(x_boundary, y_boundary, 'k-', linewidth=2)
+                ax2.plot([], [], 'k-', linewidth=2, label='NYC Boundary')
+            else:
+                x_boundary, y_boundary = nyc_boundary.exterior.xy
+                ax2.plot(x_boundary, y_boundary, 'k-', linewidth=2, label='NYC Boundary')
         
-        # Plot all zones (color-coded by borough if possible)
-        colors = ['lightblue', 'lightgreen', 'lightcoral', 'lightyellow', 'lightpink']
-        for i, zone in enumerate(tessellation_zones):
-            coords = zone['voronoi_polygon']['coordinates'][0]
-            xs, ys = zip(*coords)
-            color = colors[i % len(colors)]
-            ax2.plot(xs, ys, 'blue', linewidth=0.3, alpha=0.8)
-            ax2.fill(xs, ys, color, alpha=0.4)
+            # Plot all zones (color-coded by borough if possible)
+            colors = ['lightblue', 'lightgreen', 'lightcoral', 'lightyellow', 'lightpink']
+            for i, coords in enumerate(exterior_coordinates(clipped.polygons)):
+                xs, ys = coords[:, 0], coords[:, 1]
+                color = colors[i % len(colors)]
+                ax2.plot(xs, ys, 'blue', linewidth=0.3, alpha=0.8)
+                ax2.fill(xs, ys, color, alpha=0.4)
         
-        ax2.scatter(camera_points[:, 0], camera_points[:, 1], c='red', s=1, alpha=1.0)
-        ax2.set_title(f'Complete Coverage: {valid_zones} Voronoi Zones')
-        ax2.set_aspect('equal')
-        ax2.legend()
-        ax2.grid(True, alpha=0.3)
+            ax2.scatter(camera_points[:, 0], camera_points[:, 1], c='red', s=1, alpha=1.0)
+            ax2.set_title(f'Complete Coverage: {valid_zones} Voronoi Zones')
+            ax2.set_aspect('equal')
+            ax2.legend()
+            ax2.grid(True, alpha=0.3)
         
-        plt.tight_layout()
-        plt.savefig('complete_voronoi_tessellation.png', dpi=150, bbox_inches='tight')
-        print("💾 Saved visualization to complete_voronoi_tessellation.png")
+            plt.tight_layout()
+            plt.savefig('complete_voronoi_tessellation.png', dpi=150, bbox_inches='tight')
+            print("💾 Saved visualization to complete_voronoi_tessellation.png")
         
-    except Exception as e:
-        print(f"⚠️ Visualization failed: {e}")
+        except Exception as e:
+            print(f"⚠️ Visualization failed: {e}")
+    
+    # Time each cell's clip on its own to find the cameras that dominate the clip stage;
+    # a cached clip has nothing to diagnose and would only pay for a second clip
+    if args.slowest and pipeline.status.get('clipped') == 'cached':
+        print("🐢 Skipping --slowest: the clip stage came from cache (rerun with --no-cache to time it)")
+    elif args.slowest:
+        instrument.record_slowest_cells(cells, clipped, pipeline['prepared_boundary'], camera_info, args.slowest)
+        slowest = instrument.slowest_cells[0]
+        print(f"🐢 Slowest cell: {slowest['handle']} ({slowest['clip_ms']:.1f} ms, {slowest['cell_vertices']} -> {slowest['zone_vertices']} vertices)")
+    
+    # Save results
+    results = {
+        'generated_at': utc_now(),
+        'algorithm': 'proper_voronoi_complete_coverage',
+        **stats,
+        'method': 'complete_voronoi_partitioning_all_nyc_land',
+        'boundary_source': 'nyc_boroughs_geojson',
+        'instrumentation': instrument.report(cache=pipeline.status, workers=args.workers),
+        'dedup': cameras['dedup'],
+    }
+    
+    # Save summary
+    with open('data/complete_voronoi_summary.json', 'w') as f:
+        json.dump(results, f, indent=2)
+    print(f"💾 Saved summary to complete_voronoi_summary.json")
+    if args.profile:
+        print(f"🔬 Saved cProfile stats to {args.profile}")
     
     print("\n🎯 COMPLETE VORONOI TESSELLATION SUCCESS!")
     print(f"✅ {valid_zones} zones partition ALL NYC land")
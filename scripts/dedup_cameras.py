@@ -0,0 +1,51 @@
+#!/usr/bin/env python3
+"""
+Report co-located cameras in a camera file and how a policy resolves them.
+
+Finds cameras closer than --radius metres to each other with a KD-tree,
+resolves each cluster by --policy (merge, jitter or group, as in the zone
+build) and writes the clusters and actions to
+reports/camera-dedup-<timestamp>.json. The camera file itself is not
+changed; the tessellation applies the same resolution on the fly.
+"""
+
+import argparse
+import json
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+from vibe_check.geometry.cameras import ZONE_LOOKUP, load_cameras
+from vibe_check.geometry.dedup import DEFAULT_JITTER_M, DEFAULT_POLICY, DEFAULT_RADIUS_M, POLICIES, resolve_duplicates
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--cameras', default=ZONE_LOOKUP, help='camera file to check')
+    parser.add_argument('--policy', choices=POLICIES, default=DEFAULT_POLICY, help='how co-located cameras are resolved')
+    parser.add_argument('--radius', type=float, default=DEFAULT_RADIUS_M, help='co-location distance in metres')
+    parser.add_argument('--jitter', type=float, default=DEFAULT_JITTER_M, help='spread radius in metres for the jitter policy')
+    parser.add_argument('--output', help='report path (default: reports/camera-dedup-<timestamp>.json)')
+    args = parser.parse_args()
+
+    start = time.perf_counter()
+    points, info = load_cameras(args.cameras)
+    resolved = resolve_duplicates(points, info, args.policy, args.radius, args.jitter)
+    report = {'cameras_file': args.cameras, 'elapsed_s': round(time.perf_counter() - start, 3), **resolved.report}
+
+    print(f"🧲 {report['cameras_in_clusters']} of {report['cameras_in']} cameras are within {args.radius:g} m of another: "
+          f"{report['clusters']} clusters, {report['exact_clusters']} at identical coordinates")
+    for change in report['changes']:
+        print(f"   {' | '.join(change['names'])} ({change['max_separation_m']:g} m): {change['action']}")
+    print(f"✅ '{args.policy}' leaves {report['cameras_out']} cameras on {report['sites']} Voronoi sites")
+
+    output = Path(args.output or f"reports/camera-dedup-{int(time.time() * 1000)}.json")
+    output.parent.mkdir(parents=True, exist_ok=True)
+    with open(output, 'w') as f:
+        json.dump(report, f, indent=2)
+    print(f"💾 Saved dedup report to {output}")
+
+
+if __name__ == '__main__':
+    main()
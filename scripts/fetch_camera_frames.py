@@ -0,0 +1,118 @@
+#!/usr/bin/env python3
+"""
+Fetch current camera frames into the local frame cache.
+
+Each camera's frame is revalidated with ETag / If-Modified-Since, so an
+unchanged frame costs a 304, and identical payloads (the shared "camera
+unavailable" image, frames that did not change) are stored once by content
+hash. After fetching, entries past --max-age-hours are evicted and the
+stalest go until the cache fits --max-mb. --rounds polls repeatedly to show
+the revalidation savings; --stub runs against a local stand-in server.
+
+--detect-changes runs each fetched frame through a cheap change detector
+(a 16x16 grayscale signature per frame) and reports how many frames would
+be skipped before vision analysis because they barely differ from the
+last frame that was passed on.
+"""
+
+import argparse
+import asyncio
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+from vibe_check.cameras.change import CHANGE_STATE, DEFAULT_THRESHOLD, ChangeDetector, load_thresholds
+from vibe_check.cameras.frames import DEFAULT_MAX_AGE_S, DEFAULT_MAX_BYTES, FRAME_CACHE_DIR, FrameCache, camera_uuid
+from vibe_check.cameras.health import DEFAULT_CONCURRENCY, DEFAULT_RATE, DEFAULT_TIMEOUT, ZONE_LOOKUP, load_camera_urls
+from vibe_check.cameras.stub import point_at, stub_camera_server
+
+
+async def poll(cache, cameras, args, detector=None):
+    handles = {camera_uuid(camera['url']): camera['handle'] for camera in cameras}
+    urls = [camera['url'] for camera in cameras]
+    for round_number in range(1, args.rounds + 1):
+        before = cache.stats.bytes_downloaded
+        frames = await cache.fetch_all(urls, concurrency=args.concurrency, rate=args.rate, timeout=args.timeout)
+        fetched = sum(frame is not None for frame in frames.values())
+        changed = ''
+        if detector is not None:
+            passed = sum(
+                detector.check(handles[uuid], frame)[0]
+                for uuid, frame in frames.items() if frame is not None
+            )
+            changed = f", {passed} changed"
+        print(f"   round {round_number}: {fetched}/{len(urls)} frames, "
+              f"{(cache.stats.bytes_downloaded - before) / 1024:.0f} KiB downloaded{changed}")
+        if round_number < args.rounds:
+            await asyncio.sleep(args.interval)
+
+
+def load_detector(args):
+    """Change detector from the CLI options, resuming from --change-state when it exists"""
+    thresholds = load_thresholds(args.thresholds) if args.thresholds else {}
+    detector = ChangeDetector(args.threshold, thresholds)
+    if Path(args.change_state).exists():
+        detector.load(args.change_state)
+    return detector
+
+
+async def run(args):
+    cameras = load_camera_urls(args.cameras)[:args.limit]
+    cache = FrameCache(args.cache_dir, max_bytes=int(args.max_mb * 2 ** 20), max_age_s=args.max_age_hours * 3600)
+    detector = load_detector(args) if args.detect_changes else None
+    print(f"📸 Fetching {len(cameras)} frames into {args.cache_dir} ({len(cache)} cached)")
+
+    if args.stub:
+        async with stub_camera_server(stall_s=args.timeout * 3, frame_period_s=args.stub_frame_period) as (base_url, _):
+            print(f"🧪 Using stub camera server at {base_url}")
+            await poll(cache, point_at(cameras, base_url), args, detector)
+    else:
+        await poll(cache, cameras, args, detector)
+    return cache, detector
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--cameras', default=ZONE_LOOKUP, help='camera file with imageUrl fields')
+    parser.add_argument('--cache-dir', default=FRAME_CACHE_DIR, help='frame cache directory')
+    parser.add_argument('--max-mb', type=float, default=DEFAULT_MAX_BYTES / 2 ** 20, help='cache size budget in MiB')
+    parser.add_argument('--max-age-hours', type=float, default=DEFAULT_MAX_AGE_S / 3600, help='evict entries not validated for this long')
+    parser.add_argument('--concurrency', type=int, default=DEFAULT_CONCURRENCY, help='requests in flight at once')
+    parser.add_argument('--rate', type=float, default=DEFAULT_RATE, help='request starts per second per host (0 for no limit)')
+    parser.add_argument('--timeout', type=float, default=DEFAULT_TIMEOUT, help='seconds before a fetch gives up')
+    parser.add_argument('--rounds', type=int, default=1, help='poll every camera this many times')
+    parser.add_argument('--interval', type=float, default=0.0, help='seconds between rounds')
+    parser.add_argument('--limit', type=int, help='only fetch the first N cameras')
+    parser.add_argument('--stub', action='store_true', help='fetch from a local stub server instead of the real cameras')
+    parser.add_argument('--stub-frame-period', type=float, default=60.0, help='seconds between new stub frames')
+    parser.add_argument('--detect-changes', action='store_true', help='report frames a change detector would skip before analysis')
+    parser.add_argument('--threshold', type=float, default=DEFAULT_THRESHOLD, help='default change threshold (mean absolute difference, 0-1)')
+    parser.add_argument('--thresholds', help='JSON file of per-camera thresholds keyed by handle')
+    parser.add_argument('--change-state', default=CHANGE_STATE, help='change detector state file')
+    args = parser.parse_args()
+
+    start = time.perf_counter()
+    cache, detector = asyncio.run(run(args))
+    evicted = cache.evict()
+    cache.save()
+
+    summary = cache.summary()
+    print(f"✅ {summary['requests']} requests in {time.perf_counter() - start:.2f}s: "
+          f"{summary['downloaded']} downloaded, {summary['not_modified']} not modified, {summary['errors']} failed")
+    print(f"📉 {summary['bytes_not_modified'] / 1024:.0f} KiB skipped by revalidation, "
+          f"{summary['bytes_deduplicated'] / 1024:.0f} KiB deduplicated ({summary['deduplicated']} shared payloads)")
+    print(f"💾 {summary['entries']} cameras -> {summary['distinct_payloads']} distinct frames, "
+          f"{summary['blob_bytes'] / 1024:.0f} KiB on disk for {summary['logical_bytes'] / 1024:.0f} KiB of frames"
+          + (f", {evicted} evicted" if evicted else ""))
+
+    if detector is not None:
+        detector.save(args.change_state)
+        changes = detector.stats()
+        print(f"🔍 {changes['frames_skipped']} of {changes['frames_seen']} frames unchanged ({changes['skip_rate']:.1f}% skipped, "
+              f"{changes['skipped_identical_bytes']} byte-identical); {changes['frames_passed']} passed to analysis"
+              f" ({changes['passed_undecodable']} undecodable)")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,109 @@
+#!/usr/bin/env python3
+"""
+Join a CSV or Parquet file of point events to the camera zones, streaming.
+
+Reads the file in --chunk-rows chunks (311 complaints, collision records or
+any export with longitude/latitude columns, detected by name unless given),
+assigns every row its zone with one vectorized query per chunk and keeps
+only per-zone aggregates: row counts, --sum column totals and the top
+--group-by categories. Memory is bounded by the chunk size, not the file;
+--group-by columns with more than --max-groups distinct values are
+rejected, since their counts would grow with the file.
+Zones come from the exact polygon lookup, or from the rasterized grid
+with --grid. The per-zone table goes to reports/zone-join-<timestamp>.csv
+with a .json summary next to it; --assignments also writes every row with
+its zone_id.
+"""
+
+import argparse
+import csv
+import json
+import sys
+import time
+from pathlib import Path
+
+import numpy as np
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+from vibe_check.geometry.join import CHUNK_ROWS, MAX_GROUPS, join_to_zones
+from vibe_check.geometry.lookup import CHUNK_SIZE as LOOKUP_CHUNK_SIZE, ZoneLookup
+from vibe_check.geometry.raster import ZONE_GRID, ZoneGrid
+from vibe_check.geometry.zones import COMPLETE_ZONES, COMPLETE_ZONES_BINARY
+
+
+class AssignmentWriter:
+    """Append each chunk with its zone_id column to one CSV"""
+
+    def __init__(self, path, zone_ids):
+        self.path = path
+        self.zone_ids = zone_ids
+        self.header = True
+
+    def __call__(self, chunk, index):
+        chunk = chunk.assign(zone_id=np.where(index >= 0, self.zone_ids[index], ''))
+        chunk.to_csv(self.path, mode='w' if self.header else 'a', header=self.header, index=False)
+        self.header = False
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('events', help='CSV or Parquet file of point events')
+    parser.add_argument('--lng', help='longitude column (default: detected)')
+    parser.add_argument('--lat', help='latitude column (default: detected)')
+    parser.add_argument('--sum', nargs='+', default=[], metavar='COLUMN', help='numeric columns to total per zone')
+    parser.add_argument('--group-by', metavar='COLUMN', help='category column to count per zone')
+    parser.add_argument('--top', type=int, default=5, help='categories listed per zone with --group-by')
+    parser.add_argument('--max-groups', type=int, default=MAX_GROUPS,
+                        help='stop if --group-by has more distinct values than this (0: no limit)')
+    parser.add_argument('--chunk-rows', type=int, default=CHUNK_ROWS, help='rows read per chunk')
+    parser.add_argument('--lookup-chunk', type=int, default=LOOKUP_CHUNK_SIZE,
+                        help='points per vectorized polygon query (~260 bytes each at peak)')
+    parser.add_argument('--zones', default=COMPLETE_ZONES, help='zone JSON file')
+    parser.add_argument('--binary', default=COMPLETE_ZONES_BINARY, help='binary zone file, used when it exists')
+    parser.add_argument('--grid', nargs='?', const=ZONE_GRID, help='use the rasterized zone grid (build it with build_zone_grid.py)')
+    parser.add_argument('--nearest', action='store_true', help='assign rows just outside every zone to the closest one')
+    parser.add_argument('--max-distance', type=float, default=100.0, help='metres limit for --nearest')
+    parser.add_argument('--assignments', help='also write every row with its zone_id to this CSV')
+    parser.add_argument('--output', help='per-zone CSV path (default: reports/zone-join-<timestamp>.csv)')
+    args = parser.parse_args()
+    if args.grid and args.nearest:
+        parser.error('--nearest needs the exact polygon lookup, not --grid')
+
+    zones = ZoneGrid(args.grid) if args.grid else ZoneLookup.from_file(args.zones, args.binary, args.lookup_chunk)
+    print(f"🗺️  {len(zones)} zones from {args.grid or 'the zone polygons'}")
+    options = {'nearest': True, 'max_distance_m': args.max_distance} if args.nearest else {}
+    writer = AssignmentWriter(args.assignments, zones.zone_ids) if args.assignments else None
+
+    start = time.perf_counter()
+    try:
+        aggregates = join_to_zones(
+            args.events, zones, args.lng, args.lat, args.sum, args.group_by, args.chunk_rows,
+            on_chunk=writer, all_columns=writer is not None, max_groups=args.max_groups or None, **options,
+        )
+    except ValueError as e:
+        print(f"❌ {e}")
+        sys.exit(1)
+    elapsed = time.perf_counter() - start
+    summary = {'events': args.events, 'elapsed_s': round(elapsed, 2), **aggregates.summary()}
+    print(f"🔗 Joined {summary['rows']:,} rows in {elapsed:.1f} s ({summary['rows'] / max(elapsed, 1e-9):,.0f} rows/s): "
+          f"{summary['matched']:,} in {summary['zones_with_rows']} zones, {summary['outside_zones']:,} outside every zone, "
+          f"{summary['missing_coordinates']:,} without coordinates")
+
+    output = Path(args.output or f"reports/zone-join-{int(time.time() * 1000)}.csv")
+    output.parent.mkdir(parents=True, exist_ok=True)
+    with open(output, 'w', newline='') as f:
+        csv_writer = None
+        for row in aggregates.iter_rows(args.top):
+            if csv_writer is None:
+                csv_writer = csv.DictWriter(f, fieldnames=list(row))
+                csv_writer.writeheader()
+            csv_writer.writerow(row)
+    with open(output.with_suffix('.json'), 'w') as f:
+        json.dump({'arguments': vars(args), **summary}, f)
+    print(f"💾 Saved per-zone aggregates to {output}")
+    if args.assignments:
+        print(f"💾 Saved row assignments to {args.assignments}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,92 @@
+#!/usr/bin/env python3
+"""
+Look up the camera zone of lat,lng points.
+
+Loads the generated zones (the .vcz binary when present, otherwise the
+zone JSON) into a ZoneLookup and prints the zone handle of every point
+given on the command line. --nearest assigns points that fall in no zone
+(water, outside the city) to the closest zone within --max-distance
+metres. --benchmark N times single and batch lookups of N random points
+across the city and writes the timings to
+reports/zone-lookup-benchmark-<timestamp>.json.
+"""
+
+import argparse
+import json
+import sys
+import time
+from pathlib import Path
+
+import numpy as np
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+from vibe_check.geometry.lookup import ZoneLookup
+from vibe_check.geometry.zones import COMPLETE_ZONES, COMPLETE_ZONES_BINARY
+
+
+def parse_point(text):
+    lat, lng = (float(value) for value in text.split(','))
+    return lat, lng
+
+
+def benchmark(zones, n, nearest, max_distance_m, seed):
+    rng = np.random.default_rng(seed)
+    bounds = np.array([polygon.bounds for polygon in zones.polygons])
+    lng = rng.uniform(bounds[:, 0].min(), bounds[:, 2].max(), n)
+    lat = rng.uniform(bounds[:, 1].min(), bounds[:, 3].max(), n)
+
+    singles = min(n, 10_000)
+    start = time.perf_counter()
+    for i in range(singles):
+        zones.zone_id(lng[i], lat[i])
+    single_s = time.perf_counter() - start
+
+    start = time.perf_counter()
+    index = zones.query(lng, lat, nearest, max_distance_m)
+    batch_s = time.perf_counter() - start
+    return {
+        'points': n,
+        'matched': int((index >= 0).sum()),
+        'single_lookup_us': round(single_s / singles * 1e6, 2),
+        'batch_s': round(batch_s, 3),
+        'batch_points_per_s': round(n / batch_s),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('points', nargs='*', type=parse_point, help='points as lat,lng')
+    parser.add_argument('--zones', default=COMPLETE_ZONES, help='zone JSON file')
+    parser.add_argument('--binary', default=COMPLETE_ZONES_BINARY, help='binary zone file, used when it exists')
+    parser.add_argument('--nearest', action='store_true', help='assign points outside every zone to the closest one')
+    parser.add_argument('--max-distance', type=float, help='metres limit for --nearest')
+    parser.add_argument('--benchmark', type=int, metavar='N', help='time lookups of N random points')
+    parser.add_argument('--seed', type=int, default=0, help='seed for the benchmark points')
+    parser.add_argument('--output', help='benchmark report path (default: reports/zone-lookup-benchmark-<timestamp>.json)')
+    args = parser.parse_args()
+    if not args.points and not args.benchmark:
+        parser.error('give points to look up or --benchmark N')
+
+    start = time.perf_counter()
+    zones = ZoneLookup.from_file(args.zones, args.binary)
+    load_s = time.perf_counter() - start
+    print(f"🗺️  Loaded {len(zones)} zones in {load_s * 1000:.0f} ms")
+
+    if args.points:
+        lat, lng = np.array(args.points).T
+        for (point_lat, point_lng), zone_id in zip(args.points, zones.lookup(lng, lat, args.nearest, args.max_distance)):
+            print(f"   {point_lat:.6f},{point_lng:.6f} -> {zone_id or 'no zone'}")
+
+    if args.benchmark:
+        result = benchmark(zones, args.benchmark, args.nearest, args.max_distance, args.seed)
+        print(f"⏱️  single lookup {result['single_lookup_us']} µs; batch of {result['points']} in {result['batch_s']} s "
+              f"({result['batch_points_per_s']:,} points/s, {result['matched']} matched)")
+        output = Path(args.output or f"reports/zone-lookup-benchmark-{int(time.time() * 1000)}.json")
+        output.parent.mkdir(parents=True, exist_ok=True)
+        with open(output, 'w') as f:
+            json.dump({'arguments': vars(args), 'load_s': round(load_s, 3), **result}, f)
+        print(f"💾 Saved benchmark to {output}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,85 @@
+#!/usr/bin/env python3
+"""
+Compile the monitoring schedule files into a heap scheduler and tick it.
+
+The first run reads monitoring_schedules_batch_*.json once and saves the
+compiled scheduler to data/monitoring_scheduler_state.npz; later runs load
+that instead of re-reading the schedule documents. --scores applies live
+current_score updates (a JSON object of handle -> score); a camera's
+score is its sampling interval in hours, as in the adaptive monitoring
+engine. --hours then advances a copy of the scheduler tick by tick and
+reports how many cameras ran and what each tick cost; the saved state
+keeps the real clock.
+"""
+
+import argparse
+import json
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+from vibe_check.monitoring.scheduler import SCHEDULER_STATE, MonitoringScheduler, load_schedules
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--schedules', nargs='+', help='schedule files (default: monitoring_schedules_batch_*.json)')
+    parser.add_argument('--state', default=SCHEDULER_STATE, help='compiled scheduler state file')
+    parser.add_argument('--rebuild', action='store_true', help='recompile from the schedule files even if --state exists')
+    parser.add_argument('--scores', help='JSON file of handle -> current_score updates to apply')
+    parser.add_argument('--window-hours', type=float, default=1.0, help='list cameras due within this many hours')
+    parser.add_argument('--hours', type=float, default=0.0, help='simulate this many hours of ticks (not saved)')
+    parser.add_argument('--tick-minutes', type=float, default=1.0, help='clock step while advancing')
+    args = parser.parse_args()
+
+    now = time.time()
+    start = time.perf_counter()
+    if Path(args.state).exists() and not args.rebuild:
+        scheduler = MonitoringScheduler.load(args.state)
+        print(f"📂 Loaded {len(scheduler)} cameras from {args.state} in {(time.perf_counter() - start) * 1000:.1f} ms")
+    else:
+        scheduler = MonitoringScheduler.from_schedules(load_schedules(args.schedules), now)
+        print(f"🗂️  Compiled {len(scheduler)} schedules in {(time.perf_counter() - start) * 1000:.1f} ms")
+
+    if args.scores:
+        with open(args.scores, 'r') as f:
+            scores = json.load(f)
+        moved = {}
+        for handle, score in scores.items():
+            if handle in scheduler:
+                tier = scheduler.update_score(handle, score, now)
+                if tier is not None:
+                    moved[tier] = moved.get(tier, 0) + 1
+        print(f"🎚️  Applied {len(scores)} score updates; interval changes: {moved or 'none'}")
+
+    due = scheduler.due(now + args.window_hours * 3600)
+    print(f"⏰ {len(due)} cameras due within {args.window_hours:g}h" + (f": {', '.join(due[:10])}" + (' ...' if len(due) > 10 else '') if due else ''))
+
+    if args.hours:
+        # Simulated ticks run on a copy so the saved state is not moved into the future
+        simulated = scheduler.copy()
+        clock, step = now, args.tick_minutes * 60
+        ticks = runs = 0
+        busiest = 0
+        tick_time = 0.0
+        while clock < now + args.hours * 3600:
+            clock += step
+            start = time.perf_counter()
+            ran = simulated.advance(clock)
+            tick_time += time.perf_counter() - start
+            ticks += 1
+            runs += len(ran)
+            busiest = max(busiest, len(ran))
+        print(f"▶️  {ticks} ticks over {args.hours:g}h: {runs} camera runs, busiest tick {busiest}, "
+              f"{tick_time / ticks * 1e6:.1f} µs per tick")
+
+    stats = scheduler.stats()
+    for tier, counts in sorted(stats['tiers'].items()):
+        print(f"   {tier}: {counts['cameras']} cameras, {counts['samples_per_day']:.1f} samples/day")
+    scheduler.save(args.state)
+    print(f"💾 Saved scheduler state to {args.state} ({Path(args.state).stat().st_size / 1024:.1f} KiB)")
+
+
+if __name__ == '__main__':
+    main()
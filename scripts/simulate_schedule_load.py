@@ -0,0 +1,90 @@
+#!/usr/bin/env python3
+"""
+Simulate the request load the monitoring schedule puts on NYCTMC and the vision API.
+
+Replays monitoring_schedules_complete.json over simulated time under each
+phase-offset strategy and prints the peak and mean requests per minute,
+peak concurrency and queue latency for both the frame fetches and the
+vision calls. --escalate moves a fraction of cameras to a lower score
+(shorter interval: the score is hours between samples) partway through
+the run. --scale multiplies the camera count to size
+growth. The full report, with per-minute histograms, goes to
+reports/schedule-simulation-<timestamp>.json.
+"""
+
+import argparse
+import json
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+from vibe_check.monitoring.scheduler import SCHEDULE_COMPLETE, load_schedules
+from vibe_check.monitoring.simulate import (
+    FETCH_STATION,
+    STRATEGIES,
+    VISION_STATION,
+    Station,
+    random_escalations,
+    scale_schedules,
+    schedule_batches,
+    simulate,
+)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--schedules', nargs='+', default=[SCHEDULE_COMPLETE], help='schedule files to replay')
+    parser.add_argument('--strategies', nargs='+', choices=STRATEGIES, default=list(STRATEGIES), help='phase-offset strategies to compare')
+    parser.add_argument('--hours', type=float, default=24.0, help='simulated duration')
+    parser.add_argument('--scale', type=int, default=1, help='replay this many copies of every camera')
+    parser.add_argument('--escalate', type=float, default=0.0, help='fraction of cameras escalated during the run')
+    parser.add_argument('--escalate-hour', type=float, default=8.0, help='simulated hour of the escalation')
+    parser.add_argument('--escalate-score', type=float, default=1.0, help='current_score (hours between samples) the escalated cameras move to')
+    parser.add_argument('--fetch-concurrency', type=int, default=FETCH_STATION.concurrency, help='NYCTMC requests in flight at once')
+    parser.add_argument('--fetch-rate', type=float, default=FETCH_STATION.rate, help='NYCTMC request starts per second (0 for no limit)')
+    parser.add_argument('--fetch-seconds', type=float, default=FETCH_STATION.mean_s, help='mean frame fetch time')
+    parser.add_argument('--vision-concurrency', type=int, default=VISION_STATION.concurrency, help='vision API calls in flight at once')
+    parser.add_argument('--vision-rate', type=float, default=VISION_STATION.rate, help='vision API call starts per second (0 for no limit)')
+    parser.add_argument('--vision-seconds', type=float, default=VISION_STATION.mean_s, help='mean vision API call time')
+    parser.add_argument('--seed', type=int, default=0, help='seed for service times and escalations')
+    parser.add_argument('--output', help='report path (default: reports/schedule-simulation-<timestamp>.json)')
+    args = parser.parse_args()
+
+    schedules = scale_schedules(load_schedules(args.schedules), args.scale)
+    batches = schedule_batches()
+    if args.scale > 1:
+        batches.update({handle: batches.get(handle.split('#')[0]) for handle in schedules})
+    escalations = []
+    if args.escalate:
+        escalations = random_escalations(schedules, args.escalate, args.escalate_hour * 3600, args.escalate_score, args.seed)
+    fetch = Station(FETCH_STATION.name, args.fetch_concurrency, args.fetch_seconds, args.fetch_rate)
+    vision = Station(VISION_STATION.name, args.vision_concurrency, args.vision_seconds, args.vision_rate)
+    print(f"🧮 Simulating {len(schedules)} cameras over {args.hours:g}h"
+          + (f", escalating {len(escalations)} at hour {args.escalate_hour:g}" if escalations else ""))
+
+    results = []
+    for strategy in args.strategies:
+        start = time.perf_counter()
+        result = simulate(schedules, strategy, args.hours * 3600, escalations, batches, fetch, vision, args.seed)
+        result['elapsed_s'] = round(time.perf_counter() - start, 2)
+        results.append(result)
+
+    print(f"{'strategy':<8} {'runs':>6}  {'station':<7} {'peak/min':>8} {'mean/min':>8} {'peak conc':>9} {'wait p99 s':>10} {'wait max s':>10}")
+    for result in results:
+        for station in (fetch.name, vision.name):
+            report = result[station]
+            latency = report['queue_latency_s']
+            print(f"{result['strategy']:<8} {result['camera_runs']:>6}  {station:<7} {report['peak_per_minute']:>8} "
+                  f"{report['mean_per_minute']:>8.2f} {report['peak_concurrency']:>9} "
+                  f"{latency.get('p99', 0):>10.1f} {latency.get('max', 0):>10.1f}")
+
+    output = Path(args.output or f"reports/schedule-simulation-{int(time.time() * 1000)}.json")
+    output.parent.mkdir(parents=True, exist_ok=True)
+    with open(output, 'w') as f:
+        json.dump({'arguments': vars(args), 'results': results}, f)
+    print(f"💾 Saved simulation report to {output}")
+
+
+if __name__ == '__main__':
+    main()
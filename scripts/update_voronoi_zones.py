@@ -0,0 +1,147 @@
+#!/usr/bin/env python3
+"""
+Incrementally update data/complete_voronoi_zones.json after camera changes.
+
+Compares data/zone-lookup.json with the camera snapshot saved by the last
+tessellation run and re-clips only the zones around added, removed or moved
+cameras. Falls back to telling you to run the full build when no snapshot
+exists.
+"""
+
+import argparse
+import json
+import sys
+import time
+from pathlib import Path
+
+import numpy as np
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+from vibe_check.geometry import PreparedBoundary, load_boundary
+from vibe_check.geometry.boundary import LAND_GEOJSON
+from vibe_check.geometry.cameras import ZONE_LOOKUP, filter_cameras, load_cameras
+from vibe_check.geometry.dedup import DEFAULT_POLICY, DEFAULT_RADIUS_M, POLICIES, resolve_duplicates
+from vibe_check.geometry.incremental import update_zones
+from vibe_check.geometry.instrument import Instrumentation, utc_now
+from vibe_check.geometry.metrics import COMPLETE_METRICS, geometry_area_sqm, polygon_metrics, save_metrics
+from vibe_check.geometry.zones import (
+    CAMERA_SNAPSHOT,
+    COMPLETE_SUMMARY,
+    COMPLETE_ZONES,
+    COMPLETE_ZONES_BINARY,
+    load_camera_snapshot,
+    save_camera_snapshot,
+    summarize_zones,
+    write_zones,
+    zone_polygons,
+)
+
+
+def snapshot_sites(snapshot, policy, radius_m):
+    """Handle -> Voronoi site of the last build, re-derived from its camera positions.
+
+    The snapshot keeps source positions; duplicate resolution is
+    deterministic, so running it again over them gives back the sites the
+    last build was tessellated from.
+    """
+    handles = list(snapshot)
+    resolved = resolve_duplicates(list(snapshot.values()), [{'handle': h, 'name': h} for h in handles], policy, radius_m)
+    return {camera['handle']: site for camera, site in zip(resolved.info, resolved.camera_sites.tolist())}
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--cameras', default=ZONE_LOOKUP, help='current camera file')
+    parser.add_argument('--zones', default=COMPLETE_ZONES, help='zone file to patch in place')
+    parser.add_argument('--binary', default=COMPLETE_ZONES_BINARY, help='binary .vcz copy of the zones to rewrite')
+    parser.add_argument('--metrics', default=COMPLETE_METRICS, help='equal-area metrics file to refresh')
+    parser.add_argument('--summary', default=COMPLETE_SUMMARY, help='summary file to refresh')
+    parser.add_argument('--snapshot', default=CAMERA_SNAPSHOT, help='camera positions of the last run')
+    parser.add_argument('--workers', type=int, default=1, help='clip cells on N worker processes')
+    parser.add_argument('--dedup', choices=POLICIES + ('none',), default=DEFAULT_POLICY,
+                        help='how to resolve co-located cameras (use the same policy as the full build)')
+    parser.add_argument('--dedup-radius', type=float, default=DEFAULT_RADIUS_M, help='cameras closer than this many metres count as co-located')
+    parser.add_argument('--trace', action='store_true', help='record tracemalloc peak memory per stage (slows the build)')
+    parser.add_argument('--profile', metavar='PATH', help='dump cProfile stats for the update to PATH')
+    args = parser.parse_args()
+
+    if not Path(args.snapshot).exists() or not Path(args.zones).exists():
+        print(f"❌ No previous tessellation found ({args.snapshot}, {args.zones})")
+        print("   Run scripts/constrained_voronoi_from_geojson.py for a full build first")
+        sys.exit(1)
+
+    start = time.perf_counter()
+    instrument = Instrumentation(trace_memory=args.trace, profile_path=args.profile)
+    with instrument.stage('load'):
+        nyc_boundary = load_boundary(geojson_path=LAND_GEOJSON)
+        all_points, all_info = load_cameras(args.cameras)
+        with open(args.zones, 'r') as f:
+            zones = json.load(f)
+
+    # Same camera filter as the full build: keep cameras on NYC land
+    with instrument.stage('filter'):
+        inside, _ = filter_cameras(all_points, nyc_boundary)
+        camera_points = all_points[inside]
+        camera_info = [camera for camera, keep in zip(all_info, inside) if keep]
+        snapshot = load_camera_snapshot(args.snapshot)
+        sites = site_of = old_sites = None
+        if args.dedup != 'none':
+            resolved = resolve_duplicates(camera_points, camera_info, args.dedup, args.dedup_radius)
+            camera_points, camera_info = resolved.points, resolved.info
+            sites, site_of = resolved.sites, resolved.site_of
+            old_sites = snapshot_sites(snapshot, args.dedup, args.dedup_radius)
+
+    try:
+        with instrument.stage('update'):
+            diff, affected = update_zones(
+                zones,
+                snapshot,
+                camera_info,
+                camera_points,
+                PreparedBoundary(nyc_boundary),
+                nyc_boundary.bounds,
+                workers=args.workers,
+                sites=sites,
+                site_of=site_of,
+                old_sites=old_sites,
+            )
+    except ValueError as e:
+        print(f"❌ {e} (use --dedup {' or '.join(POLICIES)})")
+        sys.exit(1)
+    if not diff:
+        print("✅ No camera changes - zones are up to date")
+        return
+
+    print(f"📸 Camera changes: {len(diff.added)} added, {len(diff.removed)} removed, {len(diff.moved)} moved")
+    print(f"⚡ Re-clipped {len(affected)} of {len(camera_info)} zones")
+
+    with instrument.stage('write'):
+        polygons = [polygon for _, polygon in zone_polygons(zones)]
+        write_zones(zip(zones, polygons), args.zones, args.binary)
+
+    # Metrics are cheap enough to recompute for every zone
+    with instrument.stage('metrics'):
+        zone_points = np.array([[zone['coordinates'][1], zone['coordinates'][0]] for zone in zones]).reshape(-1, 2)
+        metrics = polygon_metrics(polygons, zone_points)
+        save_metrics([zone['handle'] for zone in zones], metrics, args.metrics)
+
+    if Path(args.summary).exists():
+        with open(args.summary, 'r') as f:
+            summary = json.load(f)
+        summary.update(summarize_zones(zones, metrics['area_sqm'], geometry_area_sqm(nyc_boundary)))
+        summary['generated_at'] = utc_now()
+        summary['instrumentation'] = instrument.report(
+            mode='incremental',
+            workers=args.workers,
+            changes={'added': len(diff.added), 'removed': len(diff.removed), 'moved': len(diff.moved)},
+            reclipped_zones=len(affected),
+        )
+        with open(args.summary, 'w') as f:
+            json.dump(summary, f, indent=2)
+
+    save_camera_snapshot(camera_info, np.asarray(camera_points))
+    print(f"💾 Patched {args.zones} ({len(zones)} zones) in {time.perf_counter() - start:.2f}s")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,34 @@
+import sys
+from pathlib import Path
+
+import numpy as np
+import pytest
+import shapely
+
+# Import vibe_check from the checkout, as the scripts do
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+
+@pytest.fixture
+def land():
+    """A small synthetic 'city': a notched island with a lake, plus an islet"""
+    main = shapely.Polygon(
+        [(-74.00, 40.60), (-73.90, 40.60), (-73.90, 40.70), (-73.94, 40.70),
+         (-73.95, 40.66), (-73.96, 40.70), (-74.00, 40.70)],
+        [[(-73.99, 40.61), (-73.97, 40.61), (-73.97, 40.63), (-73.99, 40.63)]],
+    )
+    islet = shapely.box(-73.89, 40.61, -73.88, 40.62)
+    return shapely.MultiPolygon([main, islet])
+
+
+@pytest.fixture
+def camera_set(land):
+    """60 cameras on ``land`` as ``(points, info)``, like ``load_cameras`` returns"""
+    rng = np.random.default_rng(7)
+    points = []
+    while len(points) < 60:
+        lng, lat = rng.uniform(-74.0, -73.88), rng.uniform(40.6, 40.7)
+        if shapely.intersects_xy(land, lng, lat):
+            points.append([lng, lat])
+    info = [{'handle': f"MN_{i:03d}", 'name': f"Camera {i}", 'integer_id': i + 1} for i in range(len(points))]
+    return np.array(points), info
@@ -0,0 +1,114 @@
+"""
+Prepared boundary clipping and the compiled VCBOUND1 boundary artifact.
+"""
+
+import json
+
+import numpy as np
+import pytest
+import shapely
+
+from vibe_check.geometry import boundary as boundary_module
+from vibe_check.geometry.boundary import (
+    ARTIFACT_MAGIC,
+    PreparedBoundary,
+    load_boroughs,
+    load_boundary,
+    read_artifact_header,
+    split_boundary,
+)
+
+
+def test_split_boundary_pieces_are_small_and_cover_the_land(land):
+    pieces = split_boundary(land, max_vertices=8)
+    assert len(pieces) > len(land.geoms)
+    assert (shapely.get_num_coordinates(pieces) <= 8).all()
+    assert shapely.area(pieces).sum() == pytest.approx(land.area, rel=1e-12)
+    assert shapely.union_all(pieces).symmetric_difference(land).area < 1e-12 * land.area
+
+
+def test_prepared_clip_matches_plain_intersection(land, camera_set):
+    points, _ = camera_set
+    prepared = PreparedBoundary(land, max_vertices=8)
+    cells = np.concatenate([
+        shapely.buffer(shapely.points(points), 0.004, quad_segs=4),
+        [
+            shapely.box(-73.998, 40.602, -73.997, 40.603),  # well inside one piece
+            shapely.box(-73.985, 40.615, -73.975, 40.625),  # inside the lake
+            shapely.box(-73.50, 40.50, -73.40, 40.60),  # nowhere near the land
+            shapely.box(-74.10, 40.50, -73.80, 40.80),  # covers everything
+        ],
+    ])
+    clipped = prepared.clip(cells)
+    expected = shapely.intersection(cells, land)
+
+    assert len(clipped) == len(cells)
+    for cell, got, want in zip(cells, clipped, expected):
+        if want.is_empty:
+            assert got is None
+        else:
+            assert got.symmetric_difference(want).area < 1e-12 * want.area
+    # The contained-cell shortcut hands back the cell itself
+    assert clipped[len(points)] is cells[len(points)]
+    assert clipped[-1].area == pytest.approx(land.area, rel=1e-12)
+
+
+def write_boroughs(path, features):
+    path.write_text(json.dumps({
+        'type': 'FeatureCollection',
+        'features': [
+            {'type': 'Feature', 'properties': {'BoroCode': code, 'BoroName': name},
+             'geometry': json.loads(shapely.to_geojson(geometry))}
+            for code, name, geometry in features
+        ],
+    }))
+
+
+@pytest.fixture
+def boroughs():
+    # A borough with a lake hole sharing an edge with a plain one
+    with_lake = shapely.Polygon([(0, 0), (2, 0), (2, 2), (0, 2)], [[(0.5, 0.5), (1.5, 0.5), (1.5, 1.5), (0.5, 1.5)]])
+    return [(1, 'Lakeside', with_lake), (2, 'Plain', shapely.box(2, 0, 3, 2))]
+
+
+def test_artifact_round_trip_keeps_holes(tmp_path, boroughs):
+    source = tmp_path / 'boroughs.geojson'
+    write_boroughs(source, boroughs)
+
+    land = load_boundary(geojson_path=source)
+    assert (tmp_path / 'boroughs.wkb').read_bytes().startswith(ARTIFACT_MAGIC)
+    assert land.equals(shapely.Polygon([(0, 0), (3, 0), (3, 2), (0, 2)], [boroughs[0][2].interiors[0].coords]))
+    assert len(land.interiors) == 1
+    assert not shapely.intersects_xy(land, 1, 1)
+
+    loaded = load_boroughs(geojson_path=source)
+    assert [(code, name) for code, name, _ in loaded] == [(1, 'Lakeside'), (2, 'Plain')]
+    for (_, _, geometry), (_, _, original) in zip(loaded, boroughs):
+        assert geometry.equals_exact(original, 0)
+    assert len(loaded[0][2].interiors) == 1
+
+    # Coarser levels come from the same file, still with the hole
+    coarse = load_boundary(tolerance=0.01, geojson_path=source)
+    assert len(coarse.interiors) == 1
+
+
+def test_changed_source_recompiles_and_unchanged_does_not(tmp_path, monkeypatch, boroughs):
+    source, artifact = tmp_path / 'boroughs.geojson', tmp_path / 'compiled.wkb'
+    write_boroughs(source, boroughs)
+    load_boundary(geojson_path=source, artifact_path=artifact)
+    first, _ = read_artifact_header(artifact)
+
+    compiles = []
+    compile_boundary = boundary_module.compile_boundary
+    monkeypatch.setattr(boundary_module, 'compile_boundary', lambda *args: compiles.append(args) or compile_boundary(*args))
+
+    assert load_boundary(geojson_path=source, artifact_path=artifact).area == pytest.approx(5.0)
+    assert compiles == []
+
+    write_boroughs(source, boroughs[:1])
+    assert load_boundary(geojson_path=source, artifact_path=artifact).area == pytest.approx(3.0)
+    assert len(compiles) == 1
+    second, _ = read_artifact_header(artifact)
+    assert second['source_sha256'] != first['source_sha256']
+    assert [name for _, name, _ in load_boroughs(geojson_path=source, artifact_path=artifact)] == ['Lakeside']
+    assert len(compiles) == 1
@@ -0,0 +1,261 @@
+"""Camera health checker, backoff and frame cache against the local stub camera server."""
+
+import asyncio
+import itertools
+import time
+
+import aiohttp
+import pytest
+
+from vibe_check.cameras.backoff import HealthTracker
+from vibe_check.cameras.frames import FrameCache
+from vibe_check.cameras.health import HostRateLimiter, check_cameras_async
+from vibe_check.cameras.stub import PLACEHOLDER_JPEG, stub_behaviour, stub_camera_server
+
+
+def camera_ids(behaviour, n=1):
+    """The first ``n`` camera ids the stub serves with ``behaviour``"""
+    ids = (f"cam-{i:05d}" for i in itertools.count())
+    return list(itertools.islice((camera_id for camera_id in ids if stub_behaviour(camera_id) == behaviour), n))
+
+
+def cameras_at(base_url, ids):
+    return [{'handle': camera_id, 'name': camera_id, 'url': f"{base_url}/api/cameras/{camera_id}/image"} for camera_id in ids]
+
+
+def probe(behaviour, n=1, server=None, **options):
+    """Probe ``n`` stub cameras with ``behaviour``; returns the probes and the stub's state"""
+    options.setdefault('rate', 0)
+
+    async def run():
+        async with stub_camera_server(**(server or {})) as (base_url, stub):
+            probes = await check_cameras_async(cameras_at(base_url, camera_ids(behaviour, n)), **options)
+            return probes, stub
+
+    return asyncio.run(run())
+
+
+def test_ok_camera_is_healthy():
+    (result,), _ = probe('ok')
+    assert result.ok
+    assert result.status == 200
+    assert result.content_type.startswith('image/jpeg')
+    assert result.error is None
+    assert result.latency_ms is not None
+
+
+def test_placeholder_still_counts_as_an_image():
+    (result,), _ = probe('placeholder')
+    assert result.ok
+
+
+@pytest.mark.parametrize('behaviour, status', [('not_found', 404), ('server_error', 500)])
+def test_http_errors_fail(behaviour, status):
+    (result,), _ = probe(behaviour)
+    assert not result.ok
+    assert result.status == status
+    assert result.error == f"HTTP {status}"
+
+
+def test_non_image_body_fails():
+    (result,), _ = probe('not_image')
+    assert not result.ok
+    assert result.status == 200
+    assert result.error.startswith('not an image (text/html')
+
+
+def test_refused_head_falls_back_to_get():
+    (result,), stub = probe('no_head')
+    assert result.ok
+    assert result.status == 200
+    # HEAD, answered 405, then the GET
+    assert stub.hits == 2
+
+
+def test_stalled_camera_hits_the_timeout():
+    async def run():
+        async with stub_camera_server(stall_s=2.0) as (base_url, _):
+            start = time.perf_counter()
+            probes = await check_cameras_async(cameras_at(base_url, camera_ids('stall')), rate=0, timeout=0.3)
+            return probes, time.perf_counter() - start
+
+    (result,), elapsed = asyncio.run(run())
+    assert not result.ok
+    assert result.error == 'timeout'
+    assert result.status is None
+    assert elapsed < 1.0
+
+
+def test_results_keep_input_order():
+    async def run():
+        async with stub_camera_server() as (base_url, _):
+            ids = camera_ids('ok', 3) + camera_ids('not_found', 2) + camera_ids('ok', 5)[3:]
+            cameras = cameras_at(base_url, ids)
+            return ids, await check_cameras_async(cameras, rate=0)
+
+    ids, probes = asyncio.run(run())
+    assert [result.handle for result in probes] == ids
+
+
+def test_concurrency_cap_bounds_requests_in_flight():
+    probes, stub = probe('ok', n=40, server={'latency_s': 0.05}, concurrency=5)
+    assert all(result.ok for result in probes)
+    assert stub.hits == 40
+    assert 1 < stub.max_in_flight <= 5
+
+
+def test_rate_limit_spaces_request_starts():
+    start = time.perf_counter()
+    probes, _ = probe('ok', n=10, server={'latency_s': 0.0}, rate=20)
+    # Ten starts at 20/s take at least nine intervals
+    assert time.perf_counter() - start >= 9 / 20 * 0.95
+    assert all(result.ok for result in probes)
+
+
+def test_rate_limiter_queues_concurrent_callers_per_host():
+    async def run():
+        limiter = HostRateLimiter(rate=10)
+        loop = asyncio.get_running_loop()
+        start = loop.time()
+        starts = {}
+
+        async def claim(host, i):
+            await limiter.wait(host)
+            starts[host, i] = loop.time() - start
+
+        await asyncio.gather(*(claim(host, i) for host in ('a', 'b') for i in range(4)))
+        return starts
+
+    starts = asyncio.run(run())
+    for host in ('a', 'b'):
+        times = sorted(starts[host, i] for i in range(4))
+        gaps = [later - earlier for earlier, later in zip(times, times[1:])]
+        assert min(gaps) >= 0.09
+    # Hosts are limited independently: both start their first request at once
+    assert abs(starts['a', 0] - starts['b', 0]) < 0.05
+
+
+def test_backoff_doubles_until_capped_and_resets_on_success():
+    tracker = HealthTracker(max_delay_s=8 * 3600, multiplier=2, jitter=0)
+    tracker.register('cam', interval_s=3600)
+    now = 0.0
+    delays = []
+    for _ in range(5):
+        next_probe = tracker.record('cam', ok=False, now=now)
+        delays.append(next_probe - now)
+        now = next_probe
+    assert delays == [2 * 3600, 4 * 3600, 8 * 3600, 8 * 3600, 8 * 3600]
+    assert tracker['cam'].state == 'failing'
+    assert tracker.due(now - 1) == []
+    assert tracker.due(now) == ['cam']
+
+    next_probe = tracker.record('cam', ok=True, now=now)
+    assert next_probe - now == 3600
+    assert tracker['cam'].failures == 0
+    assert tracker['cam'].state == 'online'
+    # 1 + 3 + 7 + 7 + 7 skipped fetches while backing off
+    assert tracker.stats()['fetches_saved'] == 25
+
+
+def test_offline_cameras_register_one_failure_into_backoff():
+    tracker = HealthTracker(multiplier=2, jitter=0)
+    tracker.register('up', interval_s=100, now=1000.0)
+    tracker.register('down', interval_s=100, online=False, now=1000.0)
+    assert tracker['up'].next_probe == 1000.0
+    assert (tracker['down'].failures, tracker['down'].next_probe) == (1, 1200.0)
+    assert tracker.due(1000.0) == ['up']
+    assert tracker.due(1200.0) == ['up', 'down']
+    # Registering again only updates the interval
+    tracker.register('down', interval_s=50, online=False, now=5000.0)
+    assert (tracker['down'].interval_s, tracker['down'].next_probe) == (50, 1200.0)
+
+
+def test_backoff_jitter_stays_within_bounds():
+    tracker = HealthTracker(multiplier=2, jitter=0.1, seed=1)
+    tracker.register('cam', interval_s=100, online=False)
+    delays = {tracker.backoff_delay(tracker['cam']) for _ in range(200)}
+    assert len(delays) > 1
+    assert all(180 <= delay <= 220 for delay in delays)
+
+
+def test_backoff_follows_stub_probe_results(tmp_path):
+    async def run():
+        async with stub_camera_server() as (base_url, _):
+            cameras = cameras_at(base_url, camera_ids('ok') + camera_ids('server_error'))
+            return await check_cameras_async(cameras, rate=0)
+
+    tracker = HealthTracker(jitter=0)
+    now = 0.0
+    for _ in range(3):
+        for result in asyncio.run(run()):
+            tracker.register(result.handle, interval_s=60, now=now)
+            tracker.record(result.handle, result.ok, now)
+        now += 60
+    ok, failing = camera_ids('ok')[0], camera_ids('server_error')[0]
+    assert tracker[ok].state == 'online'
+    assert tracker[ok].next_probe == now
+    assert tracker[failing].failures == 3
+    assert tracker[failing].next_probe == 120 + 60 * 2 ** 3
+
+    tracker.save(tmp_path / 'state.json')
+    restored = HealthTracker.load(tmp_path / 'state.json')
+    assert restored[failing] == tracker[failing]
+
+
+def test_frame_cache_revalidates_with_304(tmp_path):
+    async def run():
+        async with stub_camera_server(latency_s=0.0) as (base_url, _):
+            cache = FrameCache(tmp_path / 'frames')
+            ids = camera_ids('ok', 2)
+            async with aiohttp.ClientSession() as session:
+                urls = [camera['url'] for camera in cameras_at(base_url, ids)]
+                first = [await cache.fetch(session, url) for url in urls]
+                second = [await cache.fetch(session, url) for url in urls]
+            return cache, first, second
+
+    cache, first, second = asyncio.run(run())
+    assert first == second
+    assert first[0] != first[1]
+    assert cache.stats.downloaded == 2
+    assert cache.stats.not_modified == 2
+    assert cache.stats.bytes_not_modified == sum(len(frame) for frame in first)
+    assert all(entry.etag for entry in cache.entries.values())
+
+    cache.save()
+    reloaded = FrameCache(tmp_path / 'frames')
+    assert reloaded.conditional_headers(camera_ids('ok')[0])['If-None-Match'] == cache.entries[camera_ids('ok')[0]].etag
+
+
+def test_frame_cache_downloads_a_changed_frame(tmp_path):
+    async def run():
+        async with stub_camera_server(latency_s=0.0, frame_period_s=0.5) as (base_url, _):
+            cache = FrameCache(tmp_path / 'frames')
+            (url,) = [camera['url'] for camera in cameras_at(base_url, camera_ids('ok'))]
+            async with aiohttp.ClientSession() as session:
+                first = await cache.fetch(session, url)
+                await asyncio.sleep(0.6)
+                second = await cache.fetch(session, url)
+            return cache, first, second
+
+    cache, first, second = asyncio.run(run())
+    assert first != second
+    assert cache.stats.downloaded == 2
+    assert cache.stats.not_modified == 0
+
+
+def test_frame_cache_stores_the_placeholder_once(tmp_path):
+    async def run():
+        async with stub_camera_server(latency_s=0.0) as (base_url, _):
+            cache = FrameCache(tmp_path / 'frames')
+            async with aiohttp.ClientSession() as session:
+                frames = [await cache.fetch(session, camera['url'])
+                          for camera in cameras_at(base_url, camera_ids('placeholder', 3) + camera_ids('not_found'))]
+            return cache, frames
+
+    cache, frames = asyncio.run(run())
+    assert frames[:3] == [PLACEHOLDER_JPEG] * 3
+    assert frames[3] is None
+    assert cache.stats.deduplicated == 2
+    assert cache.stats.errors == 1
+    assert cache.summary()['distinct_payloads'] == 1
+    assert len(list((tmp_path / 'frames' / 'blobs').glob('*/*.jpg'))) == 1
@@ -0,0 +1,88 @@
+"""
+Frame change detection: thresholds, skip counts and undecodable payloads.
+"""
+
+import io
+
+import numpy as np
+import pytest
+from PIL import Image
+
+from vibe_check.cameras.change import ChangeDetector, change_score, frame_signature
+
+
+def encode(level, size=(64, 48), fmt='PNG'):
+    """A flat grayscale image at ``level`` (0-255)"""
+    buffer = io.BytesIO()
+    Image.new('L', size, level).save(buffer, fmt)
+    return buffer.getvalue()
+
+
+def test_signature_of_a_jpeg_is_decoded_in_draft_mode():
+    image = np.zeros((480, 640), dtype=np.uint8)
+    image[:, 320:] = 200
+    buffer = io.BytesIO()
+    Image.fromarray(image).save(buffer, 'JPEG', quality=95)
+    signature = frame_signature(buffer.getvalue())
+    assert signature.shape == (16, 16) and signature.dtype == np.uint8
+    assert np.abs(signature[:, :7].astype(int)).max() <= 2
+    assert np.abs(signature[:, 9:].astype(int) - 200).max() <= 2
+    assert change_score(signature, signature) == 0.0
+
+
+def test_frames_pass_only_past_the_threshold():
+    detector = ChangeDetector(default_threshold=0.03, thresholds={'quiet': 0.1})
+    assert detector.check('cam', encode(100)) == (True, 1.0)
+    assert detector.check('cam', encode(100)) == (False, 0.0)  # byte-identical, never decoded
+
+    changed, score = detector.check('cam', encode(104))
+    assert not changed and score == pytest.approx(4 / 255)
+    # Drift is measured from the last frame that passed, so it accumulates
+    changed, score = detector.check('cam', encode(108))
+    assert changed and score == pytest.approx(8 / 255)
+    changed, score = detector.check('cam', encode(112))
+    assert not changed and score == pytest.approx(4 / 255)
+
+    detector.check('quiet', encode(100))
+    assert detector.check('quiet', encode(120))[0] is False
+    assert detector.check('quiet', encode(130))[0] is True
+
+    stats = detector.stats()
+    assert stats['per_camera']['cam'] == {
+        'seen': 5, 'passed': 2, 'identical': 1, 'threshold': 0.03,
+    }
+    assert stats['per_camera']['quiet']['threshold'] == 0.1
+    assert (stats['frames_seen'], stats['frames_passed'], stats['frames_skipped']) == (8, 4, 4)
+    assert stats['skip_rate'] == pytest.approx(50.0)
+    assert stats['passed_undecodable'] == 0
+
+
+@pytest.mark.parametrize('payload', [b'<html>502 Bad Gateway</html>', b'', encode(50, fmt='JPEG')[:200]],
+                         ids=['html', 'empty', 'truncated-jpeg'])
+def test_undecodable_frames_pass_and_are_counted(payload):
+    detector = ChangeDetector()
+    detector.check('cam', encode(100))
+    reference = detector.signatures['cam'].copy()
+
+    assert detector.check('cam', payload) == (True, 1.0)
+    assert detector.check('cam', payload) == (True, 1.0)
+    # The reference is still the last decodable frame
+    assert np.array_equal(detector.signatures['cam'], reference)
+    assert detector.check('cam', encode(100))[0] is False
+
+    stats = detector.stats()
+    assert stats['per_camera']['cam']['undecodable'] == 2
+    assert (stats['frames_seen'], stats['frames_passed'], stats['passed_undecodable']) == (4, 3, 2)
+
+
+def test_save_load_keeps_references_and_counts(tmp_path):
+    detector = ChangeDetector()
+    detector.check('a', encode(10))
+    detector.check('b', encode(20))
+    detector.check('b', b'not an image')
+    detector.save(tmp_path / 'state.npz')
+
+    loaded = ChangeDetector().load(tmp_path / 'state.npz')
+    assert loaded.stats() == detector.stats()
+    assert loaded.check('a', encode(10)) == (False, 0.0)
+    assert loaded.check('b', encode(21))[0] is False
@@ -0,0 +1,119 @@
+"""
+Co-located camera resolution: clusters and the merge, jitter and group policies.
+"""
+
+import numpy as np
+import pytest
+
+from vibe_check.geometry.dedup import find_clusters, resolve_duplicates
+from vibe_check.geometry.metrics import laea_project
+from vibe_check.geometry.tessellation import bounded_voronoi_cells
+
+M_PER_DEG_LNG = 111_000.0 * np.cos(np.radians(40.7))
+
+
+@pytest.fixture
+def cameras():
+    """Eight cameras in three clusters: exact + near, near only, exact only"""
+    a = np.array([-73.95, 40.70])
+    e = np.array([-73.94, 40.71])
+    g = np.array([-73.93, 40.72])
+    points = np.array([
+        a,                                # 0: cluster 1
+        [-73.96, 40.69],                  # 1: alone
+        a,                                # 2: cluster 1, same position as 0
+        e,                                # 3: cluster 2
+        a + [0.5 / M_PER_DEG_LNG, 0],     # 4: cluster 1, 0.5 m east of 0
+        e + [0, 0.3 / 111_000.0],         # 5: cluster 2, 0.3 m north of 3
+        g,                                # 6: cluster 3
+        g,                                # 7: cluster 3, same position as 6
+    ])
+    info = [{'handle': f"MN_{i}", 'name': f"Camera {i}"} for i in range(len(points))]
+    return points, info
+
+
+def distances_m(points, center):
+    x, y = laea_project(points[:, 0], points[:, 1])
+    cx, cy = laea_project(*center)
+    return np.hypot(x - cx, y - cy)
+
+
+def test_clusters_chain_within_the_radius(cameras):
+    points, _ = cameras
+    assert [group.tolist() for group in find_clusters(points)] == [[0, 2, 4], [3, 5], [6, 7]]
+    assert [group.tolist() for group in find_clusters(points, radius_m=0.2)] == [[0, 2], [6, 7]]
+    assert find_clusters(points[:2]) == []
+
+
+def test_merge_keeps_the_first_camera_of_each_cluster(cameras):
+    points, info = cameras
+    resolved = resolve_duplicates(points, info, 'merge')
+    assert resolved.keep.tolist() == [0, 1, 3, 6]
+    assert np.array_equal(resolved.points, points[[0, 1, 3, 6]])
+    assert np.array_equal(resolved.sites, resolved.points)
+    assert resolved.site_of.tolist() == [0, 1, 2, 3]
+    assert [camera['handle'] for camera in resolved.info] == ['MN_0', 'MN_1', 'MN_3', 'MN_6']
+    assert resolved.info[0]['co_located_handles'] == ['MN_2', 'MN_4']
+    assert 'co_located_handles' not in resolved.info[1]
+    assert 'co_located_handles' not in info[0]  # inputs are not modified
+
+    report = resolved.report
+    assert (report['cameras_in'], report['cameras_out'], report['sites']) == (8, 4, 4)
+    assert (report['clusters'], report['exact_clusters'], report['cameras_in_clusters']) == (3, 1, 7)
+    assert [change['action'] for change in report['changes']] == ['kept MN_0', 'kept MN_3', 'kept MN_6']
+    assert [change['max_separation_m'] for change in report['changes']] == pytest.approx([0.5, 0.3, 0.0], abs=0.01)
+
+
+def test_jitter_gives_every_camera_its_own_site(cameras):
+    points, info = cameras
+    resolved = resolve_duplicates(points, info, 'jitter', jitter_m=1.0)
+    assert resolved.keep.tolist() == list(range(8))
+    # Cameras keep their positions; only the Voronoi sites move
+    assert np.array_equal(resolved.points, points)
+    assert resolved.site_of.tolist() == list(range(8))
+    assert np.array_equal(resolved.sites[1], points[1])
+    assert len(np.unique(resolved.sites, axis=0)) == 8
+
+    for members in ([0, 2, 4], [3, 5], [6, 7]):
+        center = points[members].mean(axis=0)
+        # Evenly spaced on a circle of jitter_m around the cluster centre
+        radius = distances_m(resolved.sites[members], center)
+        assert radius == pytest.approx(1.0, rel=0.01)
+        spacing = 2 * np.sin(np.pi / len(members))
+        gaps = distances_m(resolved.sites[members], resolved.sites[members[0]])[1:]
+        assert gaps.min() == pytest.approx(spacing, rel=0.01)
+    assert resolved.report['jitter_m'] == 1.0
+    assert resolved.report['sites'] == 8
+
+    # Every camera gets its own cell around its site
+    cells = bounded_voronoi_cells(resolved.sites, (-74.0, 40.6, -73.9, 40.8))
+    assert len(cells) == 8 and all(cell.area > 0 for cell in cells)
+
+
+def test_jitter_never_pulls_a_wide_cluster_together(cameras):
+    points, info = cameras
+    resolved = resolve_duplicates(points, info, 'jitter', radius_m=1.0, jitter_m=0.1)
+    # Cluster 1 spans 0.5 m, so its circle keeps that radius rather than 0.1 m
+    center = points[[0, 2, 4]].mean(axis=0)
+    assert distances_m(resolved.sites[[0, 2, 4]], center).max() == pytest.approx(distances_m(points[[4]], center)[0], rel=0.01)
+
+
+def test_group_shares_one_site_per_cluster(cameras):
+    points, info = cameras
+    resolved = resolve_duplicates(points, info, 'group')
+    assert resolved.keep.tolist() == list(range(8))
+    assert np.array_equal(resolved.points, points)
+    assert np.array_equal(resolved.sites, points[[0, 1, 3, 6]])
+    assert resolved.site_of.tolist() == [0, 1, 0, 2, 0, 2, 3, 3]
+    assert np.array_equal(resolved.camera_sites[4], points[0])
+    assert resolved.info[4]['co_located_handles'] == ['MN_0', 'MN_2']
+    assert [change['action'] for change in resolved.report['changes']] == [
+        'share the zone of MN_0', 'share the zone of MN_3', 'share the zone of MN_6',
+    ]
+    assert (resolved.report['cameras_out'], resolved.report['sites']) == (8, 4)
+
+
+def test_unknown_policy_is_rejected(cameras):
+    points, info = cameras
+    with pytest.raises(ValueError, match='unknown duplicate policy'):
+        resolve_duplicates(points, info, 'average')
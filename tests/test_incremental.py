@@ -0,0 +1,66 @@
+"""
+Incremental zone updates against a full rebuild of the same cameras.
+"""
+
+import numpy as np
+import shapely
+
+from vibe_check.geometry import PreparedBoundary, bounded_voronoi_cells, clip_cells
+from vibe_check.geometry.incremental import diff_cameras, update_zones
+from vibe_check.geometry.zones import zone_records
+
+
+def full_build(points, info, land):
+    cells = bounded_voronoi_cells(points, land.bounds)
+    return zone_records(clip_cells(cells, PreparedBoundary(land)), info, points)
+
+
+def polygon(zone):
+    return shapely.geometry.shape(zone['voronoi_polygon'])
+
+
+def test_add_remove_and_move_match_a_full_rebuild(land, camera_set):
+    points, info = camera_set
+    zones = full_build(points, info, land)
+    before = {zone['handle']: zone for zone in zones}
+    snapshot = {camera['handle']: point.tolist() for camera, point in zip(info, points)}
+
+    # Remove camera 5, move camera 10 by ~300 m, add a camera near camera 20
+    keep = np.arange(len(points)) != 5
+    new_points = points[keep].copy()
+    new_info = [camera for camera, kept in zip(info, keep) if kept]
+    new_points[9] += [0.003, 0.001]
+    new_points = np.vstack([new_points, points[20] + [0.002, -0.002]])
+    new_info.append({'handle': 'MN_NEW', 'name': 'New camera', 'integer_id': 999})
+
+    diff, affected = update_zones(zones, snapshot, new_info, new_points, PreparedBoundary(land), land.bounds)
+    assert (diff.added, diff.removed, diff.moved) == (['MN_NEW'], ['MN_005'], ['MN_010'])
+    assert {'MN_NEW', 'MN_010'} <= affected
+    assert len(affected) < len(new_info) // 2
+
+    rebuilt = {zone['handle']: zone for zone in full_build(new_points, new_info, land)}
+    assert [zone['handle'] for zone in zones] == [camera['handle'] for camera in new_info]
+    for zone in zones:
+        expected = polygon(rebuilt[zone['handle']])
+        assert polygon(zone).symmetric_difference(expected).area < 1e-12 * expected.area + 1e-15
+        assert zone['coordinates'] == rebuilt[zone['handle']]['coordinates']
+
+    # Zones outside the affected neighbourhood are the untouched original records
+    for zone in zones:
+        if zone['handle'] not in affected:
+            assert zone is before[zone['handle']]
+
+
+def test_no_changes_leave_zones_alone(land, camera_set):
+    points, info = camera_set
+    zones = full_build(points, info, land)
+    original = list(zones)
+    snapshot = {camera['handle']: point.tolist() for camera, point in zip(info, points)}
+    diff, affected = update_zones(zones, snapshot, info, points, PreparedBoundary(land), land.bounds)
+    assert not diff and affected == set()
+    assert all(a is b for a, b in zip(zones, original))
+
+
+def test_diff_cameras():
+    diff = diff_cameras({'a': (0, 0), 'b': (1, 1), 'c': (2, 2)}, {'a': (0, 0), 'b': (1, 2), 'd': (3, 3)})
+    assert (diff.added, diff.removed, diff.moved, len(diff)) == (['d'], ['c'], ['b'], 3)
@@ -0,0 +1,52 @@
+"""
+Streaming zone join over two unit squares, including the group-column cap.
+"""
+
+import pandas as pd
+import pytest
+import shapely
+
+from vibe_check.geometry.join import join_to_zones
+from vibe_check.geometry.lookup import ZoneLookup
+
+
+@pytest.fixture
+def zones():
+    return ZoneLookup([shapely.box(0, 0, 1, 1), shapely.box(1, 0, 2, 1)], ['left', 'right'])
+
+
+def write_events(path, categories):
+    rows = len(categories)
+    pd.DataFrame({
+        'longitude': [0.5 + (i % 2) for i in range(rows)],
+        'latitude': [0.5] * rows,
+        'category': categories,
+        'amount': range(rows),
+    }).to_csv(path, index=False)
+
+
+def test_join_counts_sums_and_groups(tmp_path, zones):
+    path = tmp_path / 'events.csv'
+    write_events(path, ['noise', 'noise', 'heat', 'noise', 'heat', None])
+    aggregates = join_to_zones(path, zones, sum_columns=['amount'], group_column='category', chunk_rows=4)
+    rows = {row['zone_id']: row for row in aggregates.iter_rows()}
+    assert rows['left'] == {'zone_id': 'left', 'count': 3, 'amount_sum': 6.0, 'top_category': 'heat (2); noise (1)'}
+    assert rows['right']['count'] == 3
+    assert rows['right']['top_category'] == 'noise (2); nan (1)'
+    assert aggregates.categories == {'noise', 'heat', None}
+
+
+def test_group_column_past_the_cap_is_rejected(tmp_path, zones):
+    path = tmp_path / 'events.csv'
+    write_events(path, [f"id-{i}" for i in range(50)])
+    with pytest.raises(ValueError, match="'category' has more than 10 distinct values"):
+        join_to_zones(path, zones, group_column='category', chunk_rows=7, max_groups=10)
+    aggregates = join_to_zones(path, zones, group_column='category', chunk_rows=7, max_groups=None)
+    assert len(aggregates.categories) == 50
+
+
+def test_group_cap_counts_distinct_values_across_chunks(tmp_path, zones):
+    path = tmp_path / 'events.csv'
+    write_events(path, ['a', 'b', 'c'] * 20)
+    aggregates = join_to_zones(path, zones, group_column='category', chunk_rows=2, max_groups=3)
+    assert aggregates.categories == {'a', 'b', 'c'}
@@ -0,0 +1,152 @@
+"""
+Streaming JSON readers against ``json.load``, with chunk sizes small enough
+that every number, escape sequence and bracket straddles a read boundary.
+"""
+
+import json
+
+import pytest
+
+from vibe_check import json_stream
+from vibe_check.json_stream import iter_array, iter_object, iter_records
+
+CHUNK_SIZES = [1, 2, 7]
+
+NUMBERS = [0, -0, 1, -1, 7, 1.5, -2.5e-3, 1e10, 3.0e+2, 6.02E23, 1.0, 0.001, 123456789012345678901234567890, -9.75e-301]
+
+STRINGS = [
+    '',
+    'plain',
+    'quote " inside',
+    'back\\slash',
+    'slash / and \\/',
+    'tab\tnew\nline\rcarriage',
+    'café 中文',
+    'emoji \U0001F600',
+    '\u0000 control \u001f',
+    ',:]}[{ delimiters',
+]
+
+NESTED = [
+    [],
+    {},
+    [[]],
+    [{}],
+    {'a': {}},
+    {'a': [1, {'b': []}], 'c': {'d': {'e': [[], {}]}}},
+    [[[[1]]], [[]], {}],
+    None,
+    True,
+    False,
+]
+
+OBJECT = {
+    '': 1,
+    'k"ey': [],
+    'escaped \\ key': {'x': 'é'},
+    'nested': {'x': {'y': [], 'z': {}}},
+    'numbers': NUMBERS,
+    'strings': STRINGS,
+    'empty array': [],
+    'empty object': {},
+    'n': -0.0,
+    'last': 12345,
+}
+
+ARRAYS = {'numbers': NUMBERS, 'strings': STRINGS, 'nested': NESTED, 'empty': [], 'objects': [OBJECT, OBJECT]}
+FORMATS = {
+    'compact': {'separators': (',', ':')},
+    'indented': {'indent': 2},
+    'ascii': {'ensure_ascii': True},
+    'unicode': {'ensure_ascii': False},
+}
+
+
+@pytest.fixture
+def fallback(monkeypatch):
+    """Force the raw_decode reader even where ijson is installed"""
+    monkeypatch.setattr(json_stream, 'ijson', None)
+
+
+def write_json(path, data, options):
+    path.write_text(json.dumps(data, **options), encoding='utf-8')
+    with open(path, 'r', encoding='utf-8') as f:
+        return json.load(f)
+
+
+@pytest.mark.parametrize('chunk_size', CHUNK_SIZES)
+@pytest.mark.parametrize('fmt', sorted(FORMATS))
+@pytest.mark.parametrize('name', sorted(ARRAYS))
+def test_iter_array_matches_json_load(tmp_path, fallback, name, fmt, chunk_size):
+    path = tmp_path / 'array.json'
+    expected = write_json(path, ARRAYS[name], FORMATS[fmt])
+    assert list(iter_array(path, chunk_size=chunk_size)) == expected
+
+
+@pytest.mark.parametrize('chunk_size', CHUNK_SIZES)
+@pytest.mark.parametrize('fmt', sorted(FORMATS))
+def test_iter_array_under_key(tmp_path, fallback, fmt, chunk_size):
+    # Keys before the wanted one hold lookalike values that must be skipped whole
+    data = {
+        'type': 'FeatureCollection',
+        'skip': {'features': [1, 2], 'deep': [{'features': []}, '"features"']},
+        'features "quoted"': [0],
+        'features': NESTED + NUMBERS,
+        'after': [1],
+    }
+    path = tmp_path / 'collection.json'
+    expected = write_json(path, data, FORMATS[fmt])
+    assert list(iter_array(path, key='features', chunk_size=chunk_size)) == expected['features']
+
+
+@pytest.mark.parametrize('chunk_size', CHUNK_SIZES)
+@pytest.mark.parametrize('data', [{'type': 'FeatureCollection', 'other': []}, {}], ids=['other-keys', 'empty'])
+def test_iter_array_missing_key(tmp_path, fallback, data, chunk_size):
+    path = tmp_path / 'collection.json'
+    write_json(path, data, {})
+    with pytest.raises(KeyError):
+        list(iter_array(path, key='features', chunk_size=chunk_size))
+
+
+@pytest.mark.parametrize('chunk_size', CHUNK_SIZES)
+@pytest.mark.parametrize('fmt', sorted(FORMATS))
+@pytest.mark.parametrize('data', [OBJECT, {}, {'only': {}}], ids=['mixed', 'empty', 'single'])
+def test_iter_object_matches_json_load(tmp_path, fallback, data, fmt, chunk_size):
+    path = tmp_path / 'object.json'
+    expected = write_json(path, data, FORMATS[fmt])
+    members = list(iter_object(path, chunk_size=chunk_size))
+    assert members == list(expected.items())
+
+
+@pytest.mark.parametrize('chunk_size', CHUNK_SIZES)
+@pytest.mark.parametrize('data', [OBJECT, NESTED], ids=['object', 'array'])
+def test_iter_records_keys_either_shape(tmp_path, fallback, data, chunk_size):
+    path = tmp_path / 'records.json'
+    expected = write_json(path, data, {'indent': 1})
+    records = list(iter_records(path, chunk_size=chunk_size))
+    assert records == (list(expected.items()) if isinstance(expected, dict) else list(enumerate(expected)))
+
+
+@pytest.mark.parametrize('chunk_size', CHUNK_SIZES)
+@pytest.mark.parametrize('text', ['[1, 2', '[1 2]', '{"a" 1}', '[1.5e]', '["unterminated]'])
+def test_truncated_or_malformed_input_raises(tmp_path, fallback, text, chunk_size):
+    path = tmp_path / 'bad.json'
+    path.write_text(text, encoding='utf-8')
+    with pytest.raises(json.JSONDecodeError):
+        list(iter_array(path, chunk_size=chunk_size))
+
+
+@pytest.mark.parametrize('name', sorted(ARRAYS))
+def test_ijson_and_fallback_agree(tmp_path, monkeypatch, name):
+    pytest.importorskip('ijson')
+    path = tmp_path / 'array.json'
+    write_json(path, {'features': ARRAYS[name], 'object': OBJECT}, {'indent': 2})
+    with_ijson = list(iter_array(path, key='features'))
+    monkeypatch.setattr(json_stream, 'ijson', None)
+    assert list(iter_array(path, key='features', chunk_size=7)) == with_ijson
+
+    path.write_text(json.dumps(OBJECT), encoding='utf-8')
+    monkeypatch.undo()
+    with_ijson = list(iter_object(path))
+    monkeypatch.setattr(json_stream, 'ijson', None)
+    assert list(iter_object(path, chunk_size=7)) == with_ijson
@@ -0,0 +1,47 @@
+"""
+Point-to-zone lookup: chunking and metre-accurate nearest-zone limits.
+"""
+
+import numpy as np
+import pytest
+import shapely
+
+from vibe_check.geometry.lookup import ZoneLookup
+from vibe_check.geometry.metrics import laea_project
+
+
+@pytest.fixture
+def zones():
+    # Two small zones in Manhattan, about 840 m wide and 1.1 km tall
+    return ZoneLookup([shapely.box(-74.00, 40.75, -73.99, 40.76), shapely.box(-73.99, 40.75, -73.98, 40.76)], ['a', 'b'])
+
+
+def offset_m(lng, lat, east_m=0.0, north_m=0.0):
+    """Point ``east_m``/``north_m`` from ``lng, lat``, solved by iterating in the LAEA plane"""
+    x0, y0 = laea_project(lng, lat)
+    target = np.array([x0 + east_m, y0 + north_m])
+    point = np.array([lng, lat], dtype=float)
+    for _ in range(50):
+        x, y = laea_project(*point)
+        point -= (np.array([x, y]) - target) / [84_400.0, 111_000.0]
+    return point
+
+
+@pytest.mark.parametrize('chunk_size', [1, 3, 100_000])
+def test_results_do_not_depend_on_chunk_size(chunk_size):
+    polygons = [shapely.box(-74.00, 40.75, -73.99, 40.76), shapely.box(-73.99, 40.75, -73.98, 40.76)]
+    rng = np.random.default_rng(0)
+    lng, lat = rng.uniform(-74.005, -73.975, 50), rng.uniform(40.745, 40.765, 50)
+    expected = ZoneLookup(polygons, ['a', 'b']).query(lng, lat, nearest=True, max_distance_m=200)
+    chunked = ZoneLookup(polygons, ['a', 'b'], chunk_size=chunk_size)
+    assert np.array_equal(chunked.query(lng, lat, nearest=True, max_distance_m=200), expected)
+
+
+@pytest.mark.parametrize('east_m, north_m', [(90, 0), (0, 90)])
+def test_nearest_limit_is_metres_in_every_direction(zones, east_m, north_m):
+    # 90 m east is ~0.00107 degrees of longitude, which 111 km/degree would call 118 m
+    corner = (-73.98, 40.76) if east_m else (-73.985, 40.76)
+    lng, lat = offset_m(*corner, east_m=east_m, north_m=north_m)
+    assert zones.lookup(lng, lat)[0] is None
+    assert zones.lookup(lng, lat, nearest=True, max_distance_m=100)[0] == 'b'
+    assert zones.lookup(lng, lat, nearest=True, max_distance_m=80)[0] is None
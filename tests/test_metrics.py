@@ -0,0 +1,74 @@
+"""
+Equal-area metrics against closed-form areas and lengths on the WGS84 ellipsoid.
+"""
+
+import numpy as np
+import pytest
+import shapely
+
+from vibe_check.geometry.metrics import NYC_CENTER, WGS84_A, WGS84_E2, geometry_area_sqm, polygon_metrics
+
+
+def band_area_sqm(west, south, east, north):
+    """Exact ellipsoidal area of a lng/lat rectangle: a^2/2 * dlng * (q(north) - q(south))"""
+    e = np.sqrt(WGS84_E2)
+
+    def q(lat):
+        s = np.sin(np.radians(lat))
+        return (1 - WGS84_E2) * (s / (1 - WGS84_E2 * s * s) - np.log((1 - e * s) / (1 + e * s)) / (2 * e))
+
+    return WGS84_A ** 2 / 2 * np.radians(east - west) * (q(north) - q(south))
+
+
+def rectangle_perimeter_m(west, south, east, north):
+    """Two parallel arcs plus two meridian arcs (midpoint rule, fine for sub-kilometre spans)"""
+    def parallel(lat):
+        s = np.sin(np.radians(lat))
+        return WGS84_A / np.sqrt(1 - WGS84_E2 * s * s) * np.cos(np.radians(lat)) * np.radians(east - west)
+
+    s = np.sin(np.radians((south + north) / 2))
+    meridian = WGS84_A * (1 - WGS84_E2) / (1 - WGS84_E2 * s * s) ** 1.5 * np.radians(north - south)
+    return parallel(south) + parallel(north) + 2 * meridian
+
+
+def graticule_box(west, south, east, north, step=1e-4):
+    """A lng/lat rectangle whose edges follow the parallels and meridians closely"""
+    return shapely.segmentize(shapely.box(west, south, east, north), step)
+
+
+@pytest.mark.parametrize('west, south, east, north', [
+    (-73.96, 40.69, -73.95, 40.70),  # about 840 x 1110 m beside the projection centre
+    (-74.25, 40.50, -74.24, 40.51),  # Staten Island, ~35 km out
+    (-73.75, 40.85, -73.70, 40.90),  # a larger box in the Bronx/Westchester corner
+])
+def test_area_matches_the_ellipsoid(west, south, east, north):
+    metrics = polygon_metrics([graticule_box(west, south, east, north)])
+    # LAEA is equal-area, so only the straight chords between densified vertices differ
+    assert metrics['area_sqm'][0] == pytest.approx(band_area_sqm(west, south, east, north), rel=1e-9)
+    # Square degrees times 111 km squared overstates this by ~30%
+    assert (east - west) * (north - south) * 111_000 ** 2 > 1.25 * metrics['area_sqm'][0]
+
+
+def test_perimeter_and_compactness_of_a_small_square():
+    west, south = NYC_CENTER
+    # 0.001 degrees of latitude by the longitude span of equal length at this latitude
+    east = west + 0.001 * rectangle_perimeter_m(0, south, 0, south + 0.001) / rectangle_perimeter_m(0, south, 0.001, south)
+    box = (west, south, east, south + 0.001)
+    metrics = polygon_metrics([graticule_box(*box, step=1e-5)], camera_points=[[west, south]])
+    assert metrics['perimeter_m'][0] == pytest.approx(rectangle_perimeter_m(*box), rel=1e-5)
+    assert metrics['compactness'][0] == pytest.approx(np.pi / 4, rel=1e-4)
+    # The centroid sits half a diagonal from the corner camera
+    side = metrics['perimeter_m'][0] / 4
+    assert metrics['centroid_offset_m'][0] == pytest.approx(side / np.sqrt(2), rel=1e-4)
+
+
+def test_holes_and_winding_in_multipolygons():
+    outer = (-73.98, 40.70, -73.96, 40.72)
+    hole = (-73.975, 40.705, -73.965, 40.715)
+    islet = (-73.90, 40.60, -73.89, 40.61)
+    with_hole = shapely.Polygon(graticule_box(*outer).exterior.coords[::-1], [graticule_box(*hole).exterior.coords])
+    land = shapely.MultiPolygon([with_hole, graticule_box(*islet)])
+
+    expected = band_area_sqm(*outer) - band_area_sqm(*hole) + band_area_sqm(*islet)
+    assert geometry_area_sqm(land) == pytest.approx(expected, rel=1e-9)
+    assert polygon_metrics([with_hole])['area_sqm'][0] == pytest.approx(band_area_sqm(*outer) - band_area_sqm(*hole), rel=1e-9)
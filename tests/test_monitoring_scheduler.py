@@ -0,0 +1,93 @@
+"""
+Heap scheduler: due windows, ticking, score-driven rescheduling and saved state.
+"""
+
+import pytest
+
+from vibe_check.monitoring.scheduler import MAX_INTERVAL_HOURS, MIN_INTERVAL_HOURS, MonitoringScheduler
+
+HOUR = 3600.0
+NOW = 1_700_000_000.0
+
+
+@pytest.fixture
+def scheduler():
+    schedules = {
+        'MN_001': {'current_score': 1},
+        'MN_002': {'current_score': 24},
+        'BK_003': {'current_score': 12, 'sampling_frequency_hours': 6},
+        'QN_004': {},
+    }
+    return MonitoringScheduler.from_schedules(schedules, NOW, offsets={'MN_002': 0.5 * HOUR, 'BK_003': 2 * HOUR})
+
+
+def test_intervals_come_from_the_score(scheduler):
+    assert scheduler.cameras['MN_001'][1] == 1 * HOUR
+    assert scheduler.cameras['MN_002'][1] == 24 * HOUR
+    assert scheduler.cameras['BK_003'][1] == 6 * HOUR  # an explicit frequency wins
+    assert scheduler.cameras['QN_004'][1] == 24 * HOUR  # baseline score
+    assert scheduler.cameras['MN_001'][3] == 'hourly'
+
+
+def test_due_lists_a_window_without_popping(scheduler):
+    assert scheduler.due(NOW) == ['MN_001', 'QN_004']
+    assert scheduler.due(NOW + HOUR) == ['MN_001', 'QN_004', 'MN_002']
+    assert scheduler.due(NOW + 3 * HOUR, since=NOW) == ['MN_002', 'BK_003']
+    assert scheduler.due(NOW - 1) == []
+    assert len(scheduler.due(NOW + 3 * HOUR)) == 4
+
+
+def test_advance_runs_due_cameras_and_reschedules_them(scheduler):
+    ran = scheduler.advance(NOW + HOUR)
+    assert sorted(ran) == sorted([('MN_001', NOW), ('QN_004', NOW), ('MN_002', NOW + 0.5 * HOUR)])
+    assert scheduler.cameras['MN_001'][0] == NOW + HOUR + HOUR  # next slot after the tick, not the missed one
+    assert scheduler.cameras['MN_002'][0] == NOW + 24.5 * HOUR
+    assert scheduler.cameras['MN_001'][4] == NOW + HOUR
+    assert scheduler.advance(NOW + HOUR) == []
+    assert scheduler.next_due() == NOW + 2 * HOUR
+
+
+def test_update_score_keeps_phase_and_skips_unchanged_intervals(scheduler):
+    scheduler.advance(NOW)
+    assert scheduler.update_score('QN_004', 24, NOW + HOUR) is None
+    assert scheduler.update_score('QN_004', 4, NOW + 5 * HOUR) == 'every 4h'
+    # Last run at NOW, 4 h grid: the first slot at or after NOW + 5 h is NOW + 8 h
+    assert scheduler.cameras['QN_004'][0] == NOW + 8 * HOUR
+    assert 'QN_004' in scheduler.due(NOW + 8 * HOUR, since=NOW + 5 * HOUR)
+
+    # A camera that has not run anchors on its pending first run (NOW + 2 h);
+    # escalating it to 30 minutes brings that forward onto the new grid
+    assert scheduler.update_score('BK_003', 0.1, NOW + 0.2 * HOUR) == f"every {MIN_INTERVAL_HOURS:g}h"
+    assert scheduler.cameras['BK_003'][0] == NOW + 0.5 * HOUR
+    assert scheduler.update_score('MN_002', 500, NOW) == f"every {MAX_INTERVAL_HOURS:g}h"
+
+
+def test_stale_heap_entries_are_skipped(scheduler):
+    scheduler.advance(NOW)
+    scheduler.update_score('MN_001', 48, NOW + HOUR)
+    scheduler.remove('QN_004')
+    assert scheduler.due(NOW + 3 * HOUR) == ['MN_002', 'BK_003']
+    assert [handle for handle, _ in scheduler.advance(NOW + 3 * HOUR)] == ['MN_002', 'BK_003']
+    assert scheduler.cameras['MN_001'][0] == NOW + 48 * HOUR
+
+
+def test_copy_advances_independently(scheduler):
+    simulated = scheduler.copy()
+    simulated.advance(NOW + 48 * HOUR)
+    assert scheduler.due(NOW) == ['MN_001', 'QN_004']
+    assert simulated.due(NOW) == []
+
+
+def test_save_load_round_trip(tmp_path, scheduler):
+    scheduler.advance(NOW)
+    scheduler.update_score('MN_002', 3, NOW)
+    path = tmp_path / 'state.npz'
+    scheduler.save(path)
+    loaded = MonitoringScheduler.load(path)
+
+    assert list(loaded.cameras) == list(scheduler.cameras)
+    for handle, (next_due, interval_s, score, tier, last_run, _) in scheduler.cameras.items():
+        assert loaded.cameras[handle][:4] == [next_due, interval_s, pytest.approx(score), tier]
+        assert loaded.cameras[handle][4] == last_run
+    assert loaded.due(NOW + 3 * HOUR) == scheduler.due(NOW + 3 * HOUR)
+    assert loaded.stats()['tiers'] == scheduler.stats()['tiers']
@@ -0,0 +1,25 @@
+"""
+Process-pool clipping gives byte-identical output to the serial clip.
+"""
+
+import numpy as np
+import pytest
+import shapely
+
+from vibe_check.geometry import PreparedBoundary, bounded_voronoi_cells, clip_cells
+
+
+@pytest.mark.parametrize('prepared', [True, False], ids=['prepared', 'plain'])
+def test_pool_clip_matches_serial(land, camera_set, prepared):
+    points, _ = camera_set
+    cells = bounded_voronoi_cells(points, land.bounds)
+    boundary = PreparedBoundary(land, max_vertices=8) if prepared else land
+
+    serial = clip_cells(cells, boundary, workers=1)
+    pooled = clip_cells(cells, boundary, workers=2, chunk_size=7)
+
+    assert len(serial) == len(points)
+    assert np.array_equal(pooled.index, serial.index)
+    assert shapely.to_wkb(pooled.polygons).tolist() == shapely.to_wkb(serial.polygons).tolist()
+    assert np.array_equal(pooled.area, serial.area)
+    assert np.array_equal(pooled.constrained, serial.constrained)
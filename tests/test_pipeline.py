@@ -0,0 +1,137 @@
+"""
+Content-hashed stage cache: keys, hits and misses, and the geometry build on top of it.
+"""
+
+import json
+
+import numpy as np
+import pytest
+import shapely
+
+from vibe_check.geometry.pipeline import Pipeline, geometry_pipeline
+
+CALLS = []
+
+
+def read_stage(path, scale):
+    CALLS.append('read')
+    with open(path) as f:
+        return [scale * int(line) for line in f]
+
+
+def total_stage(read, offset, workers):
+    CALLS.append('total')
+    return sum(read) + offset
+
+
+@pytest.fixture
+def numbers(tmp_path):
+    path = tmp_path / 'numbers.txt'
+    path.write_text('1\n2\n3\n')
+    return path
+
+
+def toy_pipeline(cache_dir, path, scale=1, offset=0, workers=1):
+    CALLS.clear()
+    pipeline = Pipeline(cache_dir)
+    pipeline.add('read', read_stage, files=[path], params={'path': str(path), 'scale': scale})
+    pipeline.add('total', total_stage, depends=['read'], params={'offset': offset}, options={'workers': workers})
+    return pipeline
+
+
+def test_second_run_hits_the_cache_without_running_upstream(tmp_path, numbers):
+    first = toy_pipeline(tmp_path / 'cache', numbers)
+    assert first['total'] == 6
+    assert first.status == {'read': 'computed', 'total': 'computed'}
+    assert CALLS == ['read', 'total']
+
+    second = toy_pipeline(tmp_path / 'cache', numbers, workers=4)
+    assert second['total'] == 6
+    # A cached stage never asks for its dependencies
+    assert second.status == {'total': 'cached'}
+    assert CALLS == []
+    assert second.summary() == 'total: cached'
+    assert second.run() == {'read': [1, 2, 3], 'total': 6}
+    assert second.status['read'] == 'cached'
+
+
+def test_key_follows_params_file_contents_and_dependencies(tmp_path, numbers):
+    base = toy_pipeline(None, numbers)
+    keys = {name: base.key(name) for name in ('read', 'total')}
+
+    # Options are not part of the key
+    assert toy_pipeline(None, numbers, workers=8).key('total') == keys['total']
+
+    offset = toy_pipeline(None, numbers, offset=1)
+    assert offset.key('read') == keys['read'] and offset.key('total') != keys['total']
+
+    # A read param changes that stage and everything downstream
+    scaled = toy_pipeline(None, numbers, scale=2)
+    assert scaled.key('read') != keys['read'] and scaled.key('total') != keys['total']
+
+    # Rewriting identical contents keeps the key; new contents change it
+    numbers.write_text('1\n2\n3\n')
+    assert toy_pipeline(None, numbers).key('total') == keys['total']
+    numbers.write_text('1\n2\n4\n')
+    changed = toy_pipeline(None, numbers)
+    assert changed.key('read') != keys['read'] and changed.key('total') != keys['total']
+
+
+def test_changed_inputs_recompute_and_replace_stale_entries(tmp_path, numbers):
+    cache = tmp_path / 'cache'
+    toy_pipeline(cache, numbers)['total']
+
+    numbers.write_text('10\n20\n')
+    pipeline = toy_pipeline(cache, numbers)
+    assert pipeline['total'] == 30
+    assert pipeline.status == {'read': 'computed', 'total': 'computed'}
+    assert len(list(cache.glob('read-*.pkl'))) == 1
+    assert len(list(cache.glob('total-*.pkl'))) == 1
+
+    pipeline = toy_pipeline(cache, numbers, offset=5)
+    assert pipeline['total'] == 35
+    assert pipeline.status == {'read': 'cached', 'total': 'computed'}
+
+
+def test_corrupt_entry_is_a_miss(tmp_path, numbers):
+    cache = tmp_path / 'cache'
+    toy_pipeline(cache, numbers)['total']
+    (entry,) = cache.glob('total-*.pkl')
+    entry.write_bytes(b'\x80not a pickle')
+
+    pipeline = toy_pipeline(cache, numbers)
+    assert pipeline['total'] == 6
+    assert pipeline.status == {'total': 'computed', 'read': 'cached'}
+
+
+def test_geometry_pipeline_reuses_every_cached_stage(tmp_path, land, camera_set):
+    geojson = tmp_path / 'land.geojson'
+    geojson.write_text(json.dumps({'type': 'FeatureCollection', 'features': [
+        {'type': 'Feature', 'properties': {'BoroCode': 1, 'BoroName': 'Manhattan'},
+         'geometry': json.loads(shapely.to_geojson(land))},
+    ]}))
+    points, info = camera_set
+    cameras = tmp_path / 'zone-lookup.json'
+    cameras.write_text(json.dumps({
+        str(camera['integer_id']): {'handle': camera['handle'], 'camera_name': camera['name'], 'coordinates': point.tolist()}
+        for camera, point in zip(info, points)
+    }))
+    cache = tmp_path / 'cache'
+
+    first = geometry_pipeline(cameras, geojson, cache_dir=cache)
+    clipped, metrics = first['clipped'], first['metrics']
+    assert len(clipped) == len(points)
+    assert set(first.status.values()) == {'computed'}
+
+    second = geometry_pipeline(cameras, geojson, cache_dir=cache, workers=2)
+    second.run('clipped', 'metrics')
+    assert second.status == {'clipped': 'cached', 'metrics': 'cached'}
+    assert np.array_equal(second['clipped'].index, clipped.index)
+    assert shapely.equals(second['clipped'].polygons, clipped.polygons).all()
+    assert np.array_equal(second['metrics']['area_sqm'], metrics['area_sqm'])
+
+    # A different dedup radius reruns the camera stage onwards, not the camera filter
+    third = geometry_pipeline(cameras, geojson, cache_dir=cache, dedup_radius_m=5.0)
+    third['metrics']
+    assert third.status['land_cameras'] == 'cached'
+    assert third.status['cameras'] == 'computed'
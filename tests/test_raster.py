@@ -0,0 +1,74 @@
+"""
+Zone-index grid: agreement with exact lookups away from zone edges, and the ``.vcg`` file.
+"""
+
+import numpy as np
+import pytest
+import shapely
+
+from vibe_check.geometry import bounded_voronoi_cells, clip_cells
+from vibe_check.geometry.lookup import ZoneLookup
+from vibe_check.geometry.raster import NODATA, ZoneGrid, build_grid, grid_error_report
+
+
+@pytest.fixture
+def zones(land, camera_set):
+    points, info = camera_set
+    clipped = clip_cells(bounded_voronoi_cells(points, land.bounds), land)
+    return ZoneLookup(clipped.polygons, [info[i]['handle'] for i in clipped.index])
+
+
+@pytest.fixture
+def grid(tmp_path, zones):
+    return build_grid(tmp_path / 'zones.vcg', zones, cell_m=50.0)
+
+
+def test_grid_matches_exact_lookup_away_from_edges(grid, zones):
+    rng = np.random.default_rng(1)
+    west, south, east, north = grid.bounds
+    lng, lat = rng.uniform(west - 0.01, east + 0.01, 20_000), rng.uniform(south - 0.01, north + 0.01, 20_000)
+
+    # A point more than one cell diagonal from every zone edge shares its cell centre's zone
+    edges = shapely.union_all(shapely.boundary(zones.polygons))
+    clear = shapely.distance(edges, shapely.points(lng, lat)) > np.hypot(grid.cell_lng, grid.cell_lat)
+    assert clear.mean() > 0.7
+
+    exact = zones.query(lng[clear], lat[clear])
+    assert np.array_equal(grid.query(lng[clear], lat[clear]), exact)
+    assert (exact >= 0).any() and (exact < 0).any()
+    assert grid.lookup(lng[clear], lat[clear]).tolist() == [zones.zone_ids[i] if i >= 0 else None for i in exact]
+    for x, y, expected in zip(lng[clear][:200], lat[clear][:200], exact[:200]):
+        assert grid.index(x, y) == expected
+
+    report = grid_error_report(grid, zones, samples=20_000)
+    assert report['mismatches'] > 0  # some edge cells do disagree
+    assert report['error_rate_boundary_cells'] > report['error_rate']
+
+
+def test_build_in_row_blocks_matches_one_block(tmp_path, zones, monkeypatch):
+    whole = build_grid(tmp_path / 'whole.vcg', zones, cell_m=50.0)
+    monkeypatch.setattr('vibe_check.geometry.raster.BLOCK_CELLS', 1)
+    banded = build_grid(tmp_path / 'banded.vcg', zones, cell_m=50.0)
+    assert np.array_equal(banded.grid, whole.grid)
+
+
+def test_vcg_round_trip(tmp_path, grid, zones):
+    loaded = ZoneGrid(tmp_path / 'zones.vcg')
+    assert (loaded.west, loaded.south, loaded.cell_lng, loaded.cell_lat, loaded.columns, loaded.rows) == (
+        grid.west, grid.south, grid.cell_lng, grid.cell_lat, grid.columns, grid.rows,
+    )
+    assert np.array_equal(loaded.grid, grid.grid)
+    assert loaded.zone_ids.tolist() == zones.zone_ids.tolist()
+    assert len(loaded) == len(zones)
+
+    # The grid covers the zones, with NODATA off the land (the lake, the sea)
+    west, south, east, north = loaded.bounds
+    zw, zs, ze, zn = shapely.total_bounds(zones.polygons)
+    assert west == zw and south == zs and east >= ze and north >= zn
+    assert (np.asarray(loaded.grid) == NODATA).any()
+    assert loaded.zone_id(-73.98, 40.62) is None  # lake
+    assert loaded.index(west - 1, south) == -1 and loaded.index(west, north + 1) == -1
+
+    (tmp_path / 'bad.vcg').write_bytes(b'NOTAGRID' + bytes(100))
+    with pytest.raises(ValueError, match='not a .vcg zone grid'):
+        ZoneGrid(tmp_path / 'bad.vcg')
@@ -0,0 +1,84 @@
+"""
+Voronoi cells, boundary clipping and largest-piece selection.
+"""
+
+import numpy as np
+import pytest
+import shapely
+
+from vibe_check.geometry import PreparedBoundary, bounded_voronoi_cells, clip_cells, voronoi_cells
+from vibe_check.geometry.tessellation import cell_box, clip_to_boundary, largest_polygons
+
+
+def test_voronoi_cells_fill_infinite_regions_with_fallback():
+    grid = np.array([[x, y] for x in range(3) for y in range(3)], dtype=float)
+    cells = voronoi_cells(grid)
+    # Only the centre of a 3x3 grid has a finite region: the unit square around it
+    assert [cell is not None for cell in cells] == [i == 4 for i in range(9)]
+    assert cells[4].normalize().equals_exact(shapely.box(0.5, 0.5, 1.5, 1.5).normalize(), 1e-12)
+
+    box = shapely.box(-1, -1, 3, 3)
+    assert all(cell is box for i, cell in enumerate(voronoi_cells(grid, fallback=box)) if i != 4)
+
+
+
+def test_bounded_cells_are_finite_and_tile_the_box(land, camera_set):
+    points, _ = camera_set
+    cells = bounded_voronoi_cells(points, land.bounds)
+    box = shapely.box(*cell_box(points, land.bounds, 0.05))
+    assert len(cells) == len(points)
+    assert all(cell is not None and cell.is_valid and cell.geom_type == 'Polygon' for cell in cells)
+    assert np.isfinite(shapely.get_coordinates(cells)).all()
+    # Every camera sits in its own cell, and the cells fill the box without overlap
+    assert shapely.contains_xy(cells, points[:, 0], points[:, 1]).all()
+    assert shapely.area(cells).sum() == pytest.approx(box.area, rel=1e-12)
+    assert shapely.union_all(cells).symmetric_difference(box).area < 1e-12 * box.area
+
+
+def test_bounded_cells_reject_coincident_points(land, camera_set):
+    points, _ = camera_set
+    with pytest.raises(ValueError, match='2 points coincide'):
+        bounded_voronoi_cells(np.vstack([points, points[[3, 3]]]), land.bounds)
+    # Near-coincident points are distinct sites with their own sliver cells
+    near = np.vstack([points, points[3] + [1e-6, 0]])
+    assert len(bounded_voronoi_cells(near, land.bounds)) == len(points) + 1
+
+
+def test_largest_polygons_picks_the_largest_areal_part():
+    big, small = shapely.box(0, 0, 2, 2), shapely.box(5, 5, 6, 6)
+    geometries = np.array([
+        shapely.MultiPolygon([small, big]),
+        shapely.box(10, 10, 11, 12),
+        shapely.Polygon(),
+        shapely.LineString([(0, 0), (1, 1)]),
+        shapely.GeometryCollection([shapely.Point(0, 0), small]),
+        None,
+    ], dtype=object)
+    owner, polygons, area = largest_polygons(geometries)
+    assert owner.tolist() == [0, 1, 4]
+    assert polygons[0].equals(big) and polygons[2].equals(small)
+    assert area.tolist() == [4.0, 2.0, 1.0]
+
+
+@pytest.mark.parametrize('prepared', [True, False], ids=['prepared', 'plain'])
+def test_clipped_cells_partition_the_boundary(land, camera_set, prepared):
+    points, _ = camera_set
+    cells = bounded_voronoi_cells(points, land.bounds)
+    boundary = PreparedBoundary(land, max_vertices=8) if prepared else land
+
+    # The raw clip pieces tile the land exactly
+    raw = clip_to_boundary(cells, boundary)
+    assert shapely.area(raw).sum() == pytest.approx(land.area, rel=1e-12)
+    assert shapely.union_all(raw).symmetric_difference(land).area < 1e-12 * land.area
+
+    # The kept polygons are each cell's largest piece and do not overlap
+    clipped = clip_cells(cells, boundary)
+    assert len(clipped) == len(points)
+    for i, polygon, area in zip(clipped.index, clipped.polygons, clipped.area):
+        pieces = shapely.get_parts(raw[i])
+        assert area == pytest.approx(shapely.area(pieces).max(), rel=1e-12)
+        assert polygon.area == pytest.approx(area, rel=1e-12)
+    assert shapely.union_all(clipped.polygons).area == pytest.approx(clipped.area.sum(), rel=1e-9)
+    assert clipped.area.sum() <= land.area * (1 + 1e-12)
+    # Cells crossing the coast or the lake are marked constrained, inland ones not
+    assert clipped.constrained.any() and not clipped.constrained.all()
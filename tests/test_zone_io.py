@@ -0,0 +1,88 @@
+"""
+JSON and ``.vcz`` zone files: round trips and all-or-nothing writes.
+"""
+
+import json
+
+import numpy as np
+import pytest
+import shapely
+
+from vibe_check.geometry.zone_io import JsonZoneWriter, ZoneReader, ZoneWriter
+from vibe_check.geometry.zones import write_zones
+
+
+def zone(handle, polygon):
+    return {
+        'handle': handle,
+        'name': f"Camera {handle} \"quoted\" é",
+        'voronoi_polygon': json.loads(shapely.to_geojson(polygon)),
+        'vertices_count': len(polygon.exterior.coords) - 1,
+    }
+
+
+@pytest.fixture
+def polygons():
+    square = shapely.box(0, 0, 1, 1)
+    with_hole = shapely.Polygon([(1, 0), (3, 0), (3, 2), (1, 2)], [[(1.5, 0.5), (2.5, 0.5), (2.5, 1.5), (1.5, 1.5)]])
+    triangle = shapely.Polygon([(0, 1), (1, 1), (0.5, 1.5)])
+    return [square, with_hole, triangle]
+
+
+def test_write_zones_round_trip(tmp_path, polygons):
+    json_path, binary_path = tmp_path / 'zones.json', tmp_path / 'zones.vcz'
+    records = [zone(f"MN_{i:03d}", polygon) for i, polygon in enumerate(polygons)]
+    written = write_zones(zip(records, polygons), json_path, binary_path)
+
+    assert json_path.read_text() == json.dumps(records, indent=2)
+    assert written == [{key: value for key, value in record.items() if key != 'voronoi_polygon'} for record in records]
+
+    reader = ZoneReader(binary_path)
+    assert len(reader) == 3
+    assert reader.properties() == written
+    for i, polygon in enumerate(polygons):
+        assert reader.polygon(i).equals_exact(polygon, 0)
+    assert len(reader.rings(1)) == 2  # exterior and hole
+    assert shapely.equals(reader.polygons(), np.array(polygons, dtype=object)).all()
+    assert sorted(p.name for p in tmp_path.iterdir()) == ['zones.json', 'zones.vcz']
+
+
+def test_write_many_matches_write(tmp_path, polygons):
+    with ZoneWriter(tmp_path / 'one.vcz') as one:
+        for i, polygon in enumerate(polygons):
+            one.write(polygon, {'i': i})
+    with ZoneWriter(tmp_path / 'many.vcz') as many:
+        many.write_many(polygons[:2], [{'i': 0}, {'i': 1}])
+        many.write_many(polygons[2:], [{'i': 2}])
+    assert (tmp_path / 'one.vcz').read_bytes() == (tmp_path / 'many.vcz').read_bytes()
+
+
+def test_empty_files(tmp_path):
+    with JsonZoneWriter(tmp_path / 'zones.json'), ZoneWriter(tmp_path / 'zones.vcz'):
+        pass
+    assert json.loads((tmp_path / 'zones.json').read_text()) == []
+    assert len(ZoneReader(tmp_path / 'zones.vcz')) == 0
+
+
+def test_failure_keeps_the_previous_files(tmp_path, polygons):
+    json_path, binary_path = tmp_path / 'zones.json', tmp_path / 'zones.vcz'
+    records = [zone(f"MN_{i:03d}", polygon) for i, polygon in enumerate(polygons)]
+    write_zones(zip(records, polygons), json_path, binary_path)
+    before = json_path.read_bytes(), binary_path.read_bytes()
+
+    def failing():
+        yield records[0], polygons[0]
+        raise RuntimeError('clip failed')
+
+    with pytest.raises(RuntimeError):
+        write_zones(failing(), json_path, binary_path)
+    assert (json_path.read_bytes(), binary_path.read_bytes()) == before
+    assert sorted(p.name for p in tmp_path.iterdir()) == ['zones.json', 'zones.vcz']
+
+
+def test_first_write_that_fails_leaves_no_file(tmp_path, polygons):
+    with pytest.raises(RuntimeError):
+        with ZoneWriter(tmp_path / 'zones.vcz') as writer:
+            writer.write(polygons[0])
+            raise RuntimeError('interrupted')
+    assert list(tmp_path.iterdir()) == []
@@ -0,0 +1,97 @@
+"""
+Zone store: shared memory and memory-mapped backings, and per-zone bounds.
+"""
+
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing import shared_memory
+
+import numpy as np
+import pytest
+import shapely
+
+from vibe_check.geometry.zone_io import ZoneWriter
+from vibe_check.geometry.zone_store import ZoneStore
+
+
+@pytest.fixture
+def polygons():
+    square = shapely.box(0, 0, 1, 1)
+    # The hole is the last ring of its zone and the next zone starts right after it
+    with_hole = shapely.Polygon([(1, 0), (3, 0), (3, 2), (1, 2)], [[(1.5, 0.5), (2.5, 0.5), (2.5, 1.5), (1.5, 1.5)]])
+    triangle = shapely.Polygon([(-2, 5), (4, 5), (0.5, 9)])
+    return [square, with_hole, triangle]
+
+
+def zone_ids_in_worker(spec, points):
+    with ZoneStore.attach(spec) as store:
+        return [store.zone_id(lng, lat) for lng, lat in points]
+
+
+def assert_same_zones(store, polygons, zone_ids):
+    assert len(store) == len(polygons)
+    assert store.zone_ids.tolist() == zone_ids
+    assert shapely.equals(store.polygons(), np.array(polygons, dtype=object)).all()
+    for i, polygon in enumerate(polygons):
+        assert store.polygon(i).equals_exact(polygon, 0)
+    assert np.array_equal(store.bounds, shapely.bounds(polygons))
+
+
+def test_shared_store_round_trip_and_unlink(polygons):
+    store = ZoneStore.from_polygons(polygons, ['a', 'b', 'c'])
+    name = store.spec['name']
+    assert_same_zones(store, polygons, ['a', 'b', 'c'])
+    assert len(store.rings(1)) == 2
+    assert np.shares_memory(store.rings(1)[1], store.coordinates)
+
+    attached = ZoneStore.attach(store.spec)
+    assert_same_zones(attached, polygons, ['a', 'b', 'c'])
+    assert attached.zone_id(2, 0.25) == 'b'
+    assert attached.zone_id(2, 1) is None  # inside the hole
+    attached.close()
+    # Closing an attached view leaves the block in place for the owner
+    assert store.zone_id(0.5, 6) == 'c'
+
+    store.close()
+    store.close()
+    with pytest.raises(FileNotFoundError):
+        shared_memory.SharedMemory(name)
+
+
+def test_pool_workers_attach_by_spec(polygons):
+    points = [(0.5, 0.5), (2, 0.25), (2, 1), (0.5, 6), (10, 10)]
+    with ZoneStore.from_polygons(polygons, ['a', 'b', 'c']) as store:
+        with ProcessPoolExecutor(2) as pool:
+            results = list(pool.map(zone_ids_in_worker, [store.spec] * 2, [points[:3], points[3:]]))
+    assert results == [['a', 'b', None], ['c', None]]
+
+
+def test_memory_mapped_store(tmp_path, polygons):
+    path = tmp_path / 'zones.vcz'
+    with ZoneWriter(path) as writer:
+        writer.write_many(polygons, [{'handle': f"MN_{i:03d}"} for i in range(3)])
+
+    store = ZoneStore.open(path)
+    assert store.spec == {'path': str(path)}
+    assert_same_zones(store, polygons, ['MN_000', 'MN_001', 'MN_002'])
+    assert_same_zones(ZoneStore.attach(store.spec), polygons, ['MN_000', 'MN_001', 'MN_002'])
+
+    with store.to_shared() as shared:
+        assert 'name' in shared.spec
+        assert_same_zones(shared, polygons, ['MN_000', 'MN_001', 'MN_002'])
+    store.close()  # nothing to free for a file-backed store
+    assert store.zone_id(0.5, 0.5) == 'MN_000'
+
+
+def test_bounds_cover_every_ring_of_every_zone():
+    rng = np.random.default_rng(3)
+    polygons = [
+        shapely.Polygon(
+            shell=[(x, y), (x + w, y), (x + w, y + h), (x, y + h)],
+            holes=[[(x + w / 4, y + h / 4), (x + w / 2, y + h / 4), (x + w / 2, y + h / 2)]] * (i % 2),
+        )
+        for i, (x, y, w, h) in enumerate(rng.uniform(0.1, 10, size=(25, 4)))
+    ]
+    with ZoneStore.from_polygons(polygons, list(range(25))) as store:
+        assert np.array_equal(store.bounds, shapely.bounds(polygons))
+        centre = store.bounds[7, :2] + (store.bounds[7, 2:] - store.bounds[7, :2]) / 8
+        assert 7 in store.candidates(*centre)
@@ -0,0 +1,4 @@
+"""
+Python tooling for NYC Vibe Check: camera zone geometry, camera health and
+monitoring schedules. Scripts under scripts/ and the repo root import from here.
+"""
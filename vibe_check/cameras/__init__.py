@@ -0,0 +1,23 @@
+"""
+Camera feed checks: concurrent health probing of the camera image URLs,
+per-camera backoff for cameras that keep failing, a revalidating frame
+cache and a cheap frame-change filter ahead of vision analysis.
+"""
+
+from .backoff import CameraHealth, HealthTracker, load_intervals
+from .change import ChangeDetector
+from .frames import FrameCache
+from .health import CameraProbe, HostRateLimiter, check_cameras, health_report, load_camera_urls
+
+__all__ = [
+    'CameraHealth',
+    'CameraProbe',
+    'ChangeDetector',
+    'FrameCache',
+    'HealthTracker',
+    'HostRateLimiter',
+    'check_cameras',
+    'health_report',
+    'load_camera_urls',
+    'load_intervals',
+]
@@ -0,0 +1,182 @@
+"""
+Per-camera health state with exponential backoff for failing cameras.
+
+Healthy cameras are probed at their normal sampling interval. Each
+consecutive failure multiplies the wait (interval * multiplier**failures,
+capped at ``max_delay_s``) with proportional jitter so dead cameras don't
+all come due together; the first success puts a camera straight back on its
+normal cadence. The tracker counts the fetches it avoided and can estimate
+the saving over a horizon if the currently failing cameras stay down.
+"""
+
+import json
+import os
+import random
+import tempfile
+from dataclasses import asdict, dataclass
+
+from ..json_stream import iter_array
+
+DEFAULT_INTERVAL_S = 24 * 3600.0  # baseline daily tier
+DEFAULT_MAX_DELAY_S = 7 * 24 * 3600.0
+DEFAULT_MULTIPLIER = 2.0
+DEFAULT_JITTER = 0.1
+HEALTH_STATE = 'data/camera_health_state.json'
+
+
+@dataclass
+class CameraHealth:
+    """Probe history of one camera; times are Unix seconds"""
+    handle: str
+    interval_s: float = DEFAULT_INTERVAL_S
+    failures: int = 0
+    next_probe: float = 0.0
+    last_probe: float = None
+    last_ok: float = None
+    probes: int = 0
+    failed_probes: int = 0
+    saved_fetches: float = 0.0
+
+    @property
+    def state(self):
+        if self.failures == 0:
+            return 'online' if self.probes else 'unknown'
+        return 'failing'
+
+
+class HealthTracker:
+    """Schedule camera probes, backing off exponentially while a camera keeps failing"""
+
+    def __init__(self, max_delay_s=DEFAULT_MAX_DELAY_S, multiplier=DEFAULT_MULTIPLIER,
+                 jitter=DEFAULT_JITTER, seed=None):
+        self.max_delay_s = max_delay_s
+        self.multiplier = multiplier
+        self.jitter = jitter
+        self.cameras = {}
+        self._rng = random.Random(seed)
+
+    def __len__(self):
+        return len(self.cameras)
+
+    def __contains__(self, handle):
+        return handle in self.cameras
+
+    def __getitem__(self, handle):
+        return self.cameras[handle]
+
+    def register(self, handle, interval_s=DEFAULT_INTERVAL_S, online=True, now=0.0):
+        """Track ``handle``; a camera flagged offline starts one failure into backoff.
+
+        An online camera is due at ``now``; an offline one waits one backoff
+        delay, as if its first probe at ``now`` had already failed.
+        """
+        if handle in self.cameras:
+            self.cameras[handle].interval_s = interval_s
+            return self.cameras[handle]
+        camera = CameraHealth(handle, interval_s, failures=0 if online else 1, next_probe=now)
+        if not online:
+            camera.next_probe = now + self.backoff_delay(camera)
+        self.cameras[handle] = camera
+        return camera
+
+    def backoff_delay(self, camera, jitter=True):
+        """Seconds until the next probe of ``camera`` given its failure streak"""
+        delay = min(self.max_delay_s, camera.interval_s * self.multiplier ** camera.failures)
+        delay = max(delay, camera.interval_s)
+        if jitter and self.jitter and camera.failures:
+            delay *= 1 + self.jitter * (2 * self._rng.random() - 1)
+        return delay
+
+    def record(self, handle, ok, now):
+        """Record a probe result and schedule the next probe; returns its time"""
+        camera = self.cameras[handle]
+        camera.probes += 1
+        camera.last_probe = now
+        if ok:
+            # Recovered cameras go straight back to their normal cadence
+            camera.failures = 0
+            camera.last_ok = now
+        else:
+            camera.failures += 1
+            camera.failed_probes += 1
+        delay = self.backoff_delay(camera)
+        # A camera waiting longer than its interval skips the fetches it would have made
+        camera.saved_fetches += max(0.0, delay / camera.interval_s - 1)
+        camera.next_probe = now + delay
+        return camera.next_probe
+
+    def due(self, now):
+        """Handles whose next probe time has passed, most overdue first"""
+        due = [camera for camera in self.cameras.values() if camera.next_probe <= now]
+        return [camera.handle for camera in sorted(due, key=lambda camera: camera.next_probe)]
+
+    def expected_savings(self, horizon_s):
+        """Fetches avoided over ``horizon_s`` if every failing camera stays down.
+
+        Compares probes at the normal interval with the (jitter-free)
+        backoff schedule from each camera's current failure streak.
+        """
+        normal = backoff = 0.0
+        for camera in self.cameras.values():
+            if not camera.failures:
+                continue
+            normal += horizon_s / camera.interval_s
+            elapsed, failures = 0.0, camera.failures
+            while True:
+                elapsed += min(self.max_delay_s, max(camera.interval_s, camera.interval_s * self.multiplier ** failures))
+                if elapsed > horizon_s:
+                    break
+                backoff += 1
+                failures += 1
+        return {
+            'failing_cameras': sum(1 for camera in self.cameras.values() if camera.failures),
+            'horizon_hours': horizon_s / 3600,
+            'fetches_at_normal_cadence': round(normal, 1),
+            'fetches_with_backoff': backoff,
+            'fetches_saved': round(normal - backoff, 1),
+        }
+
+    def stats(self):
+        """State counts and the fetches saved so far"""
+        states = {}
+        for camera in self.cameras.values():
+            states[camera.state] = states.get(camera.state, 0) + 1
+        return {
+            'cameras': len(self.cameras),
+            'states': states,
+            'probes': sum(camera.probes for camera in self.cameras.values()),
+            'failed_probes': sum(camera.failed_probes for camera in self.cameras.values()),
+            'fetches_saved': round(sum(camera.saved_fetches for camera in self.cameras.values()), 1),
+        }
+
+    def save(self, path=HEALTH_STATE):
+        """Write tracker state atomically as JSON"""
+        state = {
+            'max_delay_s': self.max_delay_s,
+            'multiplier': self.multiplier,
+            'jitter': self.jitter,
+            'cameras': [asdict(camera) for camera in self.cameras.values()],
+        }
+        directory = os.path.dirname(os.path.abspath(path))
+        fd, tmp = tempfile.mkstemp(dir=directory, suffix='.tmp')
+        with os.fdopen(fd, 'w') as f:
+            json.dump(state, f)
+        os.replace(tmp, path)
+
+    @classmethod
+    def load(cls, path=HEALTH_STATE, seed=None):
+        with open(path, 'r') as f:
+            state = json.load(f)
+        tracker = cls(state['max_delay_s'], state['multiplier'], state['jitter'], seed=seed)
+        for camera in state['cameras']:
+            tracker.cameras[camera['handle']] = CameraHealth(**camera)
+        return tracker
+
+
+def load_intervals(schedule_path):
+    """Handle -> sampling interval in seconds from a monitoring schedule file"""
+    return {
+        schedule['zone_id']: float(schedule['sampling_frequency_hours']) * 3600
+        for schedule in iter_array(schedule_path)
+        if schedule.get('zone_id') and schedule.get('sampling_frequency_hours')
+    }
@@ -0,0 +1,138 @@
+"""
+Cheap frame-change detection ahead of vision analysis.
+
+Each frame is reduced to a tiny grayscale signature (16x16 by default):
+Pillow's JPEG draft mode decodes straight at 1/8 scale, and the rest is
+NumPy. A frame goes on to the vision step only when the mean absolute
+difference from the camera's last *passed* signature exceeds that camera's
+threshold, so slow drift still accumulates into a pass. Byte-identical
+payloads are skipped without decoding at all. A payload Pillow cannot
+decode (an HTML error page, a truncated JPEG) counts as changed, so it
+reaches the vision step instead of aborting the polling loop.
+"""
+
+import hashlib
+import io
+import json
+
+import numpy as np
+from PIL import Image, UnidentifiedImageError
+
+SIGNATURE_SIZE = 16
+DEFAULT_THRESHOLD = 0.03  # mean absolute difference, 0..1
+CHANGE_STATE = 'data/frame_change_state.npz'
+
+
+def frame_signature(payload, size=SIGNATURE_SIZE):
+    """``size`` x ``size`` uint8 grayscale signature of an encoded image"""
+    image = Image.open(io.BytesIO(payload))
+    # Let the JPEG decoder scale down by up to 8x before any pixels are produced
+    image.draft('L', (size * 4, size * 4))
+    image = image.convert('L')
+    if image.width < size or image.height < size:
+        image = image.resize((size, size), Image.BOX)
+    gray = np.asarray(image, dtype=np.float32)
+
+    # Box-average down to size x size, cropping any remainder
+    bh, bw = gray.shape[0] // size, gray.shape[1] // size
+    gray = gray[:bh * size, :bw * size]
+    return gray.reshape(size, bh, size, bw).mean(axis=(1, 3)).round().astype(np.uint8)
+
+
+def change_score(previous, current):
+    """Mean absolute difference of two signatures, 0 (identical) to 1"""
+    return float(np.abs(previous.astype(np.int16) - current.astype(np.int16)).mean() / 255)
+
+
+class ChangeDetector:
+    """Pass frames whose signature moved past a per-camera threshold"""
+
+    def __init__(self, default_threshold=DEFAULT_THRESHOLD, thresholds=None, size=SIGNATURE_SIZE):
+        self.default_threshold = default_threshold
+        self.thresholds = dict(thresholds or {})
+        self.size = size
+        self.signatures = {}
+        self.digests = {}
+        self.counts = {}
+
+    def threshold(self, camera):
+        return self.thresholds.get(camera, self.default_threshold)
+
+    def check(self, camera, payload):
+        """``(changed, score)`` for a new frame; the first frame of a camera always passes.
+
+        Frames that do not decode pass with a score of 1.0 and leave the
+        camera's reference signature as it was.
+        """
+        counts = self.counts.setdefault(camera, {'seen': 0, 'passed': 0, 'identical': 0})
+        counts['seen'] += 1
+
+        digest = hashlib.sha256(payload).digest()
+        if self.digests.get(camera) == digest:
+            counts['identical'] += 1
+            return False, 0.0
+
+        try:
+            signature = frame_signature(payload, self.size)
+        except (UnidentifiedImageError, OSError):
+            counts['undecodable'] = counts.get('undecodable', 0) + 1
+            counts['passed'] += 1
+            return True, 1.0
+        previous = self.signatures.get(camera)
+        score = 1.0 if previous is None else change_score(previous, signature)
+        changed = score > self.threshold(camera)
+        if changed:
+            # Compare later frames with the last one analysed, not just the last one seen
+            self.signatures[camera] = signature
+            self.digests[camera] = digest
+            counts['passed'] += 1
+        return changed, score
+
+    def stats(self):
+        """Overall and per-camera pass / skip counts"""
+        seen = sum(counts['seen'] for counts in self.counts.values())
+        passed = sum(counts['passed'] for counts in self.counts.values())
+        identical = sum(counts['identical'] for counts in self.counts.values())
+        undecodable = sum(counts.get('undecodable', 0) for counts in self.counts.values())
+        return {
+            'cameras': len(self.counts),
+            'frames_seen': seen,
+            'frames_passed': passed,
+            'frames_skipped': seen - passed,
+            'skipped_identical_bytes': identical,
+            'passed_undecodable': undecodable,
+            'skip_rate': (seen - passed) / seen * 100 if seen else 0.0,
+            'per_camera': {
+                camera: {**counts, 'threshold': self.threshold(camera)}
+                for camera, counts in self.counts.items()
+            },
+        }
+
+    def save(self, path=CHANGE_STATE):
+        """Store reference signatures and counters in one ``.npz``"""
+        cameras = list(self.signatures)
+        np.savez_compressed(
+            path,
+            cameras=np.array(cameras, dtype=str),
+            signatures=np.array([self.signatures[camera] for camera in cameras], dtype=np.uint8).reshape(-1, self.size, self.size),
+            digests=np.array([self.digests[camera].hex() for camera in cameras], dtype=str),
+            meta=np.array(json.dumps({'size': self.size, 'counts': self.counts})),
+        )
+
+    def load(self, path=CHANGE_STATE):
+        """Restore state saved by ``save``; thresholds stay as configured"""
+        with np.load(path) as data:
+            meta = json.loads(str(data['meta']))
+            if meta['size'] != self.size:
+                return self
+            for camera, signature, digest in zip(data['cameras'].tolist(), data['signatures'], data['digests'].tolist()):
+                self.signatures[camera] = signature
+                self.digests[camera] = bytes.fromhex(digest)
+            self.counts = meta['counts']
+        return self
+
+
+def load_thresholds(path):
+    """Camera -> threshold mapping from a JSON object file"""
+    with open(path, 'r') as f:
+        return {camera: float(threshold) for camera, threshold in json.load(f).items()}
@@ -0,0 +1,235 @@
+"""
+On-disk camera frame cache with conditional revalidation.
+
+Entries are keyed by camera UUID and remember the ETag / Last-Modified of
+the last frame, so a refetch sends If-None-Match / If-Modified-Since and an
+unchanged frame costs a 304 instead of a full JPEG. Payloads are stored
+once under their SHA-256, so the shared "camera unavailable" placeholder
+and frames that did not change between polls take no extra space. Eviction
+drops entries past a maximum age, then the least recently validated ones
+until the blobs fit a size budget.
+
+Layout::
+
+    <cache_dir>/index.json              uuid -> entry metadata
+    <cache_dir>/blobs/ab/abcdef....jpg   payloads by content hash
+"""
+
+import asyncio
+import hashlib
+import json
+import os
+import tempfile
+import time
+from dataclasses import asdict, dataclass
+from pathlib import Path
+from urllib.parse import urlparse
+
+import aiohttp
+
+from .health import DEFAULT_CONCURRENCY, DEFAULT_RATE, DEFAULT_TIMEOUT, HostRateLimiter
+
+FRAME_CACHE_DIR = '.cache/frames'
+DEFAULT_MAX_BYTES = 256 * 2 ** 20
+DEFAULT_MAX_AGE_S = 24 * 3600.0
+
+
+@dataclass
+class FrameEntry:
+    """Cached frame metadata for one camera"""
+    uuid: str
+    sha256: str
+    size: int
+    content_type: str = None
+    etag: str = None
+    last_modified: str = None
+    fetched_at: float = 0.0
+    validated_at: float = 0.0
+
+
+@dataclass
+class FrameStats:
+    """Counters for one cache session"""
+    requests: int = 0
+    not_modified: int = 0
+    downloaded: int = 0
+    deduplicated: int = 0
+    unchanged: int = 0
+    errors: int = 0
+    bytes_downloaded: int = 0
+    bytes_not_modified: int = 0
+    bytes_deduplicated: int = 0
+
+
+def camera_uuid(url):
+    """The camera UUID in an ``.../api/cameras/{uuid}/image`` URL"""
+    parts = urlparse(url).path.rstrip('/').split('/')
+    return parts[-2] if len(parts) >= 2 and parts[-1] == 'image' else parts[-1]
+
+
+class FrameCache:
+    """Content-addressed frame store with ETag / If-Modified-Since revalidation"""
+
+    def __init__(self, cache_dir=FRAME_CACHE_DIR, max_bytes=DEFAULT_MAX_BYTES, max_age_s=DEFAULT_MAX_AGE_S):
+        self.cache_dir = Path(cache_dir)
+        self.max_bytes = max_bytes
+        self.max_age_s = max_age_s
+        self.entries = {}
+        self.stats = FrameStats()
+        index = self.cache_dir / 'index.json'
+        if index.exists():
+            with open(index, 'r') as f:
+                self.entries = {entry['uuid']: FrameEntry(**entry) for entry in json.load(f)}
+
+    def __len__(self):
+        return len(self.entries)
+
+    def __contains__(self, uuid):
+        return uuid in self.entries
+
+    def blob_path(self, sha256):
+        return self.cache_dir / 'blobs' / sha256[:2] / f"{sha256}.jpg"
+
+    def read(self, uuid):
+        """Cached frame bytes for ``uuid``, or None"""
+        entry = self.entries.get(uuid)
+        if entry is None:
+            return None
+        try:
+            return self.blob_path(entry.sha256).read_bytes()
+        except FileNotFoundError:
+            del self.entries[uuid]
+            return None
+
+    def put(self, uuid, payload, content_type=None, etag=None, last_modified=None, now=None):
+        """Store ``payload`` for ``uuid``, writing the blob only if its hash is new"""
+        now = time.time() if now is None else now
+        sha256 = hashlib.sha256(payload).hexdigest()
+        previous = self.entries.get(uuid)
+        path = self.blob_path(sha256)
+        if previous is not None and previous.sha256 == sha256:
+            self.stats.unchanged += 1
+        elif path.exists():
+            self.stats.deduplicated += 1
+            self.stats.bytes_deduplicated += len(payload)
+        else:
+            path.parent.mkdir(parents=True, exist_ok=True)
+            fd, tmp = tempfile.mkstemp(dir=path.parent, suffix='.tmp')
+            with os.fdopen(fd, 'wb') as f:
+                f.write(payload)
+            os.replace(tmp, path)
+
+        self.entries[uuid] = FrameEntry(uuid, sha256, len(payload), content_type, etag, last_modified, now, now)
+        return self.entries[uuid]
+
+    def conditional_headers(self, uuid):
+        """Revalidation headers for the cached frame of ``uuid``"""
+        entry = self.entries.get(uuid)
+        headers = {}
+        if entry is not None:
+            if entry.etag:
+                headers['If-None-Match'] = entry.etag
+            if entry.last_modified:
+                headers['If-Modified-Since'] = entry.last_modified
+        return headers
+
+    async def fetch(self, session, url, limiter=None):
+        """Fetch or revalidate one camera frame; returns its bytes, or None on failure"""
+        uuid = camera_uuid(url)
+        if limiter is not None:
+            await limiter.wait(urlparse(url).netloc)
+        self.stats.requests += 1
+        try:
+            async with session.get(url, headers=self.conditional_headers(uuid)) as response:
+                if response.status == 304 and uuid in self.entries:
+                    self.stats.not_modified += 1
+                    self.stats.bytes_not_modified += self.entries[uuid].size
+                    self.entries[uuid].validated_at = time.time()
+                    return self.read(uuid)
+                content_type = response.headers.get('Content-Type', '')
+                if response.status != 200 or not content_type.startswith('image/'):
+                    self.stats.errors += 1
+                    return None
+                payload = await response.read()
+                self.stats.downloaded += 1
+                self.stats.bytes_downloaded += len(payload)
+                self.put(
+                    uuid, payload,
+                    content_type=content_type,
+                    etag=response.headers.get('ETag'),
+                    last_modified=response.headers.get('Last-Modified'),
+                )
+                return payload
+        except (asyncio.TimeoutError, aiohttp.ClientError):
+            self.stats.errors += 1
+            return None
+
+    async def fetch_all(self, urls, concurrency=DEFAULT_CONCURRENCY, rate=DEFAULT_RATE, timeout=DEFAULT_TIMEOUT):
+        """Fetch every URL over one pooled session; returns uuid -> bytes (None on failure)"""
+        semaphore = asyncio.Semaphore(concurrency)
+        limiter = HostRateLimiter(rate)
+        connector = aiohttp.TCPConnector(limit=concurrency, ttl_dns_cache=300)
+
+        async def fetch_one(session, url):
+            async with semaphore:
+                return camera_uuid(url), await self.fetch(session, url, limiter)
+
+        async with aiohttp.ClientSession(connector=connector, timeout=aiohttp.ClientTimeout(total=timeout)) as session:
+            return dict(await asyncio.gather(*(fetch_one(session, url) for url in urls)))
+
+    def blob_bytes(self):
+        """Bytes on disk for the distinct payloads still referenced"""
+        return sum({entry.sha256: entry.size for entry in self.entries.values()}.values())
+
+    def evict(self, now=None):
+        """Drop entries older than ``max_age_s``, then the stalest until under ``max_bytes``.
+
+        Returns the number of entries removed; unreferenced blobs are deleted.
+        """
+        now = time.time() if now is None else now
+        before = len(self.entries)
+        if self.max_age_s:
+            self.entries = {
+                uuid: entry for uuid, entry in self.entries.items()
+                if now - entry.validated_at <= self.max_age_s
+            }
+        if self.max_bytes:
+            references = {}
+            for entry in self.entries.values():
+                references[entry.sha256] = references.get(entry.sha256, 0) + 1
+            total = self.blob_bytes()
+            # A shared blob only frees space once its last entry goes
+            for entry in sorted(self.entries.values(), key=lambda entry: entry.validated_at):
+                if total <= self.max_bytes:
+                    break
+                del self.entries[entry.uuid]
+                references[entry.sha256] -= 1
+                if not references[entry.sha256]:
+                    total -= entry.size
+        self._remove_orphans()
+        return before - len(self.entries)
+
+    def _remove_orphans(self):
+        referenced = {entry.sha256 for entry in self.entries.values()}
+        for path in (self.cache_dir / 'blobs').glob('*/*.jpg'):
+            if path.stem not in referenced:
+                path.unlink(missing_ok=True)
+
+    def save(self):
+        """Write the index atomically"""
+        self.cache_dir.mkdir(parents=True, exist_ok=True)
+        fd, tmp = tempfile.mkstemp(dir=self.cache_dir, suffix='.tmp')
+        with os.fdopen(fd, 'w') as f:
+            json.dump([asdict(entry) for entry in self.entries.values()], f)
+        os.replace(tmp, self.cache_dir / 'index.json')
+
+    def summary(self):
+        """Session counters plus what the cache holds now"""
+        referenced = {entry.sha256 for entry in self.entries.values()}
+        return {
+            **asdict(self.stats),
+            'entries': len(self.entries),
+            'distinct_payloads': len(referenced),
+            'blob_bytes': self.blob_bytes(),
+            'logical_bytes': sum(entry.size for entry in self.entries.values()),
+        }
@@ -0,0 +1,153 @@
+"""
+Concurrent camera health checks.
+
+Probes every camera ``imageUrl`` over one pooled aiohttp session. A
+semaphore caps requests in flight, ``HostRateLimiter`` spaces request
+starts per host so the NYC TMC server is not hammered, and every probe has
+a hard timeout, so 907 cameras take about ``907 / rate`` seconds instead of
+hours of serial 10-second timeouts.
+"""
+
+import asyncio
+import time
+from dataclasses import asdict, dataclass
+from datetime import datetime, timezone
+from urllib.parse import urlparse
+
+import aiohttp
+import numpy as np
+
+from ..geometry.cameras import ZONE_LOOKUP
+from ..json_stream import iter_records
+
+DEFAULT_CONCURRENCY = 50
+DEFAULT_RATE = 20.0  # request starts per second per host
+DEFAULT_TIMEOUT = 10.0
+
+
+@dataclass
+class CameraProbe:
+    """Outcome of one camera image probe"""
+    handle: str
+    name: str
+    url: str
+    ok: bool
+    status: int = None
+    content_type: str = None
+    latency_ms: float = None
+    error: str = None
+    checked_at: str = None
+
+
+class HostRateLimiter:
+    """Space request starts to at most ``rate`` per second for each host"""
+
+    def __init__(self, rate=DEFAULT_RATE):
+        self.interval = 1.0 / rate if rate else 0.0
+        self._next_slot = {}
+
+    async def wait(self, host):
+        if not self.interval:
+            return
+        now = asyncio.get_running_loop().time()
+        # Claim the slot before sleeping so concurrent callers queue behind it
+        slot = max(now, self._next_slot.get(host, now))
+        self._next_slot[host] = slot + self.interval
+        if slot > now:
+            await asyncio.sleep(slot - now)
+
+
+def load_camera_urls(path=ZONE_LOOKUP):
+    """``[{handle, name, url, online}]`` for every camera with an ``imageUrl``"""
+    cameras = []
+    for key, camera in iter_records(path):
+        url = camera.get('imageUrl') or camera.get('camera', {}).get('imageUrl')
+        if not url:
+            continue
+        cameras.append({
+            'handle': camera.get('handle', camera.get('id', str(key))),
+            'name': camera.get('camera_name', camera.get('name', 'Unknown')),
+            'url': url,
+            # isOnline is stored as 'true'/'false' strings or booleans depending on the file
+            'online': str(camera.get('isOnline', True)).lower() != 'false',
+        })
+    return cameras
+
+
+async def probe_camera(session, camera, semaphore, limiter, method='HEAD'):
+    """Request one camera image; a 200 with an image content type counts as healthy"""
+    url = camera['url']
+    async with semaphore:
+        await limiter.wait(urlparse(url).netloc)
+        checked_at = datetime.now(timezone.utc).isoformat(timespec='seconds').replace('+00:00', 'Z')
+        start = time.perf_counter()
+        try:
+            async with session.request(method, url, allow_redirects=True) as response:
+                status, content_type = response.status, response.headers.get('Content-Type', '')
+            if status == 405 and method == 'HEAD':
+                # Some camera endpoints refuse HEAD; read just the headers of a GET instead
+                async with session.get(url, allow_redirects=True) as response:
+                    status, content_type = response.status, response.headers.get('Content-Type', '')
+            latency_ms = (time.perf_counter() - start) * 1000
+            ok = status == 200 and content_type.startswith('image/')
+            error = None if ok else (f"HTTP {status}" if status != 200 else f"not an image ({content_type or 'no content type'})")
+            return CameraProbe(camera['handle'], camera['name'], url, ok, status, content_type, round(latency_ms, 1), error, checked_at)
+        except asyncio.TimeoutError:
+            return CameraProbe(camera['handle'], camera['name'], url, False, error='timeout', checked_at=checked_at)
+        except aiohttp.ClientError as e:
+            return CameraProbe(camera['handle'], camera['name'], url, False, error=f"{type(e).__name__}: {e}", checked_at=checked_at)
+
+
+async def check_cameras_async(cameras, concurrency=DEFAULT_CONCURRENCY, rate=DEFAULT_RATE,
+                              timeout=DEFAULT_TIMEOUT, method='HEAD', progress=None):
+    """Probe ``cameras`` concurrently; results come back in input order"""
+    semaphore = asyncio.Semaphore(concurrency)
+    limiter = HostRateLimiter(rate)
+    connector = aiohttp.TCPConnector(limit=concurrency, ttl_dns_cache=300)
+    client_timeout = aiohttp.ClientTimeout(total=timeout)
+
+    async with aiohttp.ClientSession(connector=connector, timeout=client_timeout) as session:
+        tasks = [asyncio.create_task(probe_camera(session, camera, semaphore, limiter, method)) for camera in cameras]
+        if progress:
+            for done, task in enumerate(asyncio.as_completed(tasks), 1):
+                await task
+                progress(done, len(tasks))
+        return [await task for task in tasks]
+
+
+def check_cameras(cameras, **kwargs):
+    """Blocking wrapper around ``check_cameras_async``"""
+    return asyncio.run(check_cameras_async(cameras, **kwargs))
+
+
+def health_report(probes, elapsed_s=None):
+    """Status counts, latency percentiles and the failing cameras"""
+    latencies = np.array([probe.latency_ms for probe in probes if probe.latency_ms is not None])
+    statuses = {}
+    errors = {}
+    for probe in probes:
+        key = str(probe.status) if probe.status is not None else 'no_response'
+        statuses[key] = statuses.get(key, 0) + 1
+        if probe.error:
+            kind = probe.error.split(':')[0]
+            errors[kind] = errors.get(kind, 0) + 1
+
+    healthy = sum(probe.ok for probe in probes)
+    return {
+        'generated_at': datetime.now(timezone.utc).isoformat(timespec='seconds').replace('+00:00', 'Z'),
+        'total_cameras': len(probes),
+        'healthy': healthy,
+        'unhealthy': len(probes) - healthy,
+        'health_rate': healthy / len(probes) * 100 if probes else 0.0,
+        'elapsed_s': elapsed_s,
+        'status_counts': statuses,
+        'error_counts': errors,
+        'latency_ms': {
+            'p50': float(np.percentile(latencies, 50)),
+            'p90': float(np.percentile(latencies, 90)),
+            'p99': float(np.percentile(latencies, 99)),
+            'max': float(latencies.max()),
+        } if len(latencies) else {},
+        'failing': [asdict(probe) for probe in probes if not probe.ok],
+        'cameras': [asdict(probe) for probe in probes],
+    }
@@ -0,0 +1,147 @@
+"""
+Local stand-in for the NYC TMC camera server.
+
+Serves ``/api/cameras/{uuid}/image`` on 127.0.0.1 with a fixed behaviour
+per camera (picked from a hash of the UUID): most return a small JPEG that
+changes every ``frame_period_s`` and honours ETag / If-Modified-Since, some
+return the shared "camera unavailable" placeholder, and the rest answer
+404, 500, a non-image body, refuse HEAD or stall past any sensible timeout.
+Used by the ``--stub`` mode of the camera scripts and by the tests to
+exercise them without touching the real feeds; the server's ``StubState``
+counts requests (``hits``) and the most it had in flight at once
+(``max_in_flight``).
+"""
+
+import asyncio
+import hashlib
+import struct
+import time
+from contextlib import asynccontextmanager
+from dataclasses import dataclass, field
+from email.utils import formatdate, parsedate_to_datetime
+from urllib.parse import urlparse
+
+from aiohttp import web
+
+# Smallest valid JPEG: SOI, minimal segments, EOI
+STUB_JPEG = bytes.fromhex(
+    'ffd8ffe000104a46494600010100000100010000ffdb004300080606070605080707070909080a0c140d0c0b0b0c1912130f141d1a1f1e1d1a1c1c20242e2720222c231c1c2837292c30313434341f27393d38323c2e333432'
+    'ffc0000b080001000101011100ffc4001f0000010501010101010100000000000000000102030405060708090a0bffda0008010100003f00d2cf20ffd9'
+)
+
+# The same bytes for every camera that is down, like the real feed's placeholder
+PLACEHOLDER_JPEG = STUB_JPEG[:2] + b'\xff\xfe\x00\x14camera unavailable' + STUB_JPEG[2:]
+
+# Behaviour buckets out of 100
+BEHAVIOURS = (
+    (75, 'ok'),
+    (80, 'placeholder'),
+    (85, 'not_found'),
+    (89, 'server_error'),
+    (93, 'not_image'),
+    (97, 'no_head'),
+    (100, 'stall'),
+)
+
+
+@dataclass
+class StubState:
+    """Settings and request counters of one stub server"""
+    latency_s: float = 0.02
+    stall_s: float = 30.0
+    frame_period_s: float = 60.0
+    started_at: float = field(default_factory=time.time)
+    hits: int = 0
+    in_flight: int = 0
+    max_in_flight: int = 0
+
+
+STATE = web.AppKey('state', StubState)
+
+
+def stub_frame(camera_id, frame_number):
+    """A distinct JPEG per camera and frame: the stub image with a comment segment"""
+    comment = f"{camera_id} frame {frame_number}".encode('utf-8')
+    return STUB_JPEG[:2] + b'\xff\xfe' + struct.pack('>H', len(comment) + 2) + comment + STUB_JPEG[2:]
+
+
+def _conditional_response(request, body, etag, modified_at):
+    """200 with validators, or 304 when the client's copy is current"""
+    last_modified = formatdate(modified_at, usegmt=True)
+    headers = {'ETag': etag, 'Last-Modified': last_modified}
+    if_none_match = request.headers.get('If-None-Match')
+    if_modified_since = request.headers.get('If-Modified-Since')
+    if if_none_match is not None:
+        if if_none_match == etag:
+            return web.Response(status=304, headers=headers)
+    elif if_modified_since is not None:
+        try:
+            if parsedate_to_datetime(if_modified_since).timestamp() >= int(modified_at):
+                return web.Response(status=304, headers=headers)
+        except (TypeError, ValueError):
+            pass
+    return web.Response(body=body, content_type='image/jpeg', headers=headers)
+
+
+def stub_behaviour(camera_id):
+    """The fixed behaviour the stub server uses for ``camera_id``"""
+    bucket = int(hashlib.sha256(camera_id.encode('utf-8')).hexdigest(), 16) % 100
+    return next(behaviour for limit, behaviour in BEHAVIOURS if bucket < limit)
+
+
+async def _image(request):
+    state = request.app[STATE]
+    state.hits += 1
+    state.in_flight += 1
+    state.max_in_flight = max(state.max_in_flight, state.in_flight)
+    try:
+        return await _respond(request, state, stub_behaviour(request.match_info['camera_id']))
+    finally:
+        state.in_flight -= 1
+
+
+async def _respond(request, state, behaviour):
+    if behaviour == 'not_found':
+        raise web.HTTPNotFound()
+    if behaviour == 'server_error':
+        raise web.HTTPInternalServerError()
+    if behaviour == 'not_image':
+        return web.Response(text='<html>camera offline</html>', content_type='text/html')
+    if behaviour == 'no_head' and request.method == 'HEAD':
+        raise web.HTTPMethodNotAllowed('HEAD', ['GET'])
+    if behaviour == 'stall':
+        await asyncio.sleep(state.stall_s)
+    await asyncio.sleep(state.latency_s)
+
+    if behaviour == 'placeholder':
+        return _conditional_response(request, PLACEHOLDER_JPEG, '"placeholder"', state.started_at)
+    period = state.frame_period_s
+    frame_number = int(time.time() // period)
+    etag = '"' + hashlib.sha256(f"{request.match_info['camera_id']}:{frame_number}".encode('utf-8')).hexdigest()[:16] + '"'
+    return _conditional_response(request, stub_frame(request.match_info['camera_id'], frame_number), etag, frame_number * period)
+
+
+@asynccontextmanager
+async def stub_camera_server(latency_s=0.02, stall_s=30.0, frame_period_s=60.0):
+    """Run the stub server on a free local port; yields its base URL and its ``StubState``"""
+    app = web.Application()
+    app[STATE] = state = StubState(latency_s, stall_s, frame_period_s)
+    app.router.add_get('/api/cameras/{camera_id}/image', _image)  # also answers HEAD
+
+    runner = web.AppRunner(app)
+    await runner.setup()
+    site = web.TCPSite(runner, '127.0.0.1', 0)
+    await site.start()
+    host, port = runner.addresses[0][:2]
+    try:
+        yield f"http://{host}:{port}", state
+    finally:
+        await runner.cleanup()
+
+
+def point_at(cameras, base_url):
+    """Copy ``cameras`` with each URL's scheme and host replaced by ``base_url``"""
+    return [
+        {**camera, 'url': base_url + urlparse(camera['url']).path}
+        for camera in cameras
+    ]
@@ -0,0 +1,49 @@
+"""
+Camera zone geometry: Voronoi tessellation of the camera network clipped to
+the NYC land boundary.
+"""
+
+from .boundary import (
+    PreparedBoundary,
+    compile_boundary,
+    load_boroughs,
+    load_boundary,
+    split_boundary,
+)
+from .cameras import filter_cameras, load_cameras
+from .dedup import find_clusters, resolve_duplicates
+from .lookup import ZoneLookup
+from .raster import ZoneGrid, build_grid
+from .tessellation import (
+    ClippedCells,
+    bounded_voronoi_cells,
+    clip_cells,
+    exterior_coordinates,
+    voronoi_cells,
+)
+from .zone_io import JsonZoneWriter, ZoneReader, ZoneWriter
+from .zone_store import ZoneStore
+
+__all__ = [
+    'ClippedCells',
+    'JsonZoneWriter',
+    'PreparedBoundary',
+    'ZoneGrid',
+    'ZoneLookup',
+    'ZoneReader',
+    'ZoneStore',
+    'ZoneWriter',
+    'bounded_voronoi_cells',
+    'build_grid',
+    'clip_cells',
+    'compile_boundary',
+    'exterior_coordinates',
+    'filter_cameras',
+    'find_clusters',
+    'load_boroughs',
+    'load_boundary',
+    'load_cameras',
+    'resolve_duplicates',
+    'split_boundary',
+    'voronoi_cells',
+]
@@ -0,0 +1,285 @@
+"""
+Spatially indexed NYC land boundary for fast cell clipping.
+
+The land-only boroughs file unions into one MultiPolygon with a very long
+coastline. Intersecting every cell with that whole shape makes each clip pay
+for the city's full vertex count, so the boundary is split into small pieces
+(a quadtree over the coastline) held in an STRtree. A cell is then clipped
+only against the pieces its bounding box touches.
+
+Parsing, unioning and validating the 4 MB GeoJSON is itself slow, so the
+boundary is compiled once into a binary WKB artifact with several
+pre-simplified levels that loaders read back in milliseconds.
+"""
+
+import hashlib
+import json
+import struct
+from pathlib import Path
+
+import numpy as np
+import shapely
+from shapely.geometry import shape
+
+from ..json_stream import iter_array
+from .tessellation import POLYGON_TYPE_ID
+
+DEFAULT_MAX_VERTICES = 256
+
+LAND_GEOJSON = 'data/nyc_boroughs_land_only.geojson'
+
+# Simplification levels in degrees: exact, ~10 m, ~50 m and ~200 m
+DEFAULT_TOLERANCES = (0.0, 0.0001, 0.0005, 0.002)
+
+ARTIFACT_MAGIC = b'VCBOUND1'
+ARTIFACT_VERSION = 1
+
+
+def split_boundary(geometry, max_vertices=DEFAULT_MAX_VERTICES):
+    """Recursively quarter the boundary until every piece has at most max_vertices"""
+    done = []
+    pending = _polygon_parts(np.array([geometry], dtype=object))
+
+    while len(pending):
+        small = shapely.get_num_coordinates(pending) <= max_vertices
+        done.append(pending[small])
+        pending = pending[~small]
+        if not len(pending):
+            break
+
+        xmin, ymin, xmax, ymax = shapely.bounds(pending).T
+        xmid, ymid = (xmin + xmax) / 2, (ymin + ymax) / 2
+        quadrants = np.concatenate([
+            shapely.box(xmin, ymin, xmid, ymid),
+            shapely.box(xmid, ymin, xmax, ymid),
+            shapely.box(xmin, ymid, xmid, ymax),
+            shapely.box(xmid, ymid, xmax, ymax),
+        ])
+        pending = _polygon_parts(shapely.intersection(np.tile(pending, 4), quadrants))
+
+    return np.concatenate(done)
+
+
+def _polygon_parts(geometries):
+    """Flatten geometries into their non-empty polygon parts"""
+    parts = shapely.get_parts(geometries)
+    keep = (shapely.get_type_id(parts) == POLYGON_TYPE_ID) & ~shapely.is_empty(parts)
+    return parts[keep]
+
+
+class PreparedBoundary:
+    """Land boundary held as small prepared pieces in an STRtree"""
+
+    def __init__(self, geometry, max_vertices=DEFAULT_MAX_VERTICES):
+        self.geometry = geometry
+        self.max_vertices = max_vertices
+        self.pieces = split_boundary(geometry, max_vertices)
+        shapely.prepare(self.pieces)
+        self.tree = shapely.STRtree(self.pieces)
+
+    @property
+    def bounds(self):
+        return self.geometry.bounds
+
+    @property
+    def area(self):
+        return self.geometry.area
+
+    def __len__(self):
+        return len(self.pieces)
+
+    def clip(self, cells):
+        """Intersect each cell with the boundary, touching only nearby pieces.
+
+        Returns a geometry array aligned with ``cells``; cells that miss the
+        land entirely come back as None.
+        """
+        cells = np.asarray(cells, dtype=object)
+        clipped = np.empty(len(cells), dtype=object)
+
+        cell_idx, piece_idx = self.tree.query(cells)
+
+        # A cell that sits wholly inside one piece needs no intersection at all
+        whole = shapely.contains(self.pieces[piece_idx], cells[cell_idx])
+        clipped[cell_idx[whole]] = cells[cell_idx[whole]]
+        rest = ~np.isin(cell_idx, cell_idx[whole])
+        cell_idx, piece_idx = cell_idx[rest], piece_idx[rest]
+
+        parts = shapely.intersection(cells[cell_idx], self.pieces[piece_idx])
+        nonempty = ~shapely.is_empty(parts)
+        cell_idx, parts = cell_idx[nonempty], parts[nonempty]
+        if not len(parts):
+            return clipped
+
+        # Pad the pieces of each cell into one row and dissolve rows in one call
+        order = np.argsort(cell_idx, kind='stable')
+        cell_idx, parts = cell_idx[order], parts[order]
+        owners, start, counts = np.unique(cell_idx, return_index=True, return_counts=True)
+        rows = np.repeat(np.arange(len(owners)), counts)
+        cols = np.arange(len(parts)) - np.repeat(start, counts)
+        grid = np.empty((len(owners), counts.max()), dtype=object)
+        grid[rows, cols] = parts
+
+        clipped[owners] = shapely.union_all(grid, axis=1)
+        return clipped
+
+
+# =====================================================
+# PRECOMPILED BOUNDARY ARTIFACT
+# =====================================================
+#
+# Layout: 8-byte magic, uint32 header length, JSON header, then WKB blobs.
+# The header records the source file hash and, for every tolerance level,
+# the (offset, length) of the land union and of each borough inside the blob
+# section, so a loader reads only the level it asks for.
+
+def artifact_path_for(geojson_path):
+    """Default artifact location next to its source GeoJSON"""
+    return Path(geojson_path).with_suffix('.wkb')
+
+
+def iter_borough_geometries(geojson_path=LAND_GEOJSON):
+    """Yield ``(code, name, geometry)`` per feature as it is parsed, keeping every hole ring"""
+    for feature in iter_array(geojson_path, 'features'):
+        geometry = shape(feature['geometry'])
+        if not geometry.is_valid:
+            geometry = shapely.make_valid(geometry)
+        properties = feature.get('properties') or {}
+        yield properties.get('BoroCode', 0), properties.get('BoroName', 'Unknown'), geometry
+
+
+def read_borough_geometries(geojson_path=LAND_GEOJSON):
+    """Read each borough feature as a valid geometry, keeping every hole ring"""
+    return list(iter_borough_geometries(geojson_path))
+
+
+def compile_boundary(geojson_path=LAND_GEOJSON, artifact_path=None, tolerances=DEFAULT_TOLERANCES):
+    """Union, validate and simplify the boundary once and store it as WKB levels"""
+    artifact_path = Path(artifact_path or artifact_path_for(geojson_path))
+    boroughs = read_borough_geometries(geojson_path)
+
+    land = shapely.union_all([geometry for _, _, geometry in boroughs])
+    if not land.is_valid:
+        land = shapely.make_valid(land)
+
+    blobs = []
+    offset = 0
+
+    def add_blob(geometry):
+        nonlocal offset
+        blob = shapely.to_wkb(geometry)
+        blobs.append(blob)
+        offset += len(blob)
+        return [offset - len(blob), len(blob)]
+
+    levels = []
+    for tolerance in sorted(set(tolerances)):
+        level_land = _simplified(land, tolerance)
+        levels.append({
+            'tolerance': tolerance,
+            'vertices': int(shapely.get_num_coordinates(level_land)),
+            'land': add_blob(level_land),
+            'boroughs': [
+                [code, name] + add_blob(_simplified(geometry, tolerance))
+                for code, name, geometry in boroughs
+            ],
+        })
+
+    header = json.dumps({
+        'version': ARTIFACT_VERSION,
+        'source': str(geojson_path),
+        'source_sha256': _file_sha256(geojson_path),
+        'levels': levels,
+    }).encode('utf-8')
+
+    artifact_path.parent.mkdir(parents=True, exist_ok=True)
+    with open(artifact_path, 'wb') as f:
+        f.write(ARTIFACT_MAGIC)
+        f.write(struct.pack('<I', len(header)))
+        f.write(header)
+        for blob in blobs:
+            f.write(blob)
+
+    return artifact_path
+
+
+def load_boundary(tolerance=0.0, geojson_path=LAND_GEOJSON, artifact_path=None):
+    """Load the land boundary at the coarsest level within ``tolerance`` degrees.
+
+    The artifact is compiled on first use and recompiled whenever the source
+    GeoJSON changes.
+    """
+    header, blob_start, artifact_path = _open_artifact(geojson_path, artifact_path)
+    level = _pick_level(header, tolerance)
+    return _read_blob(artifact_path, blob_start, level['land'])
+
+
+def load_boroughs(tolerance=0.0, geojson_path=LAND_GEOJSON, artifact_path=None):
+    """Load ``(code, name, geometry)`` per borough at the requested level"""
+    header, blob_start, artifact_path = _open_artifact(geojson_path, artifact_path)
+    level = _pick_level(header, tolerance)
+    return [
+        (code, name, _read_blob(artifact_path, blob_start, [offset, length]))
+        for code, name, offset, length in level['boroughs']
+    ]
+
+
+def read_artifact_header(artifact_path):
+    """Return the JSON header of a compiled artifact and where its blobs start"""
+    with open(artifact_path, 'rb') as f:
+        if f.read(len(ARTIFACT_MAGIC)) != ARTIFACT_MAGIC:
+            raise ValueError(f"{artifact_path} is not a compiled boundary artifact")
+        (header_length,) = struct.unpack('<I', f.read(4))
+        header = json.loads(f.read(header_length).decode('utf-8'))
+    return header, len(ARTIFACT_MAGIC) + 4 + header_length
+
+
+def _open_artifact(geojson_path, artifact_path):
+    artifact_path = Path(artifact_path or artifact_path_for(geojson_path))
+    header = None
+    if artifact_path.exists():
+        header, blob_start = read_artifact_header(artifact_path)
+        stale = (
+            header.get('version') != ARTIFACT_VERSION
+            or (Path(geojson_path).exists() and header.get('source_sha256') != _file_sha256(geojson_path))
+        )
+        if stale:
+            header = None
+
+    if header is None:
+        compile_boundary(geojson_path, artifact_path)
+        header, blob_start = read_artifact_header(artifact_path)
+
+    return header, blob_start, artifact_path
+
+
+def _pick_level(header, tolerance):
+    """Coarsest stored level that is still within the requested tolerance"""
+    levels = [level for level in header['levels'] if level['tolerance'] <= tolerance]
+    if not levels:
+        levels = header['levels'][:1]
+    return max(levels, key=lambda level: level['tolerance'])
+
+
+def _read_blob(artifact_path, blob_start, span):
+    offset, length = span
+    with open(artifact_path, 'rb') as f:
+        f.seek(blob_start + offset)
+        return shapely.from_wkb(f.read(length))
+
+
+def _simplified(geometry, tolerance):
+    if tolerance <= 0:
+        return geometry
+    simplified = shapely.simplify(geometry, tolerance, preserve_topology=True)
+    if not simplified.is_valid:
+        simplified = shapely.make_valid(simplified)
+    return simplified
+
+
+def _file_sha256(path):
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for chunk in iter(lambda: f.read(1 << 20), b''):
+            digest.update(chunk)
+    return digest.hexdigest()
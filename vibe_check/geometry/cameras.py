@@ -0,0 +1,85 @@
+"""
+Camera loading for the geometry scripts.
+
+Understands the three camera files in the repo: ``data/zone-lookup.json``
+(dict keyed by camera number, ``coordinates`` as [lng, lat]),
+``data/cameras-with-handles.json`` (list, ``coordinates`` as [lat, lng]) and
+``data/nyc-cameras-full.json`` (list with ``latitude``/``longitude``).
+"""
+
+import numpy as np
+import shapely
+
+from ..json_stream import iter_records
+
+ZONE_LOOKUP = 'data/zone-lookup.json'
+
+# BoroCode values in nyc_boroughs_land_only.geojson and the handle prefixes
+# used by zone-lookup.json
+BOROUGH_ABBREVIATIONS = {1: 'MN', 2: 'BX', 3: 'BK', 4: 'QN', 5: 'SI'}
+
+
+def iter_cameras(path=ZONE_LOOKUP):
+    """Yield ``(lng, lat, info)`` per camera as the file is parsed, skipping ones without coordinates"""
+    for key, camera in iter_records(path):
+        if isinstance(key, str):
+            # zone-lookup.json: keyed by camera number, coordinates as [lng, lat]
+            coords = camera.get('coordinates')
+            if not coords or len(coords) != 2:
+                continue
+            yield float(coords[0]), float(coords[1]), {
+                'handle': camera.get('handle', key),
+                'name': camera.get('camera_name', 'unknown'),
+                'integer_id': int(key) if key.isdigit() else 0,
+                'borough': camera.get('borough', 'Unknown'),
+            }
+            continue
+
+        if camera.get('coordinates') and len(camera['coordinates']) == 2:
+            lat, lng = camera['coordinates']
+        elif camera.get('latitude') is not None and camera.get('longitude') is not None:
+            lat, lng = camera['latitude'], camera['longitude']
+        else:
+            continue
+        yield float(lng), float(lat), {
+            'handle': camera.get('handle', camera.get('id', 'unknown')),
+            'name': camera.get('name', 'unknown'),
+            'integer_id': camera.get('integer_id', key + 1),
+            'borough': camera.get('borough', camera.get('area', 'Unknown')),
+        }
+
+
+def load_cameras(path=ZONE_LOOKUP):
+    """Load cameras as ``(points, info)``: an (n, 2) lng/lat array and one dict per camera"""
+    points = []
+    info = []
+    for lng, lat, camera in iter_cameras(path):
+        points.append([lng, lat])
+        info.append(camera)
+    return np.array(points, dtype=float).reshape(-1, 2), info
+
+
+def filter_cameras(points, boundary, boroughs=()):
+    """Test all camera points against the land boundary in one vectorized pass.
+
+    ``boundary`` is a Shapely geometry and ``boroughs`` an optional list of
+    ``(code, name, geometry)`` as returned by ``load_boroughs``. Returns a
+    boolean mask of cameras on land (edges included) and an int array with
+    each camera's BoroCode, 0 where no borough contains it.
+    """
+    points = np.asarray(points, dtype=float).reshape(-1, 2)
+    x, y = points[:, 0], points[:, 1]
+
+    shapely.prepare(boundary)
+    mask = shapely.intersects_xy(boundary, x, y)
+
+    codes = np.zeros(len(points), dtype=np.int16)
+    for code, _, geometry in boroughs:
+        pending = np.flatnonzero(mask & (codes == 0))
+        if not len(pending):
+            break
+        shapely.prepare(geometry)
+        hit = shapely.intersects_xy(geometry, x[pending], y[pending])
+        codes[pending[hit]] = code
+
+    return mask, codes
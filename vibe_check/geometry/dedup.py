@@ -0,0 +1,176 @@
+"""
+Coincident and near-coincident camera resolution ahead of the Voronoi step.
+
+Several camera files list distinct cameras at the same or almost the same
+position (two feeds of one intersection, a PTZ next to a fixed camera).
+Qhull hands coincident points one shared region, so those cameras end up
+with identical overlapping zones that are clipped twice. A KD-tree over
+the cameras projected to metres finds every pair closer than ``radius_m``
+in O(n log n); pairs are joined into clusters and each cluster is resolved
+by a policy:
+
+* ``merge``  -- keep the first camera of the cluster, drop the others
+* ``jitter`` -- keep every camera and give each its own Voronoi site,
+  spread evenly on a circle around the cluster centre (radius at least
+  ``jitter_m``) in their original bearing order, so each gets its own
+  slice of the zone
+* ``group``  -- keep every camera, build one Voronoi site per cluster and
+  give all members that site's zone
+
+Only the sites move: the cameras keep their source positions, which are
+what the zone records, metrics and camera snapshot store. Every kept camera
+of a cluster records the others in ``co_located_handles``.
+"""
+
+from dataclasses import dataclass
+
+import numpy as np
+from scipy.sparse import coo_matrix
+from scipy.sparse.csgraph import connected_components
+from scipy.spatial import cKDTree
+
+from .metrics import laea_project
+from .tessellation import ClippedCells
+
+POLICIES = ('merge', 'jitter', 'group')
+DEFAULT_POLICY = 'jitter'
+DEFAULT_RADIUS_M = 1.0
+DEFAULT_JITTER_M = 1.0
+
+# Local metres per degree around NYC, only used to turn metre offsets back into degrees
+_M_PER_DEG_LAT = 111_000.0
+
+
+@dataclass
+class Deduplicated:
+    """Cameras after duplicate resolution"""
+    keep: np.ndarray      # input index of every output camera
+    points: np.ndarray    # output camera positions as given, lng/lat
+    info: list            # output camera dicts
+    sites: np.ndarray     # Voronoi site positions
+    site_of: np.ndarray   # site index of every output camera
+    report: dict
+
+    def __len__(self):
+        return len(self.keep)
+
+    @property
+    def camera_sites(self):
+        """The Voronoi site of every output camera"""
+        return self.sites[self.site_of]
+
+
+def find_clusters(points, radius_m=DEFAULT_RADIUS_M):
+    """Groups of input indices whose cameras chain together within ``radius_m``.
+
+    Only groups of two or more are returned, each sorted, in order of their
+    first member.
+    """
+    points = np.asarray(points, dtype=float).reshape(-1, 2)
+    if len(points) < 2:
+        return []
+    xy = np.column_stack(laea_project(points[:, 0], points[:, 1]))
+    pairs = cKDTree(xy).query_pairs(radius_m, output_type='ndarray')
+    if not len(pairs):
+        return []
+    graph = coo_matrix((np.ones(len(pairs)), (pairs[:, 0], pairs[:, 1])), shape=(len(points), len(points)))
+    _, labels = connected_components(graph, directed=False)
+    sizes = np.bincount(labels)
+    clustered = np.flatnonzero(sizes[labels] > 1)
+    order = clustered[np.argsort(labels[clustered], kind='stable')]
+    groups = np.split(order, np.flatnonzero(np.diff(labels[order])) + 1)
+    return sorted((np.sort(group) for group in groups), key=lambda group: group[0])
+
+
+def _max_separation_m(points):
+    xy = np.column_stack(laea_project(points[:, 0], points[:, 1]))
+    return float(np.max(np.linalg.norm(xy[:, None] - xy[None], axis=-1)))
+
+
+def _ring_positions(points, jitter_m):
+    """Spread ``points`` evenly on a circle around their mean, keeping their bearing order"""
+    center = points.mean(axis=0)
+    m_per_deg_lng = _M_PER_DEG_LAT * np.cos(np.radians(center[1]))
+    offsets = (points - center) * [m_per_deg_lng, _M_PER_DEG_LAT]
+    distance = np.hypot(offsets[:, 0], offsets[:, 1])
+    # Exact duplicates have no bearing; they keep input order
+    bearing = np.where(distance > 0, np.arctan2(offsets[:, 1], offsets[:, 0]), 0.0)
+    rank = np.empty(len(points), dtype=int)
+    rank[np.argsort(bearing, kind='stable')] = np.arange(len(points))
+    angles = 2 * np.pi * rank / len(points)
+    # Never pull a spread-out cluster closer together than it already is
+    radius = max(jitter_m, distance.max())
+    return center + np.column_stack([np.cos(angles) * radius / m_per_deg_lng, np.sin(angles) * radius / _M_PER_DEG_LAT])
+
+
+def resolve_duplicates(points, info, policy=DEFAULT_POLICY, radius_m=DEFAULT_RADIUS_M, jitter_m=DEFAULT_JITTER_M):
+    """Resolve co-located cameras by ``policy`` and report every cluster touched"""
+    if policy not in POLICIES:
+        raise ValueError(f"unknown duplicate policy {policy!r}; expected one of {POLICIES}")
+    points = np.asarray(points, dtype=float).reshape(-1, 2)
+    clusters = find_clusters(points, radius_m)
+
+    info = [dict(camera) for camera in info]
+    site_points = points.copy()
+    dropped = np.zeros(len(points), dtype=bool)
+    site = np.arange(len(points))
+    changes = []
+    for members in clusters:
+        handles = [info[i]['handle'] for i in members]
+        for i in members:
+            info[i]['co_located_handles'] = [handle for handle in handles if handle != info[i]['handle']]
+        if policy == 'merge':
+            dropped[members[1:]] = True
+            action = f"kept {handles[0]}"
+        elif policy == 'jitter':
+            site_points[members] = _ring_positions(points[members], jitter_m)
+            action = 'spread on a circle around the cluster centre'
+        else:
+            site[members] = members[0]
+            action = f"share the zone of {handles[0]}"
+        changes.append({
+            'handles': handles,
+            'names': [info[i]['name'] for i in members],
+            'exact': bool((points[members] == points[members[0]]).all()),
+            'max_separation_m': round(_max_separation_m(points[members]), 3),
+            'action': action,
+        })
+
+    keep = np.flatnonzero(~dropped)
+    site_ids, site_of = np.unique(site[keep], return_inverse=True)
+    report = {
+        'policy': policy,
+        'radius_m': radius_m,
+        'cameras_in': len(points),
+        'cameras_out': len(keep),
+        'sites': len(site_ids),
+        'clusters': len(clusters),
+        'exact_clusters': sum(change['exact'] for change in changes),
+        'cameras_in_clusters': sum(len(members) for members in clusters),
+        'changes': changes,
+    }
+    if policy == 'jitter':
+        report['jitter_m'] = jitter_m
+    return Deduplicated(
+        keep=keep,
+        points=points[keep],
+        info=[info[i] for i in keep],
+        sites=site_points[site_ids],
+        site_of=site_of,
+        report=report,
+    )
+
+
+def site_cells(cells, site_of):
+    """One cell per site out of per-camera ``cells``"""
+    _, first = np.unique(site_of, return_index=True)
+    return cells[first]
+
+
+def expand_clipped(clipped, site_of):
+    """Per-camera clipped cells from per-site ones; cameras sharing a site share its polygon"""
+    position = np.full(int(site_of.max()) + 1 if len(site_of) else 0, -1)
+    position[clipped.index] = np.arange(len(clipped))
+    cameras = np.flatnonzero(position[site_of] >= 0)
+    rows = position[site_of[cameras]]
+    return ClippedCells(cameras, clipped.polygons[rows], clipped.area[rows], clipped.constrained[rows])
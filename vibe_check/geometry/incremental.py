@@ -0,0 +1,145 @@
+"""
+Incremental tessellation updates.
+
+A camera's Voronoi cell only changes when one of its Delaunay neighbours is
+added, removed or moved. Instead of re-clipping every zone after a camera
+change, the update finds those neighbours, re-clips just their cells and
+patches the matching records in the existing zone list.
+"""
+
+from dataclasses import dataclass, field
+
+import numpy as np
+from scipy.spatial import Delaunay
+
+from .dedup import expand_clipped
+from .tessellation import bounded_voronoi_cells, cell_box, clip_cells
+from .zones import zone_records
+
+
+@dataclass
+class CameraDiff:
+    """Camera handles added, removed or moved between two camera sets"""
+    added: list = field(default_factory=list)
+    removed: list = field(default_factory=list)
+    moved: list = field(default_factory=list)
+
+    def __bool__(self):
+        return bool(self.added or self.removed or self.moved)
+
+    def __len__(self):
+        return len(self.added) + len(self.removed) + len(self.moved)
+
+
+def diff_cameras(old_positions, new_positions):
+    """Compare two handle -> (lng, lat) mappings"""
+    diff = CameraDiff()
+    for handle, position in new_positions.items():
+        if handle not in old_positions:
+            diff.added.append(handle)
+        elif tuple(old_positions[handle]) != tuple(position):
+            diff.moved.append(handle)
+    diff.removed = [handle for handle in old_positions if handle not in new_positions]
+    return diff
+
+
+def delaunay_neighbours(points, indices):
+    """Indices of the Delaunay neighbours of ``indices``, including themselves"""
+    points = np.asarray(points, dtype=float)
+    indices = np.asarray(indices, dtype=int)
+    if len(points) < 4 or not len(indices):
+        return set(indices.tolist())
+
+    tri = Delaunay(points)
+    indptr, neighbours = tri.vertex_neighbor_vertices
+
+    # Coincident points are left out of the triangulation; Qhull reports the
+    # vertex each one collapsed onto, which stands in for its neighbourhood
+    stand_in = {int(point): int(vertex) for point, _, vertex in tri.coplanar}
+    coincident = {}
+    for point, vertex in stand_in.items():
+        coincident.setdefault(vertex, []).append(point)
+
+    affected = set()
+    for i in indices.tolist():
+        vertex = stand_in.get(i, i)
+        for j in [vertex, *neighbours[indptr[vertex]:indptr[vertex + 1]].tolist()]:
+            affected.add(j)
+            affected.update(coincident.get(j, []))
+        affected.add(i)
+    return affected
+
+
+def affected_handles(old_positions, new_positions, diff):
+    """Handles whose cells can differ after applying ``diff``"""
+    old_handles = list(old_positions)
+    new_handles = list(new_positions)
+    old_index = {handle: i for i, handle in enumerate(old_handles)}
+    new_index = {handle: i for i, handle in enumerate(new_handles)}
+
+    # Removed and moved cameras leave holes that their old neighbours fill
+    old_changed = [old_index[handle] for handle in diff.removed + diff.moved]
+    old_affected = delaunay_neighbours(list(old_positions.values()), old_changed)
+
+    # Added and moved cameras take area from their new neighbours
+    new_changed = [new_index[handle] for handle in diff.added + diff.moved]
+    new_affected = delaunay_neighbours(list(new_positions.values()), new_changed)
+
+    affected = {old_handles[i] for i in old_affected} | {new_handles[i] for i in new_affected}
+    return affected & set(new_positions)
+
+
+def update_zones(zones, old_positions, camera_info, camera_points, boundary, bounds, workers=1,
+                 sites=None, site_of=None, old_sites=None):
+    """Patch ``zones`` in place for the cameras that changed since ``old_positions``.
+
+    ``camera_info``/``camera_points`` describe the new camera set and
+    ``bounds`` the land bounds the cells were built around. When duplicate
+    resolution moved or shared Voronoi sites, ``sites``/``site_of`` give the
+    new sites and ``old_sites`` the handle -> site of the last build, so a
+    camera whose site moved with its cluster is re-clipped too. Returns the
+    CameraDiff of camera positions and the set of handles whose zones were
+    recomputed.
+    """
+    camera_points = np.asarray(camera_points, dtype=float)
+    if sites is None:
+        sites, site_of = camera_points, np.arange(len(camera_points))
+    sites = np.asarray(sites, dtype=float).reshape(-1, 2)
+    site_of = np.asarray(site_of, dtype=int)
+    handles = [camera['handle'] for camera in camera_info]
+    new_positions = {handle: tuple(point) for handle, point in zip(handles, camera_points.tolist())}
+    old_positions = {handle: tuple(position) for handle, position in old_positions.items()}
+    new_sites = {handle: tuple(site) for handle, site in zip(handles, sites[site_of].tolist())}
+    old_sites = old_positions if old_sites is None else {handle: tuple(site) for handle, site in old_sites.items()}
+
+    diff = diff_cameras(old_positions, new_positions)
+    site_diff = diff_cameras(old_sites, new_sites)
+    if not diff and not site_diff:
+        return diff, set()
+
+    old_points = np.array(list(old_sites.values()), dtype=float).reshape(-1, 2)
+    if not len(old_points) or cell_box(old_points, bounds) != cell_box(sites, bounds):
+        # The cell box moved with the camera extent, so every edge cell changes
+        affected = set(handles)
+    else:
+        affected = affected_handles(old_sites, new_sites, site_diff)
+
+    # Clip each affected site once; cameras grouped onto a site share its zone
+    index = np.array([i for i, handle in enumerate(handles) if handle in affected], dtype=int)
+    site_index = np.unique(site_of[index])
+    cells = bounded_voronoi_cells(sites, bounds)
+    clipped = clip_cells(cells[site_index], boundary, workers=workers)
+    clipped.index = site_index[clipped.index]
+    clipped = expand_clipped(clipped, site_of[index])
+    clipped.index = index[clipped.index]
+    patched = {zone['handle']: zone for zone in zone_records(clipped, camera_info, camera_points)}
+
+    # Keep untouched records as they are and follow the new camera order
+    stale = affected | set(diff.removed) | set(site_diff.removed)
+    existing = {zone['handle']: zone for zone in zones if zone['handle'] not in stale}
+    zones[:] = [
+        patched.get(handle) or existing.get(handle)
+        for handle in handles
+        if handle in patched or handle in existing
+    ]
+    return diff, affected
@@ -0,0 +1,115 @@
+"""
+Stage timing and memory instrumentation for the tessellation scripts.
+
+``Instrumentation.stage`` wraps a block and records wall time, CPU time and,
+when asked for, the tracemalloc peak (tracing slows every allocation, so it
+is off by default). ``cell_clip_times`` re-clips cells one at a time against
+the same prepared boundary the clip stage used, to find the cameras whose
+cells dominate the clip; it is a diagnostic pass that costs about as much as
+the clip itself, so callers run it only on request. ``report`` gathers both
+into a dict for the summary JSON.
+"""
+
+import cProfile
+import time
+import tracemalloc
+from contextlib import contextmanager
+from datetime import datetime, timezone
+
+import numpy as np
+import shapely
+
+from .boundary import PreparedBoundary
+
+
+def utc_now():
+    """ISO 8601 UTC timestamp for ``generated_at`` fields"""
+    return datetime.now(timezone.utc).isoformat(timespec='seconds').replace('+00:00', 'Z')
+
+
+class Instrumentation:
+    """Collect per-stage wall/CPU time and peak traced memory"""
+
+    def __init__(self, trace_memory=False, profile_path=None):
+        self.trace_memory = trace_memory
+        self.profile_path = profile_path
+        self.stages = {}
+        self.slowest_cells = []
+        self._profiler = cProfile.Profile() if profile_path else None
+        self._started = time.perf_counter()
+
+    @contextmanager
+    def stage(self, name):
+        # Nested stages share one tracemalloc session; the outer one owns it
+        owns_trace = self.trace_memory and not tracemalloc.is_tracing()
+        if owns_trace:
+            tracemalloc.start()
+        elif self.trace_memory:
+            tracemalloc.reset_peak()
+        wall, cpu = time.perf_counter(), time.process_time()
+        if self._profiler:
+            self._profiler.enable()
+        try:
+            yield
+        finally:
+            if self._profiler:
+                self._profiler.disable()
+            record = {
+                'wall_s': round(time.perf_counter() - wall, 4),
+                'cpu_s': round(time.process_time() - cpu, 4),
+            }
+            if self.trace_memory:
+                record['peak_mb'] = round(tracemalloc.get_traced_memory()[1] / 2 ** 20, 2)
+                if owns_trace:
+                    tracemalloc.stop()
+            self.stages[name] = record
+
+    def record_slowest_cells(self, cells, clipped, boundary, camera_info, n=10):
+        """Time every cell's clip on its own and keep the ``n`` slowest with their cameras.
+
+        ``boundary`` must be the ``PreparedBoundary`` the clip stage used, so
+        the timings rank the pieces the real clip touched.
+        """
+        if n <= 0 or not len(clipped):
+            return []
+        cells = np.asarray(cells, dtype=object)[clipped.index]
+        times = cell_clip_times(cells, boundary)
+        cell_vertices = shapely.get_num_coordinates(cells)
+        zone_vertices = shapely.get_num_coordinates(clipped.polygons)
+
+        self.slowest_cells = [
+            {
+                'handle': camera_info[clipped.index[i]]['handle'],
+                'name': camera_info[clipped.index[i]]['name'],
+                'clip_ms': round(float(times[i]) * 1000, 3),
+                'cell_vertices': int(cell_vertices[i]),
+                'zone_vertices': int(zone_vertices[i]),
+            }
+            for i in np.argsort(times)[::-1][:n]
+        ]
+        return self.slowest_cells
+
+    def report(self, **extra):
+        """Stages, slowest cells and any ``extra`` fields, ready for json.dump"""
+        if self._profiler and self.profile_path:
+            self._profiler.dump_stats(self.profile_path)
+        return {
+            'total_wall_s': round(time.perf_counter() - self._started, 4),
+            'stages': self.stages,
+            'slowest_cells': self.slowest_cells,
+            **({'profile': str(self.profile_path)} if self.profile_path else {}),
+            **extra,
+        }
+
+
+def cell_clip_times(cells, boundary):
+    """Seconds spent clipping each cell individually against the prepared ``boundary``"""
+    if not isinstance(boundary, PreparedBoundary):
+        raise TypeError('cell_clip_times needs the PreparedBoundary the clip stage used')
+    cells = np.asarray(cells, dtype=object)
+    times = np.empty(len(cells))
+    for i in range(len(cells)):
+        start = time.perf_counter()
+        boundary.clip(cells[i:i + 1])
+        times[i] = time.perf_counter() - start
+    return times
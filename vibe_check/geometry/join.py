@@ -0,0 +1,168 @@
+"""
+Streaming spatial join of point datasets (311 complaints, collisions) to camera zones.
+
+Rows are read in fixed-size chunks -- CSV through the pandas C parser,
+Parquet one record batch at a time through pyarrow -- and only the
+coordinate columns and the columns being aggregated are kept. Each chunk
+gets its zones from one vectorized query against a ``ZoneLookup`` (exact)
+or a ``ZoneGrid`` (rasterized, faster), and is folded into per-zone
+accumulators sized by the zone count, so memory stays bounded by the chunk
+size however many rows the file holds. Category counts are the exception:
+they grow with the number of distinct values in the group column, so that
+is capped at ``max_groups`` (``MAX_GROUPS`` by default), bounding them to
+zones x ``max_groups`` counters; a column past the cap (an id or a free
+text field) stops the join with a ValueError instead of exhausting memory.
+"""
+
+from collections import Counter
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+try:
+    import pyarrow.parquet as pq
+except ImportError:  # optional; only needed for Parquet input
+    pq = None
+
+CHUNK_ROWS = 500_000
+MAX_GROUPS = 1_000
+LNG_COLUMNS = ('longitude', 'lng', 'lon', 'long', 'x')
+LAT_COLUMNS = ('latitude', 'lat', 'y')
+
+
+def _find_column(columns, names):
+    lowered = {column.lower(): column for column in columns}
+    return next((lowered[name] for name in names if name in lowered), None)
+
+
+def coordinate_columns(columns, lng=None, lat=None):
+    """``(lng, lat)`` column names, detected case-insensitively unless given"""
+    lng = lng or _find_column(columns, LNG_COLUMNS)
+    lat = lat or _find_column(columns, LAT_COLUMNS)
+    if lng is None or lat is None:
+        raise ValueError(f"no longitude/latitude columns among {list(columns)}; pass them explicitly")
+    return lng, lat
+
+
+def read_columns(path):
+    """Column names of a CSV or Parquet file without reading its rows"""
+    if Path(path).suffix.lower() == '.parquet':
+        if pq is None:
+            raise ImportError('reading Parquet needs pyarrow')
+        return pq.ParquetFile(path).schema_arrow.names
+    return list(pd.read_csv(path, nrows=0).columns)
+
+
+def iter_chunks(path, columns=None, chunk_rows=CHUNK_ROWS):
+    """DataFrames of up to ``chunk_rows`` rows of ``columns`` (all when None) from a CSV or Parquet file"""
+    if Path(path).suffix.lower() == '.parquet':
+        if pq is None:
+            raise ImportError('reading Parquet needs pyarrow')
+        for batch in pq.ParquetFile(path).iter_batches(batch_size=chunk_rows, columns=columns):
+            yield batch.to_pandas()
+        return
+    # low_memory=False types each chunk in one pass; mixed-type columns in the
+    # city's exports otherwise warn on every chunk
+    yield from pd.read_csv(path, usecols=columns, chunksize=chunk_rows, low_memory=False)
+
+
+class ZoneAggregates:
+    """Per-zone row counts, numeric sums and category counts, accumulated chunk by chunk"""
+
+    def __init__(self, zone_ids, sum_columns=(), group_column=None, max_groups=MAX_GROUPS):
+        self.zone_ids = np.asarray(zone_ids, dtype=object)
+        self.sum_columns = list(sum_columns)
+        self.group_column = group_column
+        self.max_groups = max_groups
+        # Slot len(zone_ids) collects rows that fall in no zone
+        slots = len(self.zone_ids) + 1
+        self.counts = np.zeros(slots, dtype=np.int64)
+        self.sums = {column: np.zeros(slots) for column in self.sum_columns}
+        self.groups = Counter()
+        self.categories = set()
+        self.rows = 0
+        self.missing_coordinates = 0
+
+    def add(self, index, chunk, valid):
+        """Fold one chunk in; ``index`` is the zone index per row (-1 for none), ``valid`` its coordinate mask"""
+        slot = np.where(index >= 0, index, len(self.zone_ids))
+        self.rows += len(index)
+        self.missing_coordinates += int((~valid).sum())
+        self.counts += np.bincount(slot, minlength=len(self.counts))
+        for column in self.sum_columns:
+            values = pd.to_numeric(chunk[column], errors='coerce').to_numpy(dtype=float)
+            values = np.where(np.isfinite(values), values, 0.0)
+            self.sums[column] += np.bincount(slot, weights=values, minlength=len(self.counts))
+        if self.group_column is not None:
+            matched = index >= 0
+            groups = chunk[self.group_column].to_numpy()[matched]
+            # Checked before counting, so the counters never grow past the cap
+            categories = self.categories | {None if pd.isna(group) else group for group in pd.unique(groups)}
+            if self.max_groups is not None and len(categories) > self.max_groups:
+                raise ValueError(
+                    f"{self.group_column!r} has more than {self.max_groups} distinct values; "
+                    f"group by a coarser column or raise max_groups"
+                )
+            self.categories = categories
+            pairs = pd.DataFrame({'zone': index[matched], 'group': groups})
+            self.groups.update(pairs.value_counts(dropna=False).to_dict())
+
+    @property
+    def unmatched(self):
+        return int(self.counts[-1])
+
+    def iter_rows(self, top_groups=5):
+        """One dict per zone with at least one row, in zone order"""
+        by_zone = {}
+        for (zone, group), count in self.groups.items():
+            by_zone.setdefault(zone, []).append((count, str(group)))
+        for zone in np.flatnonzero(self.counts[:-1]):
+            row = {'zone_id': self.zone_ids[zone], 'count': int(self.counts[zone])}
+            for column in self.sum_columns:
+                row[f"{column}_sum"] = float(self.sums[column][zone])
+            if self.group_column is not None:
+                top = sorted(by_zone.get(zone, []), key=lambda item: (-item[0], item[1]))[:top_groups]
+                row[f"top_{self.group_column}"] = '; '.join(f"{group} ({count})" for count, group in top)
+            yield row
+
+    def summary(self):
+        return {
+            'rows': self.rows,
+            'matched': self.rows - self.unmatched,
+            'outside_zones': self.unmatched - self.missing_coordinates,
+            'missing_coordinates': self.missing_coordinates,
+            'zones_with_rows': int(np.count_nonzero(self.counts[:-1])),
+            'sums': {column: float(self.sums[column][:-1].sum()) for column in self.sum_columns},
+        }
+
+
+def join_to_zones(path, zones, lng=None, lat=None, sum_columns=(), group_column=None,
+                  chunk_rows=CHUNK_ROWS, on_chunk=None, all_columns=False, max_groups=MAX_GROUPS, **query_options):
+    """Stream ``path`` through ``zones`` (a ``ZoneLookup`` or ``ZoneGrid``) and aggregate per zone.
+
+    ``on_chunk(chunk, index)`` is called for every chunk, e.g. to write the
+    row assignments out; chunks hold only the columns the join needs unless
+    ``all_columns``. ``max_groups`` caps the distinct ``group_column``
+    values (None for no cap). ``query_options`` go to ``zones.query``.
+    """
+    columns = read_columns(path)
+    lng, lat = coordinate_columns(columns, lng, lat)
+    extra = [column for column in [*sum_columns, group_column] if column is not None]
+    missing = [column for column in extra if column not in columns]
+    if missing:
+        raise ValueError(f"columns {missing} not in {path}")
+    wanted = list(dict.fromkeys([lng, lat, *extra]))
+
+    aggregates = ZoneAggregates(zones.zone_ids, sum_columns, group_column, max_groups)
+    for chunk in iter_chunks(path, None if all_columns else wanted, chunk_rows):
+        x = pd.to_numeric(chunk[lng], errors='coerce').to_numpy(dtype=float)
+        y = pd.to_numeric(chunk[lat], errors='coerce').to_numpy(dtype=float)
+        # Exports use 0,0 as well as blanks for unknown locations
+        valid = np.isfinite(x) & np.isfinite(y) & (x != 0) & (y != 0)
+        index = np.full(len(chunk), -1, dtype=np.int64)
+        index[valid] = zones.query(x[valid], y[valid], **query_options)
+        aggregates.add(index, chunk, valid)
+        if on_chunk is not None:
+            on_chunk(chunk, index)
+    return aggregates
@@ -0,0 +1,129 @@
+"""
+Point-to-zone lookup over the generated camera zones.
+
+The zone polygons are prepared and indexed once in an STRtree; a lookup is
+then one tree query (bounding boxes) plus exact point-in-polygon tests on
+the few candidates. Batches of any size go through the vectorized Shapely
+calls in chunks of ``chunk_size`` points, so millions of points never
+become millions of Python objects at once: the peak is roughly 260 bytes
+per point of a chunk (about 260 MB for a million, 40 MB for the default
+100,000) with no loss of throughput down to ~20,000. Points that fall in
+no zone (water, outside the city) can optionally be assigned the nearest
+zone within a distance. That search runs on a second tree of the zones
+projected to LAEA metres (see ``metrics.py``), built on first use, so
+``max_distance_m`` is a true distance in every direction; it is far slower
+than the containment test, so give it a ``max_distance_m`` where you can.
+
+Zones are read from the binary ``.vcz`` file when it exists, otherwise
+from the zone JSON.
+"""
+
+from pathlib import Path
+
+import numpy as np
+import shapely
+
+from ..json_stream import iter_array
+from .metrics import laea_project
+from .zone_io import ZoneReader
+from .zones import COMPLETE_ZONES, COMPLETE_ZONES_BINARY
+
+CHUNK_SIZE = 100_000
+
+
+class ZoneLookup:
+    """Answer "which camera zone is this lng/lat in?" for single points or arrays"""
+
+    def __init__(self, polygons, zone_ids, chunk_size=CHUNK_SIZE):
+        self.polygons = np.asarray(polygons, dtype=object)
+        self.zone_ids = np.asarray(zone_ids, dtype=object)
+        if len(self.polygons) != len(self.zone_ids):
+            raise ValueError(f"{len(self.polygons)} polygons but {len(self.zone_ids)} zone ids")
+        self.chunk_size = chunk_size
+        shapely.prepare(self.polygons)
+        self.tree = shapely.STRtree(self.polygons)
+        self._projected_tree = None
+
+    def __len__(self):
+        return len(self.polygons)
+
+    @classmethod
+    def from_store(cls, store, chunk_size=CHUNK_SIZE):
+        """Build every polygon of a ``ZoneStore``"""
+        return cls(store.polygons(), store.zone_ids, chunk_size)
+
+    @classmethod
+    def from_file(cls, json_path=COMPLETE_ZONES, binary_path=COMPLETE_ZONES_BINARY, chunk_size=CHUNK_SIZE):
+        """Load the zones, preferring the binary file"""
+        if binary_path and Path(binary_path).exists():
+            reader = ZoneReader(binary_path)
+            return cls(reader.polygons(), [zone['handle'] for zone in reader.properties()], chunk_size)
+        polygons, zone_ids = [], []
+        for zone in iter_array(json_path):
+            polygons.append(shapely.geometry.shape(zone['voronoi_polygon']))
+            zone_ids.append(zone['handle'])
+        return cls(polygons, zone_ids, chunk_size)
+
+    @property
+    def projected_tree(self):
+        """STRtree of the zones in LAEA metres, for nearest-zone distances"""
+        if self._projected_tree is None:
+            projected = shapely.transform(self.polygons, lambda xy: np.column_stack(laea_project(xy[:, 0], xy[:, 1])))
+            self._projected_tree = shapely.STRtree(projected)
+        return self._projected_tree
+
+    def query(self, lng, lat, nearest=False, max_distance_m=None):
+        """Zone index of every point, -1 where none matches.
+
+        Points on a shared edge take the lowest-indexed zone. With
+        ``nearest``, unmatched points take the closest zone, if it lies
+        within ``max_distance_m`` (metres; None for no limit).
+        """
+        lng = np.atleast_1d(np.asarray(lng, dtype=float))
+        lat = np.atleast_1d(np.asarray(lat, dtype=float))
+        result = np.full(len(lng), -1, dtype=np.int64)
+        for start in range(0, len(lng), self.chunk_size):
+            stop = start + self.chunk_size
+            result[start:stop] = self._query_chunk(lng[start:stop], lat[start:stop], nearest, max_distance_m)
+        return result
+
+    def _query_chunk(self, lng, lat, nearest, max_distance_m):
+        points = shapely.points(lng, lat)
+        found = np.full(len(points), -1, dtype=np.int64)
+        # Bounding-box candidates from the tree, then one vectorized exact test;
+        # several times faster than letting the tree run the predicate itself
+        point_idx, zone_idx = self.tree.query(points)
+        inside = shapely.intersects_xy(self.polygons[zone_idx], lng[point_idx], lat[point_idx])
+        point_idx, zone_idx = point_idx[inside], zone_idx[inside]
+        order = np.lexsort((zone_idx, point_idx))
+        point_idx, zone_idx = point_idx[order], zone_idx[order]
+        first = np.ones(len(point_idx), dtype=bool)
+        first[1:] = point_idx[1:] != point_idx[:-1]
+        found[point_idx[first]] = zone_idx[first]
+
+        if nearest:
+            missing = np.flatnonzero(found < 0)
+            if len(missing):
+                projected = shapely.points(*laea_project(lng[missing], lat[missing]))
+                near_point, near_zone = self.projected_tree.query_nearest(
+                    projected, max_distance=max_distance_m, all_matches=False,
+                )
+                found[missing[near_point]] = near_zone
+        return found
+
+    def zone_id(self, lng, lat, nearest=False, max_distance_m=None):
+        """Zone id of one point, or None"""
+        if not nearest:
+            # Skip array set-up for the common single-point case
+            candidates = self.tree.query(shapely.Point(lng, lat), predicate='intersects')
+            return self.zone_ids[candidates.min()] if len(candidates) else None
+        index = self.query(lng, lat, nearest, max_distance_m)[0]
+        return self.zone_ids[index] if index >= 0 else None
+
+    def lookup(self, lng, lat, nearest=False, max_distance_m=None):
+        """Zone ids for arrays of points, None where no zone matches"""
+        index = self.query(lng, lat, nearest, max_distance_m)
+        ids = np.full(len(index), None, dtype=object)
+        hit = index >= 0
+        ids[hit] = self.zone_ids[index[hit]]
+        return ids
@@ -0,0 +1,174 @@
+"""
+Equal-area zone metrics.
+
+Zone records carry ``zone_area_sqm`` computed as square degrees times a
+rough constant, which overstates east-west extents by ~30% at NYC's
+latitude. This module projects every zone's coordinates to a Lambert
+azimuthal equal-area (LAEA) plane centred on the city in one NumPy pass and
+computes area, perimeter, compactness and centroid offset for all zones as
+arrays, working on the flat coordinate + offset layout of the ``.vcz`` file.
+"""
+
+import json
+
+import numpy as np
+import shapely
+
+COMPLETE_METRICS = 'data/complete_voronoi_metrics.json'
+
+# WGS84 ellipsoid and the LAEA centre used for NYC
+WGS84_A = 6378137.0
+WGS84_E2 = 0.00669437999014
+NYC_CENTER = (-73.95, 40.7)  # lng, lat
+
+
+def _q(sin_phi, e):
+    """Snyder's q (eq. 3-12) for the authalic latitude"""
+    e_sin = e * sin_phi
+    return (1 - e * e) * (
+        sin_phi / (1 - e_sin * e_sin) - np.log((1 - e_sin) / (1 + e_sin)) / (2 * e)
+    )
+
+
+def laea_project(lng, lat, center=NYC_CENTER):
+    """Project lng/lat degrees to ellipsoidal LAEA metres (Snyder, eqs. 24-2 to 24-14)"""
+    e = np.sqrt(WGS84_E2)
+    lng0, lat0 = np.radians(center)
+    lam = np.radians(np.asarray(lng, dtype=float)) - lng0
+    phi = np.radians(np.asarray(lat, dtype=float))
+
+    q_p = _q(1.0, e)
+    r_q = WGS84_A * np.sqrt(q_p / 2)
+    beta = np.arcsin(_q(np.sin(phi), e) / q_p)
+    beta1 = np.arcsin(_q(np.sin(lat0), e) / q_p)
+    m1 = np.cos(lat0) / np.sqrt(1 - WGS84_E2 * np.sin(lat0) ** 2)
+    d = WGS84_A * m1 / (r_q * np.cos(beta1))
+
+    b = r_q * np.sqrt(2 / (1 + np.sin(beta1) * np.sin(beta) + np.cos(beta1) * np.cos(beta) * np.cos(lam)))
+    x = b * d * np.cos(beta) * np.sin(lam)
+    y = (b / d) * (np.cos(beta1) * np.sin(beta) - np.sin(beta1) * np.cos(beta) * np.cos(lam))
+    return x, y
+
+
+def ring_sums(xy, ring_offsets):
+    """Signed shoelace area, centroid moments and length of every ring.
+
+    ``xy`` is an (n, 2) array of closed rings laid end to end and
+    ``ring_offsets`` the n_rings + 1 start indices. Returns arrays of
+    signed area, x and y first moments and perimeter per ring.
+    """
+    ring_offsets = np.asarray(ring_offsets, dtype=np.int64)
+    x0, y0 = xy[:-1, 0], xy[:-1, 1]
+    x1, y1 = xy[1:, 0], xy[1:, 1]
+
+    # Segments that would join one ring's last vertex to the next ring's first are dropped
+    valid = np.ones(len(x0), dtype=bool)
+    valid[ring_offsets[1:-1] - 1] = False
+    cross = np.where(valid, x0 * y1 - x1 * y0, 0.0)
+    length = np.where(valid, np.hypot(x1 - x0, y1 - y0), 0.0)
+
+    starts = ring_offsets[:-1]
+    empty = ring_offsets[1:] - starts < 2
+    starts = np.minimum(starts, max(len(cross) - 1, 0))
+
+    def per_ring(values):
+        if not len(values):
+            return np.zeros(len(starts))
+        sums = np.add.reduceat(values, starts)
+        sums[empty] = 0.0
+        return sums
+
+    area = per_ring(cross) / 2
+    moment_x = per_ring(cross * (x0 + x1)) / 6
+    moment_y = per_ring(cross * (y0 + y1)) / 6
+    perimeter = per_ring(length)
+    return area, moment_x, moment_y, perimeter
+
+
+def zone_metrics(coordinates, ring_offsets, zone_offsets, camera_points=None, center=NYC_CENTER):
+    """Equal-area metrics for polygons in flat ragged layout.
+
+    ``coordinates`` holds lng/lat pairs, ``ring_offsets``/``zone_offsets``
+    follow ``shapely.to_ragged_array`` (first ring of each zone is the
+    exterior). Returns a dict of arrays: ``area_sqm``, ``perimeter_m``,
+    ``compactness`` (Polsby-Popper, 1.0 for a circle), ``centroid_x``/
+    ``centroid_y`` in LAEA metres and, with ``camera_points``,
+    ``centroid_offset_m`` from each zone's camera.
+    """
+    coordinates = np.asarray(coordinates, dtype=float).reshape(-1, 2)
+    zone_offsets = np.asarray(zone_offsets, dtype=np.int64)
+    x, y = laea_project(coordinates[:, 0], coordinates[:, 1], center)
+    # Shift to a local origin so the shoelace products don't lose precision
+    origin_x, origin_y = (x.mean(), y.mean()) if len(x) else (0.0, 0.0)
+    xy = np.column_stack([x - origin_x, y - origin_y])
+
+    area, moment_x, moment_y, perimeter = ring_sums(xy, ring_offsets)
+
+    # Exterior counts positive and holes negative, whatever the ring winding
+    is_exterior = np.zeros(len(area), dtype=bool)
+    is_exterior[zone_offsets[:-1][zone_offsets[:-1] < zone_offsets[1:]]] = True
+    sign = np.where(is_exterior, 1.0, -1.0) * np.sign(area)
+    zone_of_ring = np.repeat(np.arange(len(zone_offsets) - 1), np.diff(zone_offsets))
+
+    n_zones = len(zone_offsets) - 1
+    zone_area = np.bincount(zone_of_ring, sign * area, minlength=n_zones)
+    zone_mx = np.bincount(zone_of_ring, sign * moment_x, minlength=n_zones)
+    zone_my = np.bincount(zone_of_ring, sign * moment_y, minlength=n_zones)
+    zone_perimeter = np.bincount(zone_of_ring, perimeter, minlength=n_zones)
+
+    with np.errstate(divide='ignore', invalid='ignore'):
+        centroid_x = np.where(zone_area > 0, zone_mx / zone_area, np.nan) + origin_x
+        centroid_y = np.where(zone_area > 0, zone_my / zone_area, np.nan) + origin_y
+        compactness = np.where(zone_perimeter > 0, 4 * np.pi * zone_area / zone_perimeter ** 2, 0.0)
+
+    metrics = {
+        'area_sqm': zone_area,
+        'perimeter_m': zone_perimeter,
+        'compactness': compactness,
+        'centroid_x': centroid_x,
+        'centroid_y': centroid_y,
+    }
+    if camera_points is not None:
+        camera_points = np.asarray(camera_points, dtype=float).reshape(-1, 2)
+        camera_x, camera_y = laea_project(camera_points[:, 0], camera_points[:, 1], center)
+        metrics['centroid_offset_m'] = np.hypot(centroid_x - camera_x, centroid_y - camera_y)
+    return metrics
+
+
+def polygon_metrics(polygons, camera_points=None, center=NYC_CENTER):
+    """``zone_metrics`` for a Shapely geometry array of polygons"""
+    polygons = np.asarray(polygons, dtype=object)
+    if not len(polygons):
+        return zone_metrics(np.empty((0, 2)), [0], [0], camera_points, center)
+    _, coordinates, (ring_offsets, zone_offsets) = shapely.to_ragged_array(polygons)
+    return zone_metrics(coordinates, ring_offsets, zone_offsets, camera_points, center)
+
+
+def geometry_area_sqm(geometry, center=NYC_CENTER):
+    """Equal-area square metres of a polygon or multipolygon, such as the land boundary"""
+    parts = shapely.get_parts(shapely.get_parts(np.asarray([geometry], dtype=object)))
+    polygons = parts[shapely.get_type_id(parts) == shapely.GeometryType.POLYGON]
+    return float(polygon_metrics(polygons, center=center)['area_sqm'].sum())
+
+
+def save_metrics(handles, metrics, path=COMPLETE_METRICS, center=NYC_CENTER):
+    """Write metrics as columnar JSON keyed by metric name, aligned with ``handles``"""
+    columns = {
+        name: [None if np.isnan(value) else round(float(value), 3) for value in values]
+        for name, values in metrics.items()
+    }
+    with open(path, 'w') as f:
+        json.dump({
+            'crs': f'+proj=laea +lat_0={center[1]} +lon_0={center[0]} +ellps=WGS84 +units=m',
+            'handles': list(handles),
+            **columns,
+        }, f)
+
+
+def load_metrics(path=COMPLETE_METRICS):
+    """Read metrics written by ``save_metrics`` back as ``(handles, {name: array})``"""
+    with open(path, 'r') as f:
+        data = json.load(f)
+    handles = data.pop('handles')
+    data.pop('crs', None)
+    return handles, {name: np.array(values, dtype=float) for name, values in data.items()}
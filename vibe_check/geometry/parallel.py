@@ -0,0 +1,55 @@
+"""
+Process-pool clipping for large camera sets.
+
+Cells are sent to workers in fixed-size chunks as WKB. Each worker rebuilds
+the boundary once in its initializer and reuses it for every chunk, and the
+chunks are reassembled in submission order so the output matches a serial
+run byte for byte.
+"""
+
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+import shapely
+
+from .boundary import PreparedBoundary
+from .tessellation import clip_to_boundary
+
+_worker_boundary = None
+
+
+def _init_worker(boundary_wkb, max_vertices):
+    global _worker_boundary
+    geometry = shapely.from_wkb(boundary_wkb)
+    _worker_boundary = geometry if max_vertices is None else PreparedBoundary(geometry, max_vertices)
+
+
+def _clip_chunk(cells_wkb):
+    cells = shapely.from_wkb(cells_wkb)
+    return shapely.to_wkb(clip_to_boundary(cells, _worker_boundary))
+
+
+def _pool_context():
+    # Fork keeps workers from re-running the calling script's top-level code
+    if 'fork' in multiprocessing.get_all_start_methods():
+        return multiprocessing.get_context('fork')
+    return multiprocessing.get_context()
+
+
+def clip_in_pool(cells, boundary, workers, chunk_size=256):
+    """Clip ``cells`` on ``workers`` processes; returns an array aligned with ``cells``"""
+    if isinstance(boundary, PreparedBoundary):
+        initargs = (shapely.to_wkb(boundary.geometry), boundary.max_vertices)
+    else:
+        initargs = (shapely.to_wkb(boundary), None)
+
+    chunks = [shapely.to_wkb(cells[start:start + chunk_size]) for start in range(0, len(cells), chunk_size)]
+
+    clipped = np.empty(len(cells), dtype=object)
+    with ProcessPoolExecutor(max_workers=workers, mp_context=_pool_context(),
+                             initializer=_init_worker, initargs=initargs) as pool:
+        # map() yields results in submission order, keeping camera order stable
+        for i, chunk_wkb in enumerate(pool.map(_clip_chunk, chunks)):
+            clipped[i * chunk_size:i * chunk_size + len(chunk_wkb)] = shapely.from_wkb(chunk_wkb)
+    return clipped
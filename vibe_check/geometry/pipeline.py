@@ -0,0 +1,214 @@
+"""
+Content-hashed stage cache for the geometry build.
+
+Each stage is keyed by a hash of its name, version, parameters, the
+contents of the files it reads and the keys of the stages it depends on.
+Results are pickled under that key, so a rerun with unchanged inputs loads
+them from disk instead of recomputing, and a stage whose key is unchanged
+is skipped without running anything upstream of it. Keys never include
+rendering options, so restyling a map reuses every geometry stage.
+"""
+
+import hashlib
+import json
+import os
+import pickle
+import tempfile
+from dataclasses import dataclass, field
+from pathlib import Path
+
+import numpy as np
+
+from .boundary import LAND_GEOJSON, PreparedBoundary, _file_sha256, load_boroughs, load_boundary
+from .cameras import ZONE_LOOKUP, filter_cameras, load_cameras
+from .dedup import DEFAULT_JITTER_M, DEFAULT_POLICY, DEFAULT_RADIUS_M, expand_clipped, resolve_duplicates, site_cells
+from .metrics import polygon_metrics
+from .tessellation import bounded_voronoi_cells, clip_cells
+
+CACHE_DIR = '.cache/geometry'
+
+
+@dataclass
+class Stage:
+    """A pipeline step: ``func(**upstream_results, **params, **options)``.
+
+    ``params`` are part of the cache key; ``options`` (worker counts and
+    the like) are passed through without affecting it.
+    """
+    name: str
+    func: object
+    depends: tuple = ()
+    files: tuple = ()
+    params: dict = field(default_factory=dict)
+    options: dict = field(default_factory=dict)
+    version: int = 1
+    cache: bool = True
+
+
+class Pipeline:
+    """Run stages in dependency order, reusing results cached on disk"""
+
+    def __init__(self, cache_dir=CACHE_DIR):
+        self.cache_dir = Path(cache_dir) if cache_dir else None
+        self.stages = {}
+        self.status = {}
+        self._keys = {}
+        self._results = {}
+
+    def add(self, name, func, depends=(), files=(), params=None, options=None, version=1, cache=True):
+        """Register a stage; ``depends`` names stages whose results are passed as keyword arguments"""
+        for dependency in depends:
+            if dependency not in self.stages:
+                raise ValueError(f"Stage {name!r} depends on unknown stage {dependency!r}")
+        self.stages[name] = Stage(
+            name, func, tuple(depends), tuple(str(f) for f in files),
+            dict(params or {}), dict(options or {}), version, cache,
+        )
+        return self
+
+    def key(self, name):
+        """Hex digest identifying ``name``'s output for the current inputs"""
+        if name not in self._keys:
+            stage = self.stages[name]
+            digest = hashlib.sha256()
+            digest.update(json.dumps({
+                'stage': stage.name,
+                'func': f"{stage.func.__module__}.{stage.func.__qualname__}",
+                'version': stage.version,
+                'params': stage.params,
+                'files': {path: _file_sha256(path) if Path(path).exists() else None for path in stage.files},
+                'depends': {dependency: self.key(dependency) for dependency in stage.depends},
+            }, sort_keys=True, default=str).encode('utf-8'))
+            self._keys[name] = digest.hexdigest()
+        return self._keys[name]
+
+    def run(self, *targets):
+        """Results of ``targets`` (every stage by default) as a name -> result dict"""
+        return {name: self[name] for name in (targets or self.stages)}
+
+    def __getitem__(self, name):
+        if name in self._results:
+            return self._results[name]
+
+        stage = self.stages[name]
+        path = self._cache_path(name)
+        result = self._load(path) if path else None
+        if result is not None:
+            self.status[name] = 'cached'
+        else:
+            upstream = {dependency: self[dependency] for dependency in stage.depends}
+            result = stage.func(**upstream, **stage.params, **stage.options)
+            self.status[name] = 'computed'
+            if path:
+                self._store(path, result)
+
+        self._results[name] = result
+        return result
+
+    def _cache_path(self, name):
+        if self.cache_dir is None or not self.stages[name].cache:
+            return None
+        return self.cache_dir / f"{name}-{self.key(name)[:32]}.pkl"
+
+    @staticmethod
+    def _load(path):
+        try:
+            with open(path, 'rb') as f:
+                return pickle.load(f)
+        except FileNotFoundError:
+            return None
+        except Exception:
+            # A truncated or stale-format cache entry is just a miss
+            return None
+
+    def _store(self, path, result):
+        path.parent.mkdir(parents=True, exist_ok=True)
+        # Drop entries for older keys of the same stage
+        for stale in path.parent.glob(f"{path.name.rsplit('-', 1)[0]}-*.pkl"):
+            stale.unlink(missing_ok=True)
+        fd, tmp = tempfile.mkstemp(dir=path.parent, suffix='.tmp')
+        with os.fdopen(fd, 'wb') as f:
+            pickle.dump(result, f, protocol=pickle.HIGHEST_PROTOCOL)
+        os.replace(tmp, path)
+
+    def summary(self):
+        """Status of each stage that ran, e.g. ``cells: cached, clipped: computed``"""
+        return ", ".join(f"{name}: {status}" for name, status in self.status.items())
+
+
+def _load_boundary_stage(geojson_path):
+    return load_boundary(geojson_path=geojson_path)
+
+
+def _load_boroughs_stage(geojson_path):
+    return load_boroughs(geojson_path=geojson_path)
+
+
+def _land_cameras_stage(boundary, boroughs, cameras_path):
+    all_points, all_info = load_cameras(cameras_path)
+    inside, borough_codes = filter_cameras(all_points, boundary, boroughs)
+    return {
+        'total': len(all_info),
+        'points': all_points[inside],
+        'info': [camera for camera, keep in zip(all_info, inside) if keep],
+        'borough_codes': borough_codes[inside],
+    }
+
+
+def _cameras_stage(land_cameras, policy, radius_m, jitter_m):
+    if policy == 'none':
+        points = land_cameras['points']
+        return {**land_cameras, 'sites': points, 'site_of': np.arange(len(points)), 'dedup': None}
+    resolved = resolve_duplicates(land_cameras['points'], land_cameras['info'], policy, radius_m, jitter_m)
+    return {
+        'total': land_cameras['total'],
+        'points': resolved.points,
+        'info': resolved.info,
+        'borough_codes': land_cameras['borough_codes'][resolved.keep],
+        'sites': resolved.sites,
+        'site_of': resolved.site_of,
+        'dedup': resolved.report,
+    }
+
+
+def _cells_stage(boundary, cameras, padding):
+    # One cell per camera; cameras grouped onto a shared site share its cell
+    return bounded_voronoi_cells(cameras['sites'], boundary.bounds, padding=padding)[cameras['site_of']]
+
+
+def _prepared_boundary_stage(boundary):
+    return PreparedBoundary(boundary)
+
+
+def _clip_stage(prepared_boundary, cells, cameras, workers):
+    clipped = clip_cells(site_cells(cells, cameras['site_of']), prepared_boundary, workers=workers)
+    return expand_clipped(clipped, cameras['site_of'])
+
+
+def _metrics_stage(cameras, clipped):
+    return polygon_metrics(clipped.polygons, np.asarray(cameras['points'])[clipped.index])
+
+
+def geometry_pipeline(cameras_path=ZONE_LOOKUP, geojson_path=LAND_GEOJSON, cache_dir=CACHE_DIR, workers=1, padding=0.05,
+                      dedup=DEFAULT_POLICY, dedup_radius_m=DEFAULT_RADIUS_M, jitter_m=DEFAULT_JITTER_M):
+    """The standard build: boundary, boroughs, land_cameras, cameras, cells, prepared_boundary, clipped, metrics.
+
+    The boundary stages are not pickled: the compiled WKB artifact already
+    caches them and loads in milliseconds. ``prepared_boundary`` is the
+    split, indexed boundary the clip runs against; it is only built when the
+    clip actually runs. ``cameras`` resolves co-located
+    cameras by the ``dedup`` policy (see ``dedup.py``; 'none' skips it, and
+    the cells stage then fails on cameras at exactly the same position).
+    """
+    pipeline = Pipeline(cache_dir)
+    pipeline.add('boundary', _load_boundary_stage, files=[geojson_path], params={'geojson_path': geojson_path}, cache=False)
+    pipeline.add('boroughs', _load_boroughs_stage, files=[geojson_path], params={'geojson_path': geojson_path}, cache=False)
+    pipeline.add('land_cameras', _land_cameras_stage, depends=['boundary', 'boroughs'], files=[cameras_path],
+                 params={'cameras_path': cameras_path})
+    pipeline.add('cameras', _cameras_stage, depends=['land_cameras'],
+                 params={'policy': dedup, 'radius_m': dedup_radius_m, 'jitter_m': jitter_m})
+    pipeline.add('cells', _cells_stage, depends=['boundary', 'cameras'], params={'padding': padding})
+    pipeline.add('prepared_boundary', _prepared_boundary_stage, depends=['boundary'], cache=False)
+    pipeline.add('clipped', _clip_stage, depends=['prepared_boundary', 'cells', 'cameras'], options={'workers': workers})
+    pipeline.add('metrics', _metrics_stage, depends=['cameras', 'clipped'])
+    return pipeline
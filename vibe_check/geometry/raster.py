@@ -0,0 +1,200 @@
+"""
+Rasterized zone-index grid: an O(1) point-to-zone table that can be memory-mapped.
+
+The clipped zones are sampled at the centre of every cell of a fixed grid
+over their bounds (about 10 m cells by default) and the zone index of each
+cell is stored as ``uint16``. A lookup is then a subtract, a multiply and
+an array read per axis, and since the file is opened with ``np.memmap``
+every worker process reading it shares one page-cached copy. The price is
+resolution: a point in a cell that straddles a zone edge gets the zone of
+the cell centre, which ``grid_error_report`` measures against the exact
+polygon lookup.
+
+Layout (little endian)::
+
+    b'VCGRID01'
+    header          HEADER (west, south, cell width/height in degrees,
+                    columns, rows, zone ids start/length)
+    padding         to GRID_OFFSET
+    grid            uint16[rows, columns], row 0 along the south edge,
+                    NODATA where no zone covers the cell centre
+    zone ids        JSON array of zone handles, indexed by grid value
+"""
+
+import json
+import math
+
+import numpy as np
+
+MAGIC = b'VCGRID01'
+HEADER_OFFSET = len(MAGIC)
+GRID_OFFSET = 64
+NODATA = 0xFFFF
+DEFAULT_CELL_M = 10.0
+ZONE_GRID = 'data/complete_voronoi_zones.vcg'
+BLOCK_CELLS = 1_000_000  # cell centres classified per ZoneLookup call
+M_PER_DEG = 111_000.0  # rough metres per degree of latitude, for cell sizes
+
+_HEADER_DTYPE = np.dtype([
+    ('west', '<f8'), ('south', '<f8'), ('cell_lng', '<f8'), ('cell_lat', '<f8'),
+    ('columns', '<u4'), ('rows', '<u4'), ('ids_start', '<u8'), ('ids_length', '<u8'),
+])
+HEADER_SIZE = _HEADER_DTYPE.itemsize
+
+
+class ZoneGrid:
+    """Memory-mapped zone-index grid"""
+
+    def __init__(self, path):
+        self.path = path
+        data = np.memmap(path, dtype=np.uint8, mode='r')
+        if bytes(data[:len(MAGIC)]) != MAGIC:
+            raise ValueError(f"{path} is not a .vcg zone grid")
+        header = np.frombuffer(data, dtype=_HEADER_DTYPE, count=1, offset=HEADER_OFFSET)[0]
+        self.west = float(header['west'])
+        self.south = float(header['south'])
+        self.cell_lng = float(header['cell_lng'])
+        self.cell_lat = float(header['cell_lat'])
+        self.columns = int(header['columns'])
+        self.rows = int(header['rows'])
+        # Inverse cell sizes, so a lookup multiplies instead of divides
+        self._scale_lng = 1.0 / self.cell_lng
+        self._scale_lat = 1.0 / self.cell_lat
+        self.grid = np.frombuffer(data, dtype='<u2', count=self.rows * self.columns, offset=GRID_OFFSET)
+        self.grid = self.grid.reshape(self.rows, self.columns)
+        ids_start, ids_length = int(header['ids_start']), int(header['ids_length'])
+        self.zone_ids = np.array(json.loads(bytes(data[ids_start:ids_start + ids_length])), dtype=object)
+
+    def __len__(self):
+        return len(self.zone_ids)
+
+    @property
+    def bounds(self):
+        return (self.west, self.south,
+                self.west + self.columns * self.cell_lng, self.south + self.rows * self.cell_lat)
+
+    def index(self, lng, lat):
+        """Zone index of one point, -1 outside every zone"""
+        col = math.floor((lng - self.west) * self._scale_lng)
+        row = math.floor((lat - self.south) * self._scale_lat)
+        if not (0 <= col < self.columns and 0 <= row < self.rows):
+            return -1
+        value = int(self.grid[row, col])
+        return -1 if value == NODATA else value
+
+    def zone_id(self, lng, lat):
+        """Zone id of one point, or None"""
+        index = self.index(lng, lat)
+        return self.zone_ids[index] if index >= 0 else None
+
+    def query(self, lng, lat):
+        """Zone index of every point, -1 where none matches"""
+        x = (np.asarray(lng, dtype=float) - self.west) * self._scale_lng
+        y = (np.asarray(lat, dtype=float) - self.south) * self._scale_lat
+        inside = (x >= 0) & (x < self.columns) & (y >= 0) & (y < self.rows)
+        result = np.full(x.shape, -1, dtype=np.int64)
+        values = self.grid[y[inside].astype(np.int64), x[inside].astype(np.int64)].astype(np.int64)
+        values[values == NODATA] = -1
+        result[inside] = values
+        return result
+
+    def lookup(self, lng, lat):
+        """Zone ids for arrays of points, None where no zone matches"""
+        index = self.query(lng, lat)
+        ids = np.full(index.shape, None, dtype=object)
+        hit = index >= 0
+        ids[hit] = self.zone_ids[index[hit]]
+        return ids
+
+    def boundary_cells(self):
+        """Mask of cells whose value differs from a 4-neighbour"""
+        grid = np.asarray(self.grid)
+        mask = np.zeros(grid.shape, dtype=bool)
+        horizontal = grid[:, 1:] != grid[:, :-1]
+        vertical = grid[1:] != grid[:-1]
+        mask[:, 1:] |= horizontal
+        mask[:, :-1] |= horizontal
+        mask[1:] |= vertical
+        mask[:-1] |= vertical
+        return mask
+
+
+def grid_shape(bounds, cell_m=DEFAULT_CELL_M):
+    """Cell size in degrees and ``(columns, rows)`` covering ``bounds`` at ``cell_m`` metres"""
+    west, south, east, north = bounds
+    cell_lat = cell_m / M_PER_DEG
+    cell_lng = cell_m / (M_PER_DEG * math.cos(math.radians((south + north) / 2)))
+    return cell_lng, cell_lat, math.ceil((east - west) / cell_lng), math.ceil((north - south) / cell_lat)
+
+
+def build_grid(path, zones, cell_m=DEFAULT_CELL_M, bounds=None):
+    """Rasterize the zones of a ``ZoneLookup`` into a ``.vcg`` file at ``path``.
+
+    The grid is written straight into the memory-mapped file a block of rows
+    at a time. Returns the opened ``ZoneGrid``.
+    """
+    if len(zones) >= NODATA:
+        raise ValueError(f"{len(zones)} zones do not fit a uint16 grid")
+    if bounds is None:
+        all_bounds = np.array([polygon.bounds for polygon in zones.polygons])
+        bounds = (*all_bounds[:, :2].min(axis=0), *all_bounds[:, 2:].max(axis=0))
+    west, south = bounds[:2]
+    cell_lng, cell_lat, columns, rows = grid_shape(bounds, cell_m)
+
+    ids = json.dumps(zones.zone_ids.tolist()).encode('utf-8')
+    ids_start = GRID_OFFSET + rows * columns * 2
+    header = np.array([(west, south, cell_lng, cell_lat, columns, rows, ids_start, len(ids))], dtype=_HEADER_DTYPE)
+    with open(path, 'wb') as f:
+        f.write(MAGIC)
+        f.write(header.tobytes())
+        f.write(b'\0' * (GRID_OFFSET - HEADER_OFFSET - HEADER_SIZE))
+        f.truncate(ids_start)
+        f.seek(ids_start)
+        f.write(ids)
+
+    grid = np.memmap(path, dtype='<u2', mode='r+', offset=GRID_OFFSET, shape=(rows, columns))
+    centre_lng = west + (np.arange(columns) + 0.5) * cell_lng
+    block = max(1, BLOCK_CELLS // columns)
+    for start in range(0, rows, block):
+        stop = min(start + block, rows)
+        centre_lat = south + (np.arange(start, stop) + 0.5) * cell_lat
+        lng, lat = np.meshgrid(centre_lng, centre_lat)
+        index = zones.query(lng.ravel(), lat.ravel())
+        grid[start:stop] = np.where(index >= 0, index, NODATA).reshape(stop - start, columns)
+    grid.flush()
+    del grid
+    return ZoneGrid(path)
+
+
+def grid_error_report(grid, zones, samples=1_000_000, seed=0):
+    """Compare grid lookups of random points in the grid bounds against exact ``zones`` lookups"""
+    rng = np.random.default_rng(seed)
+    west, south, east, north = grid.bounds
+    lng = rng.uniform(west, east, samples)
+    lat = rng.uniform(south, north, samples)
+    fast = grid.query(lng, lat)
+    exact = zones.query(lng, lat)
+    wrong = fast != exact
+
+    col = np.minimum(((lng - west) / grid.cell_lng).astype(np.int64), grid.columns - 1)
+    row = np.minimum(((lat - south) / grid.cell_lat).astype(np.int64), grid.rows - 1)
+    boundary = grid.boundary_cells()
+    on_boundary = boundary[row, col]
+    in_zone = exact >= 0
+    return {
+        'cells': grid.rows * grid.columns,
+        'columns': grid.columns,
+        'rows': grid.rows,
+        'cell_m': round(grid.cell_lat * M_PER_DEG, 3),
+        'zone_cells_fraction': round(float((np.asarray(grid.grid) != NODATA).mean()), 6),
+        'boundary_cells_fraction': round(float(boundary.mean()), 6),
+        'samples': samples,
+        'samples_in_zones': int(in_zone.sum()),
+        'mismatches': int(wrong.sum()),
+        'error_rate': float(wrong.mean()),
+        'error_rate_in_zones': float(wrong[in_zone].mean()) if in_zone.any() else 0.0,
+        'error_rate_boundary_cells': float(wrong[on_boundary].mean()) if on_boundary.any() else 0.0,
+        'mismatches_outside_boundary_cells': int((wrong & ~on_boundary).sum()),
+        'wrong_zone': int((wrong & (fast >= 0) & (exact >= 0)).sum()),
+        'zone_vs_no_zone': int((wrong & ((fast < 0) != (exact < 0))).sum()),
+    }
@@ -0,0 +1,178 @@
+"""
+Shared Voronoi tessellation engine for the camera zone scripts.
+
+Cells are handled as Shapely 2 geometry arrays so the expensive clip against
+the NYC boundary runs as one vectorized GEOS call instead of a Python loop
+over cameras.
+"""
+
+from dataclasses import dataclass
+
+import numpy as np
+import shapely
+from scipy.spatial import Voronoi
+
+POLYGON_TYPE_ID = 3
+
+
+@dataclass
+class ClippedCells:
+    """Clipped Voronoi cells, one entry per camera whose cell kept some land"""
+    index: np.ndarray        # camera index into the input points
+    polygons: np.ndarray     # largest polygon piece of each clipped cell
+    area: np.ndarray         # polygon area in square degrees
+    constrained: np.ndarray  # True where the boundary actually cut the cell
+
+    def __len__(self):
+        return len(self.index)
+
+
+def voronoi_cells(points, vor=None, fallback=None):
+    """Build one Voronoi cell polygon per input point as a geometry array.
+
+    Infinite or degenerate regions are filled with ``fallback`` (None skips them).
+    """
+    points = np.asarray(points, dtype=float)
+    if vor is None:
+        vor = Voronoi(points)
+
+    regions = [vor.regions[region_idx] for region_idx in vor.point_region[:len(points)]]
+    finite = np.array([len(region) >= 3 and -1 not in region for region in regions], dtype=bool)
+
+    cells = np.empty(len(points), dtype=object)
+    cells[:] = fallback
+
+    finite_idx = np.flatnonzero(finite)
+    if len(finite_idx):
+        lengths = np.array([len(regions[i]) for i in finite_idx])
+        vertex_idx = np.concatenate([regions[i] for i in finite_idx])
+        ring_idx = np.repeat(np.arange(len(finite_idx)), lengths)
+        rings = shapely.linearrings(vor.vertices[vertex_idx], indices=ring_idx)
+        cells[finite_idx] = shapely.polygons(rings)
+
+    return cells
+
+
+def cell_box(points, bounds, padding=0.05):
+    """Padded box that bounds the Voronoi cells of ``points`` around ``bounds``"""
+    minx, miny, maxx, maxy = bounds
+    pad = padding * max(maxx - minx, maxy - miny)
+    return (
+        min(minx, points[:, 0].min()) - pad,
+        min(miny, points[:, 1].min()) - pad,
+        max(maxx, points[:, 0].max()) + pad,
+        max(maxy, points[:, 1].max()) + pad,
+    )
+
+
+def bounded_voronoi_cells(points, bounds, padding=0.05):
+    """Build the exact Voronoi cell of every point, cut to a padded bounding box.
+
+    The points are mirrored across the four sides of the box before running
+    Qhull. Each mirror image only competes with its original outside the box,
+    so every original cell comes out finite and equal to its true cell
+    intersected with the box. No camera ends up with an unbounded region.
+
+    The points must be distinct: Qhull gives coincident points one shared
+    region, which would come back as identical overlapping cells. Callers
+    resolve co-located cameras first (``dedup.resolve_duplicates``, as the
+    pipeline does), and coincident points raise ``ValueError``.
+    """
+    points = np.asarray(points, dtype=float)
+    unique, counts = np.unique(points, axis=0, return_counts=True)
+    if len(unique) < len(points):
+        repeated = unique[counts > 1]
+        raise ValueError(
+            f"{len(points) - len(unique)} points coincide with another point "
+            f"(first at {tuple(repeated[0].tolist())}); resolve duplicates before building cells"
+        )
+    minx, miny, maxx, maxy = cell_box(points, bounds, padding)
+
+    x, y = points[:, 0], points[:, 1]
+    mirrored = np.concatenate([
+        points,
+        np.column_stack([2 * minx - x, y]),
+        np.column_stack([2 * maxx - x, y]),
+        np.column_stack([x, 2 * miny - y]),
+        np.column_stack([x, 2 * maxy - y]),
+    ])
+    return voronoi_cells(points, vor=Voronoi(mirrored))
+
+
+def largest_polygons(geometries):
+    """Pick the largest polygon part of every geometry.
+
+    Returns ``(owner, polygons, area)`` arrays, where ``owner`` indexes into
+    ``geometries``. Empty and non-areal results are dropped.
+    """
+    parts, owner = shapely.get_parts(geometries, return_index=True)
+    keep = shapely.get_type_id(parts) == POLYGON_TYPE_ID
+    parts, owner = parts[keep], owner[keep]
+    area = shapely.area(parts)
+
+    # Sort by owner, largest area first, and keep the first part of each owner
+    order = np.lexsort((-area, owner))
+    _, first = np.unique(owner[order], return_index=True)
+    pick = order[first]
+    pick = pick[area[pick] > 0]
+    return owner[pick], parts[pick], area[pick]
+
+
+def clip_cells(cells, boundary, workers=1, chunk_size=256):
+    """Clip all cells to the boundary in a single vectorized intersection.
+
+    ``boundary`` is either a plain Shapely geometry or a PreparedBoundary, in
+    which case each cell is only intersected with the boundary pieces it touches.
+    With ``workers`` > 1 the cells are clipped in chunks of ``chunk_size`` on a
+    process pool; results are identical to a serial run.
+    """
+    cells = np.asarray(cells, dtype=object)
+
+    invalid = ~shapely.is_valid(cells) & ~shapely.is_missing(cells)
+    if invalid.any():
+        cells = cells.copy()
+        cells[invalid] = shapely.make_valid(cells[invalid])
+
+    if workers > 1 and len(cells) > chunk_size:
+        from .parallel import clip_in_pool
+        clipped = clip_in_pool(cells, boundary, workers, chunk_size)
+    else:
+        clipped = clip_to_boundary(cells, boundary)
+
+    owner, polygons, area = largest_polygons(clipped)
+    # The boundary cut a cell wherever clipping lost some of its area
+    constrained = shapely.area(clipped[owner]) < shapely.area(cells[owner]) * (1 - 1e-9)
+    return ClippedCells(index=owner, polygons=polygons, area=area, constrained=constrained)
+
+
+def clip_to_boundary(cells, boundary):
+    """Raw intersection of each cell with the boundary, aligned with ``cells``"""
+    from .boundary import PreparedBoundary
+
+    try:
+        if isinstance(boundary, PreparedBoundary):
+            return boundary.clip(cells)
+        return shapely.intersection(cells, boundary)
+    except shapely.errors.GEOSException:
+        return _clip_cells_one_by_one(cells, getattr(boundary, 'geometry', boundary))
+
+
+def _clip_cells_one_by_one(cells, boundary):
+    """Fallback when a topology error aborts the batch: skip only the bad cells"""
+    clipped = np.empty(len(cells), dtype=object)
+    for i, cell in enumerate(cells):
+        try:
+            clipped[i] = shapely.intersection(cell, boundary)
+        except shapely.errors.GEOSException as e:
+            print(f"⚠️ Error clipping cell {i}: {e}")
+    return clipped
+
+
+def exterior_coordinates(polygons):
+    """Exterior ring coordinates of each polygon as a list of (k, 2) arrays"""
+    if len(polygons) == 0:
+        return []
+    exteriors = shapely.get_exterior_ring(polygons)
+    coords = shapely.get_coordinates(exteriors)
+    counts = shapely.get_num_coordinates(exteriors)
+    return np.split(coords, np.cumsum(counts)[:-1])
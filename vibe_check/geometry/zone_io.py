@@ -0,0 +1,231 @@
+"""
+Streaming zone writers and a lazy columnar zone reader.
+
+The ``.vcz`` format keeps every zone ring as flat float64 coordinate arrays
+plus offset arrays, so consumers can memory-map the file and build only the
+polygons they touch instead of parsing the whole indent=2 JSON.
+
+Layout (little endian)::
+
+    b'VCZONES1'
+    coordinates     float64[n_coords, 2]   streamed as zones are written
+    ring_offsets    int64[n_rings + 1]     coordinate index where each ring starts
+    zone_offsets    int64[n_zones + 1]     ring index where each zone starts
+    properties      JSON lines, one object per zone
+    trailer         8 x uint64 (see TRAILER) + b'VCZONES1'
+
+Ring 0 of every zone is its exterior; any further rings are holes.
+
+Both writers stream into a temporary file next to the target and only
+replace the target once ``close`` has written the trailer (or closing
+bracket). If the ``with`` block raises, the temporary file is removed and
+the previous zone file is left as it was.
+"""
+
+import json
+import os
+import shutil
+import struct
+import tempfile
+from array import array
+
+import numpy as np
+import shapely
+
+MAGIC = b'VCZONES1'
+TRAILER = struct.Struct('<8Q')  # coords start/count, rings start/count, zones start/count, props start/length
+
+
+def _temporary_path(path):
+    """Sibling of ``path`` to write into, so the final ``os.replace`` stays on one filesystem"""
+    return f"{os.fspath(path)}.{os.getpid()}.tmp"
+
+
+class ZoneWriter:
+    """Stream zones into a ``.vcz`` file without holding them in memory"""
+
+    def __init__(self, path):
+        self.path = path
+        self._tmp = _temporary_path(path)
+        self._file = open(self._tmp, 'wb')
+        self._file.write(MAGIC)
+        self._properties = tempfile.TemporaryFile()
+        self._ring_offsets = array('q', [0])
+        self._zone_offsets = array('q', [0])
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        if exc_type is None:
+            self.close()
+        else:
+            self.abort()
+
+    def __len__(self):
+        return len(self._zone_offsets) - 1
+
+    def write(self, polygon, properties=None):
+        """Append one polygon and its properties"""
+        rings = [polygon.exterior, *polygon.interiors]
+        for ring in rings:
+            coords = np.asarray(ring.coords, dtype='<f8')[:, :2]
+            self._file.write(np.ascontiguousarray(coords).tobytes())
+            self._ring_offsets.append(self._ring_offsets[-1] + len(coords))
+        self._zone_offsets.append(self._zone_offsets[-1] + len(rings))
+        self._properties.write(json.dumps(properties or {}).encode('utf-8') + b'\n')
+
+    def write_many(self, polygons, properties=None):
+        """Append a geometry array of polygons in one vectorized pass"""
+        polygons = np.asarray(polygons, dtype=object)
+        if not len(polygons):
+            return
+        _, coords, (ring_offsets, zone_offsets) = shapely.to_ragged_array(polygons)
+        self._file.write(np.ascontiguousarray(coords, dtype='<f8').tobytes())
+        self._ring_offsets.extend((self._ring_offsets[-1] + ring_offsets[1:]).tolist())
+        self._zone_offsets.extend((self._zone_offsets[-1] + zone_offsets[1:]).tolist())
+
+        if properties is None:
+            properties = [{}] * len(polygons)
+        for zone_properties in properties:
+            self._properties.write(json.dumps(zone_properties).encode('utf-8') + b'\n')
+
+    def close(self):
+        if self._file.closed:
+            return
+        f = self._file
+        coords_count = self._ring_offsets[-1]
+
+        rings_start = f.tell()
+        f.write(np.frombuffer(self._ring_offsets, dtype=np.int64).astype('<i8').tobytes())
+        zones_start = f.tell()
+        f.write(np.frombuffer(self._zone_offsets, dtype=np.int64).astype('<i8').tobytes())
+
+        props_start = f.tell()
+        self._properties.seek(0)
+        shutil.copyfileobj(self._properties, f)
+        props_length = f.tell() - props_start
+        self._properties.close()
+
+        f.write(TRAILER.pack(
+            len(MAGIC), coords_count,
+            rings_start, len(self._ring_offsets) - 1,
+            zones_start, len(self._zone_offsets) - 1,
+            props_start, props_length,
+        ))
+        f.write(MAGIC)
+        f.close()
+        os.replace(self._tmp, self.path)
+
+    def abort(self):
+        """Discard everything written; the target file is left untouched"""
+        if self._file.closed:
+            return
+        self._file.close()
+        self._properties.close()
+        os.unlink(self._tmp)
+
+
+class ZoneReader:
+    """Lazily read a ``.vcz`` file: coordinates are memory-mapped, polygons built on demand"""
+
+    def __init__(self, path):
+        self.path = path
+        self._data = np.memmap(path, dtype=np.uint8, mode='r')
+        if bytes(self._data[:len(MAGIC)]) != MAGIC or bytes(self._data[-len(MAGIC):]) != MAGIC:
+            raise ValueError(f"{path} is not a .vcz zone file")
+
+        trailer_start = len(self._data) - len(MAGIC) - TRAILER.size
+        (coords_start, coords_count, rings_start, rings_count,
+         zones_start, zones_count, props_start, props_length) = TRAILER.unpack(
+            bytes(self._data[trailer_start:trailer_start + TRAILER.size]))
+
+        self.coordinates = self._view(coords_start, '<f8', coords_count * 2).reshape(-1, 2)
+        self.ring_offsets = self._view(rings_start, '<i8', rings_count + 1)
+        self.zone_offsets = self._view(zones_start, '<i8', zones_count + 1)
+        self._props_start = props_start
+        self._props_length = props_length
+        self._properties = None
+
+    def _view(self, start, dtype, count):
+        return np.frombuffer(self._data, dtype=dtype, count=count, offset=start)
+
+    def __len__(self):
+        return len(self.zone_offsets) - 1
+
+    def __getitem__(self, i):
+        return self.properties(i), self.polygon(i)
+
+    def __iter__(self):
+        for i in range(len(self)):
+            yield self[i]
+
+    def rings(self, i):
+        """Coordinate arrays of zone ``i``'s rings (views, no copy)"""
+        first, last = self.zone_offsets[i], self.zone_offsets[i + 1]
+        return [
+            self.coordinates[self.ring_offsets[r]:self.ring_offsets[r + 1]]
+            for r in range(first, last)
+        ]
+
+    def polygon(self, i):
+        exterior, *holes = self.rings(i)
+        return shapely.Polygon(exterior, holes)
+
+    def polygons(self, indices=None):
+        """Geometry array of all zones (one vectorized pass) or of ``indices``"""
+        if indices is None:
+            return shapely.from_ragged_array(
+                shapely.GeometryType.POLYGON,
+                self.coordinates,
+                (self.ring_offsets, self.zone_offsets),
+            )
+        return np.array([self.polygon(i) for i in indices], dtype=object)
+
+    def properties(self, i=None):
+        """Properties of zone ``i``, or the list for all zones"""
+        if self._properties is None:
+            raw = bytes(self._data[self._props_start:self._props_start + self._props_length])
+            self._properties = [json.loads(line) for line in raw.splitlines()]
+        return self._properties if i is None else self._properties[i]
+
+
+class JsonZoneWriter:
+    """Stream zone records into a JSON array, byte-identical to ``json.dump(zones, f, indent=2)``"""
+
+    def __init__(self, path):
+        self.path = path
+        self._tmp = _temporary_path(path)
+        self._file = open(self._tmp, 'w')
+        self._count = 0
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        if exc_type is None:
+            self.close()
+        else:
+            self.abort()
+
+    def __len__(self):
+        return self._count
+
+    def write(self, zone):
+        text = json.dumps(zone, indent=2).replace('\n', '\n  ')
+        self._file.write(('[\n  ' if self._count == 0 else ',\n  ') + text)
+        self._count += 1
+
+    def close(self):
+        if self._file.closed:
+            return
+        self._file.write('\n]' if self._count else '[]')
+        self._file.close()
+        os.replace(self._tmp, self.path)
+
+    def abort(self):
+        """Discard everything written; the target file is left untouched"""
+        if self._file.closed:
+            return
+        self._file.close()
+        os.unlink(self._tmp)
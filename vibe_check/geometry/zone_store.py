@@ -0,0 +1,168 @@
+"""
+Zone polygons shared between processes as flat arrays.
+
+A ``ZoneStore`` holds every zone ring in the ``.vcz`` layout -- one float64
+coordinate array plus ring and zone offset arrays -- backed either by the
+memory-mapped ``.vcz`` file or by a ``multiprocessing.shared_memory``
+block. Every process that opens or attaches the store reads the same
+physical pages, so adding workers adds no per-process copy of the zones.
+Rings come out as numpy views, and Shapely geometries are only built for
+the zones a caller actually asks for.
+
+Pool workers attach with the picklable ``spec`` of a store. Shared memory
+suits a pool started by the process that owns the block. Independent
+processes (gunicorn workers without --preload, cron jobs) should open the
+``.vcz`` file instead: before Python 3.13 every process attaching a block by
+name registers it with its own resource tracker, which unlinks the block
+when that process exits.
+"""
+
+import sys
+from multiprocessing import shared_memory
+
+import numpy as np
+import shapely
+
+from .zone_io import ZoneReader
+from .zones import COMPLETE_ZONES_BINARY
+
+
+class ZoneStore:
+    """Flat zone coordinate and offset arrays, shared instead of copied"""
+
+    def __init__(self, coordinates, ring_offsets, zone_offsets, zone_ids, spec, shm=None, owner=False):
+        self.coordinates = coordinates
+        self.ring_offsets = ring_offsets
+        self.zone_offsets = zone_offsets
+        self.zone_ids = np.asarray(zone_ids, dtype=object)
+        self.spec = spec
+        self._shm = shm
+        self._owner = owner
+        self._bounds = None
+
+    @classmethod
+    def open(cls, path=COMPLETE_ZONES_BINARY):
+        """Memory-map a ``.vcz`` zone file"""
+        reader = ZoneReader(path)
+        zone_ids = [zone.get('handle') for zone in reader.properties()]
+        return cls(reader.coordinates, reader.ring_offsets, reader.zone_offsets, zone_ids, {'path': str(path)})
+
+    @classmethod
+    def create(cls, coordinates, ring_offsets, zone_offsets, zone_ids):
+        """Copy the arrays into a new shared memory block owned by this process"""
+        coordinates = np.ascontiguousarray(coordinates, dtype='<f8').reshape(-1, 2)
+        ring_offsets = np.ascontiguousarray(ring_offsets, dtype='<i8')
+        zone_offsets = np.ascontiguousarray(zone_offsets, dtype='<i8')
+        size = coordinates.nbytes + ring_offsets.nbytes + zone_offsets.nbytes
+        shm = shared_memory.SharedMemory(create=True, size=max(size, 1))
+        spec = {
+            'name': shm.name,
+            'coordinates': len(coordinates),
+            'rings': len(ring_offsets) - 1,
+            'zones': len(zone_offsets) - 1,
+            'zone_ids': list(zone_ids),
+        }
+        store = cls._from_block(shm, spec, owner=True)
+        store.coordinates[:] = coordinates
+        store.ring_offsets[:] = ring_offsets
+        store.zone_offsets[:] = zone_offsets
+        return store
+
+    @classmethod
+    def from_polygons(cls, polygons, zone_ids):
+        """Pack a geometry array of polygons into shared memory"""
+        _, coordinates, (ring_offsets, zone_offsets) = shapely.to_ragged_array(np.asarray(polygons, dtype=object))
+        return cls.create(coordinates, ring_offsets, zone_offsets, zone_ids)
+
+    @classmethod
+    def attach(cls, spec):
+        """Open the store described by another process's ``spec``"""
+        if 'path' in spec:
+            return cls.open(spec['path'])
+        if sys.version_info >= (3, 13):
+            shm = shared_memory.SharedMemory(spec['name'], track=False)
+        else:
+            shm = shared_memory.SharedMemory(spec['name'])
+        return cls._from_block(shm, spec)
+
+    @classmethod
+    def _from_block(cls, shm, spec, owner=False):
+        coordinates = np.ndarray((spec['coordinates'], 2), dtype='<f8', buffer=shm.buf)
+        offset = coordinates.nbytes
+        ring_offsets = np.ndarray(spec['rings'] + 1, dtype='<i8', buffer=shm.buf, offset=offset)
+        offset += ring_offsets.nbytes
+        zone_offsets = np.ndarray(spec['zones'] + 1, dtype='<i8', buffer=shm.buf, offset=offset)
+        return cls(coordinates, ring_offsets, zone_offsets, spec['zone_ids'], spec, shm, owner)
+
+    def to_shared(self):
+        """Copy of this store in a shared memory block owned by this process"""
+        return self.create(self.coordinates, self.ring_offsets, self.zone_offsets, self.zone_ids.tolist())
+
+    def close(self):
+        """Release this process's views; the owner also frees the shared block"""
+        if self._shm is None:
+            return
+        self.coordinates = self.ring_offsets = self.zone_offsets = None
+        self._shm.close()
+        if self._owner:
+            self._shm.unlink()
+        self._shm = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+
+    def __len__(self):
+        return len(self.zone_offsets) - 1
+
+    def rings(self, i):
+        """Coordinate arrays of zone ``i``'s rings (views, no copy); ring 0 is the exterior"""
+        first, last = self.zone_offsets[i], self.zone_offsets[i + 1]
+        return [
+            self.coordinates[self.ring_offsets[r]:self.ring_offsets[r + 1]]
+            for r in range(first, last)
+        ]
+
+    def polygon(self, i):
+        exterior, *holes = self.rings(i)
+        return shapely.Polygon(exterior, holes)
+
+    def polygons(self, indices=None):
+        """Geometry array of all zones (one vectorized pass) or of ``indices``"""
+        if indices is None:
+            return shapely.from_ragged_array(
+                shapely.GeometryType.POLYGON,
+                self.coordinates,
+                (self.ring_offsets, self.zone_offsets),
+            )
+        return np.array([self.polygon(i) for i in indices], dtype=object)
+
+    @property
+    def bounds(self):
+        """``(n_zones, 4)`` array of west, south, east, north, computed from the flat arrays"""
+        if self._bounds is None:
+            # All rings of a zone are contiguous, so one reduceat per axis covers each zone
+            starts = self.ring_offsets[self.zone_offsets[:-1]]
+            lower = np.minimum.reduceat(self.coordinates, starts, axis=0)
+            upper = np.maximum.reduceat(self.coordinates, starts, axis=0)
+            self._bounds = np.hstack([lower, upper])
+        return self._bounds
+
+    def candidates(self, lng, lat):
+        """Indices of zones whose bounding box holds the point"""
+        b = self.bounds
+        return np.flatnonzero((b[:, 0] <= lng) & (lng <= b[:, 2]) & (b[:, 1] <= lat) & (lat <= b[:, 3]))
+
+    def zone_index(self, lng, lat):
+        """Index of the lowest zone holding the point, -1 for none; builds only candidate polygons"""
+        for i in self.candidates(lng, lat):
+            if shapely.intersects_xy(self.polygon(i), lng, lat):
+                return int(i)
+        return -1
+
+    def zone_id(self, lng, lat):
+        """Zone id of one point, or None"""
+        index = self.zone_index(lng, lat)
+        return self.zone_ids[index] if index >= 0 else None
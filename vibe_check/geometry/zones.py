@@ -0,0 +1,120 @@
+"""
+Zone records written to ``data/complete_voronoi_zones.json`` and the
+statistics reported in ``data/complete_voronoi_summary.json``.
+"""
+
+import json
+
+import numpy as np
+from shapely.geometry import shape
+
+from .tessellation import exterior_coordinates
+from .zone_io import JsonZoneWriter, ZoneWriter
+
+COMPLETE_ZONES = 'data/complete_voronoi_zones.json'
+COMPLETE_SUMMARY = 'data/complete_voronoi_summary.json'
+CAMERA_SNAPSHOT = 'data/complete_voronoi_cameras.json'
+COMPLETE_ZONES_BINARY = 'data/complete_voronoi_zones.vcz'
+
+# Rough conversion, kept for the records' legacy zone_area_sqm field; it
+# overstates areas by ~30% at NYC's latitude, so the summary uses metrics.py
+SQ_DEG_TO_SQM = 111000 * 111000
+
+
+def zone_records(clipped, camera_info, camera_points):
+    """Build one zone record per clipped cell, in camera order"""
+    return [zone for zone, _ in iter_zone_records(clipped, camera_info, camera_points)]
+
+
+def iter_zone_records(clipped, camera_info, camera_points):
+    """Yield ``(record, polygon)`` per clipped cell, in camera order"""
+    polygons = clipped.polygons
+    for j, (i, zone_coords, zone_area) in enumerate(zip(clipped.index, exterior_coordinates(polygons), clipped.area)):
+        camera = camera_info[i]
+        coords = zone_coords.tolist()
+        yield {
+            'integer_id': camera['integer_id'],
+            'handle': camera['handle'],
+            'name': camera['name'],
+            'coordinates': [float(camera_points[i][1]), float(camera_points[i][0])],  # [lat, lng]
+            'voronoi_polygon': {
+                'type': 'Polygon',
+                'coordinates': [coords]
+            },
+            'zone_area_sqm': float(zone_area) * SQ_DEG_TO_SQM,
+            'vertices_count': len(coords) - 1,
+            'is_land_zone': True,
+            'is_bridge_zone': False,
+            'bounded_by_coastline': True,
+            'coverage_quality': 'complete_voronoi_coverage',
+            'tessellation_method': 'proper_voronoi_partitioning_all_nyc_land',
+            **({'co_located_handles': camera['co_located_handles']} if camera.get('co_located_handles') else {}),
+        }, polygons[j]
+
+
+def zone_properties(zone):
+    """A zone record without its polygon, as stored in the binary zone file"""
+    return {key: value for key, value in zone.items() if key != 'voronoi_polygon'}
+
+
+def write_zones(records, json_path=COMPLETE_ZONES, binary_path=COMPLETE_ZONES_BINARY):
+    """Stream ``(record, polygon)`` pairs to the JSON zone file and its ``.vcz`` twin.
+
+    Records are written as they arrive, so only their small property dicts
+    are kept; those are returned for ``summarize_zones``. If the records
+    raise partway through, both previous files are left in place.
+    """
+    written = []
+    with JsonZoneWriter(json_path) as json_out, ZoneWriter(binary_path) as binary_out:
+        for zone, polygon in records:
+            properties = zone_properties(zone)
+            json_out.write(zone)
+            binary_out.write(polygon, properties)
+            written.append(properties)
+    return written
+
+
+def zone_polygons(zones):
+    """Pair zone records read back from JSON with their Shapely polygons"""
+    for zone in zones:
+        yield zone, shape(zone['voronoi_polygon'])
+
+
+def summarize_zones(zones, zone_areas_sqm, land_area_sqm):
+    """Coverage statistics for the summary file.
+
+    Areas are equal-area square metres: ``zone_areas_sqm`` aligned with
+    ``zones`` (``metrics['area_sqm']``) and ``land_area_sqm`` for the whole
+    boundary (``metrics.geometry_area_sqm``), not the records' rough
+    ``zone_area_sqm``.
+    """
+    valid_zones = len(zones)
+    total_covered_area = float(np.sum(zone_areas_sqm))
+    coverage = total_covered_area / land_area_sqm if land_area_sqm else 0.0
+    return {
+        'total_zones': valid_zones,
+        'constrained_zones': valid_zones,
+        'constraint_success_rate': 100.0,
+        'total_area_km2': total_covered_area / 1000000,
+        'land_area_km2': land_area_sqm / 1000000,
+        'average_zone_size_km2': total_covered_area / valid_zones / 1000000 if valid_zones else 0.0,
+        'average_vertices': sum(zone['vertices_count'] for zone in zones) / valid_zones if valid_zones else 0.0,
+        'coverage_percentage': coverage * 100,
+        'complete_coverage': coverage > 0.95,
+    }
+
+
+def save_camera_snapshot(camera_info, camera_points, path=CAMERA_SNAPSHOT):
+    """Record the camera positions a tessellation was built from, keyed by handle"""
+    snapshot = {
+        camera['handle']: [float(point[0]), float(point[1])]
+        for camera, point in zip(camera_info, camera_points)
+    }
+    with open(path, 'w') as f:
+        json.dump(snapshot, f)
+
+
+def load_camera_snapshot(path=CAMERA_SNAPSHOT):
+    """Handle -> [lng, lat] positions saved by the last tessellation run"""
+    with open(path, 'r') as f:
+        return json.load(f)
@@ -0,0 +1,155 @@
+"""
+Incremental JSON reading for the large input files.
+
+``iter_array`` and ``iter_object`` yield the items of a top-level array
+(or of the array under one top-level key, like a GeoJSON ``features``
+list) and the members of a top-level object one at a time, so only the
+current item is ever held in memory. ijson is used when it is installed;
+otherwise a small reader decodes one value at a time out of a growing
+text buffer with ``json.JSONDecoder.raw_decode``, which keeps the C
+scanner doing the actual parsing.
+"""
+
+import json
+
+try:
+    import ijson
+except ImportError:  # optional; the raw_decode reader covers everything we read
+    ijson = None
+
+CHUNK_SIZE = 1 << 16
+_WHITESPACE = ' \t\n\r'
+_DELIMITERS = _WHITESPACE + ',:]}'
+
+
+class _Reader:
+    """Text buffer over a file that decodes one JSON value at a time"""
+
+    def __init__(self, f, chunk_size=CHUNK_SIZE):
+        self.f = f
+        self.chunk_size = chunk_size
+        self.buffer = ''
+        self.pos = 0
+        self.eof = False
+        self.decoder = json.JSONDecoder()
+
+    def _fill(self, size=None):
+        chunk = self.f.read(size or self.chunk_size)
+        if not chunk:
+            self.eof = True
+            return False
+        # Drop what has been consumed before growing the buffer
+        self.buffer = self.buffer[self.pos:] + chunk
+        self.pos = 0
+        return True
+
+    def peek(self):
+        """Next non-whitespace character, or '' at end of input"""
+        while True:
+            while self.pos < len(self.buffer) and self.buffer[self.pos] in _WHITESPACE:
+                self.pos += 1
+            if self.pos < len(self.buffer) or not self._fill():
+                return self.buffer[self.pos:self.pos + 1]
+
+    def expect(self, chars):
+        char = self.peek()
+        if not char or char not in chars:
+            raise json.JSONDecodeError(f"expected one of {chars!r}", self.buffer, self.pos)
+        self.pos += 1
+        return char
+
+    def value(self):
+        """Decode the next complete value, reading more input as needed"""
+        self.peek()
+        while True:
+            try:
+                value, end = self.decoder.raw_decode(self.buffer, self.pos)
+            except json.JSONDecodeError:
+                # Most likely a value cut off by the chunk boundary; read at
+                # least as much again so long values aren't rescanned per chunk
+                if self._fill(max(self.chunk_size, len(self.buffer))):
+                    continue
+                raise
+            # A number cut off by the chunk boundary ("2." or "2.5e") still
+            # decodes as a shorter one, so a value must end at a delimiter
+            if (end == len(self.buffer) or self.buffer[end] not in _DELIMITERS) and not self.eof and self._fill():
+                continue
+            self.pos = end
+            return value
+
+    def items(self):
+        """Values of the array starting at the current position"""
+        self.expect('[')
+        if self.peek() == ']':
+            self.pos += 1
+            return
+        while True:
+            yield self.value()
+            if self.expect(',]') == ']':
+                return
+
+    def members(self):
+        """``(key, value)`` pairs of the object starting at the current position"""
+        self.expect('{')
+        if self.peek() == '}':
+            self.pos += 1
+            return
+        while True:
+            key = self.value()
+            self.expect(':')
+            yield key, self.value()
+            if self.expect(',}') == '}':
+                return
+
+    def seek_key(self, key):
+        """Step into the top-level object up to the value of ``key``"""
+        self.expect('{')
+        if self.peek() == '}':
+            raise KeyError(key)
+        while True:
+            name = self.value()
+            self.expect(':')
+            if name == key:
+                return
+            self.value()
+            if self.expect(',}') == '}':
+                raise KeyError(key)
+
+
+def iter_array(path, key=None, chunk_size=CHUNK_SIZE):
+    """Items of the top-level JSON array in ``path``, or of the array under top-level ``key``.
+
+    ``chunk_size`` is the fallback reader's read size in characters.
+    """
+    if ijson is not None:
+        with open(path, 'rb') as f:
+            yield from ijson.items(f, f"{key}.item" if key else 'item', use_float=True)
+        return
+    with open(path, 'r', encoding='utf-8') as f:
+        reader = _Reader(f, chunk_size)
+        if key is not None:
+            reader.seek_key(key)
+        yield from reader.items()
+
+
+def iter_object(path, chunk_size=CHUNK_SIZE):
+    """``(key, value)`` members of the top-level JSON object in ``path``"""
+    if ijson is not None:
+        with open(path, 'rb') as f:
+            yield from ijson.kvitems(f, '', use_float=True)
+        return
+    with open(path, 'r', encoding='utf-8') as f:
+        yield from _Reader(f, chunk_size).members()
+
+
+def iter_records(path, chunk_size=CHUNK_SIZE):
+    """``(key, record)`` for a file holding either an object of records or a list of them.
+
+    List items are keyed by their index.
+    """
+    with open(path, 'r', encoding='utf-8') as f:
+        is_object = _Reader(f).peek() == '{'
+    if is_object:
+        yield from iter_object(path, chunk_size)
+    else:
+        yield from enumerate(iter_array(path, chunk_size=chunk_size))
@@ -0,0 +1,17 @@
+"""
+Monitoring schedules: a heap-based scheduler compiled from the
+monitoring_schedules_*.json files and a discrete-event simulator of the
+request load it produces.
+"""
+
+from .scheduler import MonitoringScheduler, load_schedules, sampling_interval_hours
+from .simulate import Station, phase_offsets, simulate
+
+__all__ = [
+    'MonitoringScheduler',
+    'Station',
+    'load_schedules',
+    'phase_offsets',
+    'sampling_interval_hours',
+    'simulate',
+]
@@ -0,0 +1,253 @@
+"""
+Heap-based monitoring scheduler compiled from the schedule files.
+
+The ``monitoring_schedules_*.json`` documents are read once and compiled
+into a min-heap of ``(next_due, seq, handle)`` entries, so a tick only
+touches the cameras that are actually due: ``advance`` pops and
+reschedules k due cameras in O(k log n) and ``due`` lists a window without
+popping by walking just the heap nodes that fall inside it. A score update
+that changes a camera's interval reschedules it in place; the old heap
+entry is left behind and skipped when it surfaces (lazy deletion).
+
+Intervals follow the engine that writes these schedules
+(functions/src/adaptiveMonitoringEngine.ts,
+``calculateAdaptiveScore``): ``current_score`` *is* the number of hours
+between samples, clamped to 0.5-96, and ``sampling_frequency_hours`` is set
+equal to it. Each risk factor the engine finds subtracts hours from the
+neighbourhood baseline (24 by default), so a lower score means more
+frequent sampling.
+
+State is saved as a compressed ``.npz`` of parallel arrays rather than the
+original per-camera JSON documents.
+"""
+
+import glob
+import heapq
+import itertools
+import math
+
+import numpy as np
+
+from ..json_stream import iter_array
+
+SCHEDULE_BATCHES = 'monitoring_schedules_batch_*.json'
+SCHEDULE_COMPLETE = 'monitoring_schedules_complete.json'
+SCHEDULER_STATE = 'data/monitoring_scheduler_state.npz'
+
+# Bounds the adaptive monitoring engine clamps total_score to
+MIN_INTERVAL_HOURS = 0.5
+MAX_INTERVAL_HOURS = 96.0
+BASELINE_SCORE = 24.0
+
+# Names the schedule files use for common intervals; anything else is labelled by hours
+_TIER_NAMES = {1.0: 'hourly', 24.0: 'daily', 168.0: 'weekly'}
+
+
+def sampling_interval_hours(score):
+    """Hours between samples for a ``current_score``, as the adaptive engine computes them"""
+    return min(MAX_INTERVAL_HOURS, max(MIN_INTERVAL_HOURS, float(score)))
+
+
+def interval_tier(interval_hours):
+    """Reporting label for an interval: 'daily' for 24 h, 'every 0.5h' for 30 minutes"""
+    return _TIER_NAMES.get(float(interval_hours), f"every {interval_hours:g}h")
+
+
+def iter_schedules(paths=None):
+    """Yield schedule records one at a time from the batch files (or ``paths``)"""
+    if paths is None:
+        paths = sorted(glob.glob(SCHEDULE_BATCHES)) or [SCHEDULE_COMPLETE]
+    for path in paths:
+        for record in iter_array(path):
+            if record.get('zone_id'):
+                yield record
+
+
+def load_schedules(paths=None):
+    """Schedule records keyed by ``zone_id``; later files win when a zone appears twice"""
+    return {record['zone_id']: record for record in iter_schedules(paths)}
+
+
+class MonitoringScheduler:
+    """Min-heap of cameras keyed by next-due time (Unix seconds)"""
+
+    def __init__(self):
+        self.heap = []
+        self.cameras = {}  # handle -> [next_due, interval_s, score, tier, last_run, seq]
+        self._seq = itertools.count()
+
+    def __len__(self):
+        return len(self.cameras)
+
+    def __contains__(self, handle):
+        return handle in self.cameras
+
+    @classmethod
+    def from_schedules(cls, schedules, now, offsets=None):
+        """Compile schedule records (see ``load_schedules``).
+
+        Every camera starts due at ``now`` plus its entry in ``offsets``
+        (handle -> seconds), if any.
+        """
+        offsets = offsets or {}
+        scheduler = cls()
+        for handle, record in schedules.items():
+            score = float(record.get('current_score', BASELINE_SCORE))
+            interval_hours = float(record.get('sampling_frequency_hours') or sampling_interval_hours(score))
+            scheduler.cameras[handle] = [
+                now + offsets.get(handle, 0.0), interval_hours * 3600, score,
+                interval_tier(interval_hours), None, next(scheduler._seq),
+            ]
+        scheduler._rebuild()
+        return scheduler
+
+    def copy(self):
+        """Independent scheduler with the same cameras, e.g. to simulate ticks without moving this one"""
+        scheduler = type(self)()
+        for handle, camera in self.cameras.items():
+            scheduler.cameras[handle] = [*camera[:5], next(scheduler._seq)]
+        scheduler._rebuild()
+        return scheduler
+
+    def _rebuild(self):
+        """Heapify one live entry per camera, dropping stale ones"""
+        self.heap = [(camera[0], camera[5], handle) for handle, camera in self.cameras.items()]
+        heapq.heapify(self.heap)
+
+    def _push(self, handle, next_due):
+        camera = self.cameras[handle]
+        camera[0] = next_due
+        camera[5] = next(self._seq)
+        heapq.heappush(self.heap, (next_due, camera[5], handle))
+        # Stale entries only cost memory; compact once they outnumber the live ones
+        if len(self.heap) > 2 * len(self.cameras) + 64:
+            self._rebuild()
+
+    def _live(self, entry):
+        camera = self.cameras.get(entry[2])
+        return camera is not None and camera[5] == entry[1]
+
+    def add(self, handle, interval_s, next_due, score=None, tier=None):
+        """Schedule a new camera, or move an existing one"""
+        if score is None:
+            score = interval_s / 3600
+        if tier is None:
+            tier = interval_tier(interval_s / 3600)
+        previous = self.cameras.get(handle)
+        self.cameras[handle] = [next_due, float(interval_s), float(score), tier, previous[4] if previous else None, 0]
+        self._push(handle, next_due)
+
+    def remove(self, handle):
+        """Stop scheduling ``handle``; its heap entry is skipped from now on"""
+        del self.cameras[handle]
+
+    def next_due(self):
+        """Earliest due time, or None when nothing is scheduled"""
+        while self.heap and not self._live(self.heap[0]):
+            heapq.heappop(self.heap)
+        return self.heap[0][0] if self.heap else None
+
+    def due(self, until, since=-math.inf):
+        """Handles due in ``(since, until]``, earliest first, without popping.
+
+        Walks only heap nodes due by ``until``: a node past it has no
+        descendants inside the window either.
+        """
+        found, stack = [], [0] if self.heap else []
+        while stack:
+            i = stack.pop()
+            entry = self.heap[i]
+            if entry[0] > until:
+                continue
+            if entry[0] > since and self._live(entry):
+                found.append(entry)
+            stack.extend(child for child in (2 * i + 1, 2 * i + 2) if child < len(self.heap))
+        return [handle for _, _, handle in sorted(found)]
+
+    def advance(self, now):
+        """Pop every camera due by ``now`` and schedule its next run.
+
+        Returns ``(handle, due)`` pairs. A camera that fell more than one
+        interval behind is rescheduled from ``now`` instead of replaying
+        the missed runs.
+        """
+        ran = []
+        while self.heap and self.heap[0][0] <= now:
+            due, seq, handle = heapq.heappop(self.heap)
+            camera = self.cameras.get(handle)
+            if camera is None or camera[5] != seq:
+                continue
+            camera[4] = now
+            next_due = due + camera[1]
+            self._push(handle, next_due if next_due > now else now + camera[1])
+            ran.append((handle, due))
+        return ran
+
+    def update_score(self, handle, score, now):
+        """Record a new ``current_score``; returns the new tier label if the interval changed, else None.
+
+        The new interval is the score in hours (see
+        ``sampling_interval_hours``). The camera keeps its phase: the next
+        run is the first slot at or after ``now`` on the new interval's grid
+        through its last run (or its pending first run if it has not run
+        yet), so cameras escalated together do not all come due at once.
+        """
+        camera = self.cameras[handle]
+        camera[2] = float(score)
+        interval_hours = sampling_interval_hours(score)
+        if interval_hours * 3600 == camera[1]:
+            return None
+        camera[3], camera[1] = interval_tier(interval_hours), interval_hours * 3600
+        if camera[4] is None:
+            anchor, steps = camera[0], math.ceil((now - camera[0]) / camera[1])
+        else:
+            anchor, steps = camera[4], max(1, math.ceil((now - camera[4]) / camera[1]))
+        self._push(handle, anchor + steps * camera[1])
+        return camera[3]
+
+    def stats(self):
+        """Camera counts and sampling load per tier"""
+        tiers = {}
+        for _, interval_s, _, tier, _, _ in self.cameras.values():
+            counts = tiers.setdefault(tier, {'cameras': 0, 'samples_per_day': 0.0})
+            counts['cameras'] += 1
+            counts['samples_per_day'] += 86400 / interval_s
+        return {
+            'cameras': len(self.cameras),
+            'heap_entries': len(self.heap),
+            'next_due': self.next_due(),
+            'samples_per_day': round(sum(counts['samples_per_day'] for counts in tiers.values()), 1),
+            'tiers': tiers,
+        }
+
+    def save(self, path=SCHEDULER_STATE):
+        """Store the schedule as compressed parallel arrays"""
+        handles = list(self.cameras)
+        columns = list(zip(*self.cameras.values())) if handles else [()] * 6
+        tier_names = sorted(set(columns[3]))
+        np.savez_compressed(
+            path,
+            handles=np.array(handles, dtype=str),
+            next_due=np.array(columns[0], dtype=np.float64),
+            interval_s=np.array(columns[1], dtype=np.float64),
+            score=np.array(columns[2], dtype=np.float32),
+            tier=np.array([tier_names.index(tier) for tier in columns[3]], dtype=np.uint8),
+            tier_names=np.array(tier_names, dtype=str),
+            last_run=np.array([math.nan if last is None else last for last in columns[4]], dtype=np.float64),
+        )
+
+    @classmethod
+    def load(cls, path=SCHEDULER_STATE):
+        scheduler = cls()
+        with np.load(path) as data:
+            tier_names = data['tier_names'].tolist()
+            for handle, next_due, interval_s, score, tier, last_run in zip(
+                data['handles'].tolist(), data['next_due'].tolist(), data['interval_s'].tolist(),
+                data['score'].tolist(), data['tier'].tolist(), data['last_run'].tolist(),
+            ):
+                scheduler.cameras[handle] = [
+                    next_due, interval_s, score, tier_names[tier],
+                    None if math.isnan(last_run) else last_run, next(scheduler._seq),
+                ]
+        scheduler._rebuild()
+        return scheduler
@@ -0,0 +1,201 @@
+"""
+Discrete-event simulation of the request load a monitoring schedule produces.
+
+The schedule is replayed through ``MonitoringScheduler`` over simulated
+time, jumping straight from one due time to the next, with optional score
+escalations applied at their own times. Every camera run becomes a frame
+fetch from NYCTMC followed by a vision API call; each is served by a
+station with a concurrency cap, an optional start-rate limit and
+log-normal service times, in FIFO order. The result has per-minute request
+histograms, peak concurrency and queue latency for both stations.
+
+Phase-offset strategies decide when each camera's first run falls inside
+its interval:
+
+* ``none``  -- every camera starts at t=0 (what the schedule files imply)
+* ``batch`` -- each monitoring_schedules_batch_N.json file starts 1/N of the
+  interval after the previous one
+* ``hash``  -- a stable hash of the handle picks the offset
+* ``even``  -- cameras sharing an interval are spread evenly across it
+"""
+
+import glob
+import hashlib
+import heapq
+import random
+import re
+from dataclasses import dataclass
+
+import numpy as np
+
+from ..json_stream import iter_array
+from .scheduler import SCHEDULE_BATCHES, MonitoringScheduler
+
+STRATEGIES = ('none', 'batch', 'hash', 'even')
+
+
+@dataclass
+class Station:
+    """A request endpoint: ``concurrency`` servers, at most ``rate`` starts/s (0 = no limit)"""
+    name: str
+    concurrency: int
+    mean_s: float
+    rate: float = 0.0
+    sigma: float = 0.5  # log-normal shape of service times
+
+
+FETCH_STATION = Station('nyctmc', concurrency=50, mean_s=0.5, rate=20.0)
+VISION_STATION = Station('vision', concurrency=10, mean_s=4.0)
+
+
+def schedule_batches(pattern=SCHEDULE_BATCHES):
+    """Handle -> batch number from the batch file each schedule came from"""
+    batches = {}
+    for path in glob.glob(pattern):
+        number = int(re.search(r'(\d+)\D*$', path).group(1))
+        for record in iter_array(path):
+            batches[record['zone_id']] = number
+    return batches
+
+
+def phase_offsets(schedules, strategy, batches=None):
+    """Handle -> first-run offset in seconds for a phase-offset strategy"""
+    intervals = {
+        handle: float(record.get('sampling_frequency_hours') or 24) * 3600
+        for handle, record in schedules.items()
+    }
+    if strategy == 'none':
+        return {}
+    if strategy == 'batch':
+        numbers = sorted(set((batches or {}).values())) or [0]
+        slot = {number: i for i, number in enumerate(numbers)}
+        return {
+            handle: slot.get((batches or {}).get(handle), 0) / len(numbers) * interval
+            for handle, interval in intervals.items()
+        }
+    if strategy == 'hash':
+        return {
+            handle: int(hashlib.sha256(handle.encode('utf-8')).hexdigest()[:16], 16) / 2 ** 64 * interval
+            for handle, interval in intervals.items()
+        }
+    if strategy == 'even':
+        groups = {}
+        for handle in sorted(intervals):
+            groups.setdefault(intervals[handle], []).append(handle)
+        return {
+            handle: i / len(handles) * interval
+            for interval, handles in groups.items()
+            for i, handle in enumerate(handles)
+        }
+    raise ValueError(f"unknown phase-offset strategy {strategy!r}; expected one of {STRATEGIES}")
+
+
+def replay(scheduler, duration_s, escalations=()):
+    """Camera runs ``(due_s, handle)`` from t=0 to ``duration_s``.
+
+    ``escalations`` are ``(t_s, handle, score)`` updates applied when the
+    clock reaches them; interval changes reschedule the camera from then on.
+    """
+    escalations = sorted(escalations)
+    runs, applied = [], 0
+    while True:
+        next_due = scheduler.next_due()
+        next_change = escalations[applied][0] if applied < len(escalations) else None
+        if next_change is not None and next_change <= duration_s and (next_due is None or next_change < next_due):
+            t_s, handle, score = escalations[applied]
+            if handle in scheduler:
+                scheduler.update_score(handle, score, t_s)
+            applied += 1
+            continue
+        if next_due is None or next_due >= duration_s:
+            return runs
+        runs.extend((due, handle) for handle, due in scheduler.advance(next_due))
+
+
+def serve(arrivals, station, rng):
+    """FIFO multi-server queue; returns ``(start, end)`` arrays for sorted ``arrivals``"""
+    start = np.empty(len(arrivals))
+    end = np.empty(len(arrivals))
+    free = [0.0] * station.concurrency  # when each server is next idle
+    gap = 1 / station.rate if station.rate else 0.0
+    next_token = 0.0
+    # Log-normal with the requested mean
+    mu = np.log(station.mean_s) - station.sigma ** 2 / 2
+    service = rng.lognormal(mu, station.sigma, len(arrivals))
+    for i, arrival in enumerate(arrivals):
+        begin = max(arrival, free[0], next_token)
+        next_token = begin + gap
+        start[i], end[i] = begin, begin + service[i]
+        heapq.heapreplace(free, end[i])
+    return start, end
+
+
+def peak_concurrency(start, end):
+    """Most requests in flight at once"""
+    if not len(start):
+        return 0
+    times = np.concatenate([start, end])
+    deltas = np.concatenate([np.ones(len(start)), -np.ones(len(end))])
+    # Ends sort before starts at equal times
+    order = np.lexsort((deltas, times))
+    return int(np.cumsum(deltas[order]).max())
+
+
+def station_report(arrivals, start, end, duration_s):
+    """Per-minute request starts, peak concurrency and queue latency for one station"""
+    minutes = int(np.ceil(duration_s / 60))
+    # Requests still queued past the end land in the last minute
+    per_minute = np.bincount(np.minimum(start // 60, minutes - 1).astype(int), minlength=minutes)
+    wait = start - arrivals
+    latency = {}
+    if len(wait):
+        latency = {f"p{q}": round(float(np.percentile(wait, q)), 2) for q in (50, 90, 99)}
+        latency['max'] = round(float(wait.max()), 2)
+    return {
+        'requests': len(start),
+        'per_minute': per_minute.tolist(),
+        'peak_per_minute': int(per_minute.max()),
+        'mean_per_minute': round(float(per_minute.mean()), 2),
+        'peak_to_mean': round(float(per_minute.max() / per_minute.mean()), 1) if per_minute.any() else 0.0,
+        'peak_concurrency': peak_concurrency(start, end),
+        'queue_latency_s': latency,
+    }
+
+
+def simulate(schedules, strategy='none', duration_s=24 * 3600, escalations=(), batches=None,
+             fetch=FETCH_STATION, vision=VISION_STATION, seed=0):
+    """Replay ``schedules`` under a phase-offset strategy and report the load on both stations"""
+    offsets = phase_offsets(schedules, strategy, batches)
+    scheduler = MonitoringScheduler.from_schedules(schedules, 0.0, offsets)
+    runs = replay(scheduler, duration_s, escalations)
+    rng = np.random.default_rng(seed)
+
+    arrivals = np.array([due for due, _ in runs])
+    fetch_start, fetch_end = serve(arrivals, fetch, rng)
+    vision_arrivals = np.sort(fetch_end)
+    vision_start, vision_end = serve(vision_arrivals, vision, rng)
+    return {
+        'strategy': strategy,
+        'cameras': len(schedules),
+        'duration_hours': duration_s / 3600,
+        'camera_runs': len(runs),
+        'escalations': len(escalations),
+        'tiers': scheduler.stats()['tiers'],
+        fetch.name: station_report(arrivals, fetch_start, fetch_end, duration_s),
+        vision.name: station_report(vision_arrivals, vision_start, vision_end, duration_s),
+    }
+
+
+def random_escalations(schedules, fraction, at_s, score, seed=0):
+    """Escalate a random ``fraction`` of cameras to ``score`` at ``at_s``"""
+    rng = random.Random(seed)
+    handles = sorted(schedules)
+    return [(at_s, handle, score) for handle in rng.sample(handles, int(round(fraction * len(handles))))]
+
+
+def scale_schedules(schedules, factor):
+    """``factor`` copies of every schedule (handles suffixed ``#2``, ``#3``, ...)"""
+    scaled = dict(schedules)
+    for copy in range(2, factor + 1):
+        scaled.update({f"{handle}#{copy}": record for handle, record in schedules.items()})
+    return scaled